@@ -4,13 +4,15 @@ CivicGuide AI Agent for answering civic questions
 
 import os
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 import json
 
-# In production, these would be actual API clients
-# import openai
-# import anthropic
+from data.jurisdictions import CHICAGO, Jurisdiction
+from monitoring.metrics import span
+
+# LLM client libraries (openai/anthropic) are imported on first use in
+# CivicGuideAgent.llm_client so they don't slow down cold starts
 
 @dataclass
 class Source:
@@ -30,12 +32,15 @@ class ConversationContext:
 class CivicGuideAgent:
     """
     AI Agent for answering civic engagement questions.
-    Provides helpful, accurate information about Chicago wards, 
+    Provides helpful, accurate information about one city's wards,
     aldermen, meetings, and civic processes.
     """
     
-    def __init__(self):
-        self.system_prompt = """You are CivicGuide, an AI assistant for Chicago civic engagement. 
+    def __init__(self, jurisdiction: Jurisdiction = CHICAGO, ward_count: Optional[int] = None):
+        self.jurisdiction = jurisdiction
+        self.city = jurisdiction.name
+        self.ward_count = ward_count or jurisdiction.ward_count
+        self.system_prompt = f"""You are CivicGuide, an AI assistant for {self.city} civic engagement. 
 Your goal is to help residents understand and engage with their local government.
 
 Guidelines:
@@ -60,6 +65,24 @@ When answering:
 4. Maintain a friendly, encouraging tone"""
         
         self.conversation_memory = {}
+        self._llm_client = None
+    
+    @property
+    def llm_client(self):
+        """
+        Lazily create the LLM client on first use.
+        
+        Prefers Anthropic when ANTHROPIC_API_KEY is set, then OpenAI.
+        Returns None if neither is configured.
+        """
+        if self._llm_client is None:
+            if os.environ.get('ANTHROPIC_API_KEY'):
+                import anthropic
+                self._llm_client = anthropic.AsyncAnthropic()
+            elif os.environ.get('OPENAI_API_KEY'):
+                import openai
+                self._llm_client = openai.AsyncOpenAI()
+        return self._llm_client
     
     async def answer_question(
         self, 
@@ -81,40 +104,74 @@ When answering:
         # 2. Query structured data for specific facts
         # 3. Call LLM with retrieved context
         # 4. Format and return response
+        # Each stage is timed so /metrics shows where a request spends its time.
+        with span("retrieval"):
+            retrieved = self.get_relevant_sources(question, context.ward_id)
+        
+        with span("classification"):
+            category = self._classify_question(question)
         
         # For now, return template responses
-        response = self._generate_response(question, context)
+        with span("llm"):
+            response = self._generate_response(question, context, category)
         
-        return {
-            'answer': response['text'],
-            'sources': response['sources'],
-            'suggested_followups': response['followups'],
-            'confidence': response['confidence'],
-        }
+        with span("serialization"):
+            sources = response['sources'] or retrieved
+            result = {
+                'answer': response['text'],
+                'sources': [asdict(s) for s in sources],
+                'suggested_followups': response['followups'],
+                'confidence': response['confidence'],
+            }
+        
+        return result
     
-    def _generate_response(self, question: str, context: ConversationContext) -> Dict:
-        """Generate a response based on question type"""
+    # Categories whose answers come from cached ward data, not a model call
+    CACHED_CATEGORIES = frozenset({'meeting', 'alderman', 'contact'})
+    
+    def answerable_from_cache(self, question: str) -> bool:
+        """Whether a question can be answered without an expensive LLM call"""
+        return self._classify_question(question) in self.CACHED_CATEGORIES
+    
+    def _classify_question(self, question: str) -> str:
+        """Categorize a question by keyword into one of the handler categories"""
         q_lower = question.lower()
         
-        # Question categorization and response generation
         if any(word in q_lower for word in ['meeting', 'when', 'schedule', 'agenda']):
-            return self._handle_meeting_question(context)
-        
+            return 'meeting'
         elif any(word in q_lower for word in ['alderman', 'representative', 'who']):
-            return self._handle_alderman_question(context)
-        
+            return 'alderman'
         elif any(word in q_lower for word in ['vote', 'voting', 'record', 'decision']):
-            return self._handle_voting_question(context)
-        
+            return 'voting'
         elif any(word in q_lower for word in ['election', 'vote', 'ballot', 'poll']):
-            return self._handle_election_question(context)
-        
+            return 'election'
         elif any(word in q_lower for word in ['contact', 'email', 'phone', 'reach']):
-            return self._handle_contact_question(context)
-        
+            return 'contact'
         elif any(word in q_lower for word in ['issue', 'problem', 'concern', 'complaint']):
-            return self._handle_issue_question(question, context)
+            return 'issue'
+        return 'general'
+    
+    def _generate_response(
+        self, 
+        question: str, 
+        context: ConversationContext, 
+        category: Optional[str] = None
+    ) -> Dict:
+        """Generate a response based on question type"""
+        category = category or self._classify_question(question)
         
+        if category == 'meeting':
+            return self._handle_meeting_question(context)
+        elif category == 'alderman':
+            return self._handle_alderman_question(context)
+        elif category == 'voting':
+            return self._handle_voting_question(context)
+        elif category == 'election':
+            return self._handle_election_question(context)
+        elif category == 'contact':
+            return self._handle_contact_question(context)
+        elif category == 'issue':
+            return self._handle_issue_question(question, context)
         else:
             return self._handle_general_question(question, context)
     
@@ -126,8 +183,8 @@ When answering:
             'text': f"Ward meetings{ward_info} are typically held on the first Tuesday of each month at 7 PM. You can find the specific schedule, location, and agenda on your alderman's website or by contacting their office directly. Would you like me to help you find the next meeting or add it to your calendar?",
             'sources': [
                 Source(
-                    title="Chicago City Council Meeting Schedule",
-                    url="https://chicago.gov/city/en/about/wards.html",
+                    title=f"{self.city} City Council Meeting Schedule",
+                    url=self.jurisdiction.link('council'),
                     snippet="Regular monthly meetings are held on the first Tuesday",
                     source_type="website"
                 )
@@ -165,12 +222,12 @@ When answering:
             }
         else:
             return {
-                'text': "Chicago has 50 aldermen, one for each ward. To find your alderman, I can help you look up your ward by address. Each alderman serves on committees and represents ward interests in the City Council. Would you like me to help you find which ward you live in?",
+                'text': f"{self.city} has {self.ward_count} aldermen, one for each ward. To find your alderman, I can help you look up your ward by address. Each alderman serves on committees and represents ward interests in the City Council. Would you like me to help you find which ward you live in?",
                 'sources': [
                     Source(
-                        title="Chicago City Council Members",
-                        url="https://chicago.gov/city/en/about/wards.html",
-                        snippet="50 aldermen represent Chicago's wards",
+                        title=f"{self.city} City Council Members",
+                        url=self.jurisdiction.link('council'),
+                        snippet=f"{self.ward_count} aldermen represent {self.city}'s wards",
                         source_type="website"
                     )
                 ],
@@ -189,8 +246,8 @@ When answering:
             'text': "City Council voting records are public information. You can view how your alderman voted on specific ordinances, resolutions, and appointments. Voting records help you understand their priorities and how they represent your ward's interests.",
             'sources': [
                 Source(
-                    title="Chicago City Council Voting Records",
-                    url="https://chicityclerk.com/city-council-news/voting-records/",
+                    title=f"{self.city} City Council Voting Records",
+                    url=self.jurisdiction.link('voting_records'),
                     snippet="Public voting records for all council members",
                     source_type="website"
                 )
@@ -207,11 +264,11 @@ When answering:
     def _handle_election_question(self, context: ConversationContext) -> Dict:
         """Handle questions about elections"""
         return {
-            'text': "Chicago municipal elections are held every four years. The next election is scheduled for February 2027. During municipal elections, residents vote for mayor, clerk, treasurer, and aldermen. You can check your voter registration, find your polling place, and learn about candidates through the Chicago Board of Elections.",
+            'text': f"{self.city} municipal elections are held every four years. The next election is scheduled for February 2027. During municipal elections, residents vote for mayor, clerk, treasurer, and aldermen. You can check your voter registration, find your polling place, and learn about candidates through the {self.city} Board of Elections.",
             'sources': [
                 Source(
-                    title="Chicago Board of Elections",
-                    url="https://chicagoelections.gov/",
+                    title=f"{self.city} Board of Elections",
+                    url=self.jurisdiction.link('elections'),
                     snippet="Voter information and election schedules",
                     source_type="website"
                 )
@@ -234,7 +291,7 @@ When answering:
             'sources': [
                 Source(
                     title="Contact Information",
-                    url="https://chicago.gov/city/en/about/wards.html",
+                    url=self.jurisdiction.link('council'),
                     snippet="Office locations and contact details",
                     source_type="website",
                     ward_id=context.ward_id
@@ -256,7 +313,7 @@ When answering:
             'sources': [
                 Source(
                     title="311 City Services",
-                    url="https://www.chicago.gov/city/en/depts/311.html",
+                    url=self.jurisdiction.link('services'),
                     snippet="Request city services and report issues",
                     source_type="website"
                 )
@@ -273,12 +330,12 @@ When answering:
     def _handle_general_question(self, question: str, context: ConversationContext) -> Dict:
         """Handle general civic questions"""
         return {
-            'text': "That's a great question about Chicago civic engagement. I'm here to help you navigate local government, find resources, and get involved in your community. I can provide information about wards, aldermen, meetings, voting, and city services. What specific aspect would you like to learn more about?",
+            'text': f"That's a great question about {self.city} civic engagement. I'm here to help you navigate local government, find resources, and get involved in your community. I can provide information about wards, aldermen, meetings, voting, and city services. What specific aspect would you like to learn more about?",
             'sources': [
                 Source(
-                    title="Chicago City Council",
-                    url="https://chicago.gov/city/en/about/wards.html",
-                    snippet="Information about Chicago's legislative branch",
+                    title=f"{self.city} City Council",
+                    url=self.jurisdiction.link('council'),
+                    snippet=f"Information about {self.city}'s legislative branch",
                     source_type="website"
                 )
             ],
@@ -300,20 +357,10 @@ When answering:
         
         return [
             Source(
-                title="Chicago City Council",
-                url="https://chicago.gov",
+                title=f"{self.city} City Council",
+                url=self.jurisdiction.website,
                 snippet="Official city council website",
                 source_type="website",
                 ward_id=ward_id
             )
         ]
-
-# Singleton instance
-_civic_guide_agent = None
-
-def get_agent() -> CivicGuideAgent:
-    """Get or create the CivicGuide agent singleton"""
-    global _civic_guide_agent
-    if _civic_guide_agent is None:
-        _civic_guide_agent = CivicGuideAgent()
-    return _civic_guide_agent
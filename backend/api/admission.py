@@ -0,0 +1,331 @@
+"""
+Admission control and load shedding for expensive endpoints (/api/chat).
+
+Three layers, checked in order:
+    1. Per-client token bucket rate limit -> 429 + Retry-After
+    2. Bounded global work queue with priorities -> 503 + Retry-After when
+       the queue is full or the estimated wait would blow the request's
+       deadline (fail fast instead of timing out)
+    3. Priority: cheap intents (answerable from cached ward data) are served
+       before expensive ones and are shed last
+
+Limiter state lives in-process by default; set CIVICPIE_RATE_LIMIT_BACKEND=redis
+to share buckets across workers and hosts through REDIS_URL.
+
+Clients are keyed by their peer address. X-Forwarded-For is only honored when
+the peer is a trusted proxy (CIVICPIE_TRUSTED_PROXIES, comma-separated
+addresses or CIDR ranges), since any client can set it to get a fresh bucket.
+"""
+
+import asyncio
+import heapq
+import ipaddress
+import itertools
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from monitoring.metrics import REGISTRY
+
+PRIORITY_CHEAP = 0
+PRIORITY_EXPENSIVE = 1
+
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "civicpie_admission_rejections_total",
+    "Requests rejected by admission control",
+    ("reason",),
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "civicpie_admission_queue_depth",
+    "Requests waiting for a work slot",
+)
+ACTIVE_WORK = REGISTRY.gauge(
+    "civicpie_admission_active",
+    "Requests holding a work slot",
+)
+
+
+class Rejected(Exception):
+    """Raised when a request is not admitted"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail=self.reason,
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+        )
+
+
+def parse_networks(spec: Iterable[str]) -> Tuple[ipaddress._BaseNetwork, ...]:
+    """'10.0.0.0/8', '127.0.0.1' -> networks; blank entries are skipped"""
+    return tuple(ipaddress.ip_network(item.strip(), strict=False) for item in spec if item.strip())
+
+
+def _in_networks(address: str, networks: Tuple[ipaddress._BaseNetwork, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+# Rate limiter backends
+
+class InMemoryTokenBuckets:
+    """Per-key token buckets held in this process (LRU-bounded)"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take tokens; returns (allowed, seconds until enough tokens)"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (cost - tokens) / self.rate
+        return allowed, retry_after
+
+
+# Refill and take atomically; bucket hashes expire once they'd be full again
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisTokenBuckets:
+    """
+    Token buckets shared through Redis.
+
+    `client` is any redis.asyncio-compatible client; tests can pass a fake
+    that implements `eval`.
+    """
+
+    def __init__(self, client, rate: float, burst: int, prefix: str = "civicpie:ratelimit:"):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, rate: float, burst: int) -> "RedisTokenBuckets":
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url), rate, burst)
+
+    async def take(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, tokens = await self.client.eval(
+            _TOKEN_BUCKET_LUA, 1, self.prefix + key, self.rate, self.burst, time.time(), cost
+        )
+        tokens = float(tokens)
+        allowed = bool(int(allowed))
+        return allowed, 0.0 if allowed else (cost - tokens) / self.rate
+
+
+# Work queue
+
+class PriorityWorkQueue:
+    """
+    Bounded concurrency with a bounded, priority-ordered wait queue.
+
+    Waiters that cannot be served before their deadline are rejected up
+    front using an EWMA of recent service times.
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, initial_service_time: float = 0.5):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.service_time = initial_service_time
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self, priority: int) -> float:
+        """Expected seconds until a new waiter at this priority gets a slot"""
+        if self._active < self.concurrency and not self._waiters:
+            return 0.0
+        ahead = sum(1 for p, _, fut in self._waiters if p <= priority and not fut.done())
+        return (ahead // self.concurrency + 1) * self.service_time
+
+    def _shed_limit(self, priority: int) -> int:
+        # Expensive work may only fill half the queue so cheap requests
+        # still have room during a spike
+        return self.max_queue if priority == PRIORITY_CHEAP else self.max_queue // 2
+
+    async def acquire(self, priority: int, deadline: float) -> None:
+        """Wait for a slot or raise Rejected; deadline is a time.monotonic() value"""
+        if self._active < self.concurrency and not self._waiters:
+            self._active += 1
+            return
+
+        if len(self._waiters) >= self._shed_limit(priority):
+            raise Rejected(503, "Server busy, work queue full", self.estimated_wait(priority))
+
+        remaining = deadline - time.monotonic()
+        wait = self.estimated_wait(priority)
+        if wait > remaining:
+            raise Rejected(503, "Server busy, request would miss its deadline", wait)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=remaining)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release(None)
+            else:
+                future.cancel()
+                self._discard(entry)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise Rejected(503, "Server busy, request deadline exceeded", self.service_time)
+
+    def _discard(self, entry) -> None:
+        try:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+        except ValueError:
+            pass
+
+    def release(self, elapsed: Optional[float]) -> None:
+        """Free a slot, handing it directly to the highest-priority waiter"""
+        if elapsed is not None:
+            self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+
+class AdmissionController:
+    """Rate limiting plus queue admission for one class of endpoint"""
+
+    def __init__(self, limiter, queue: PriorityWorkQueue, default_deadline: float, cost: float = 1.0,
+                 trusted_proxies: Iterable[str] = ()):
+        self.limiter = limiter
+        self.queue = queue
+        self.default_deadline = default_deadline
+        self.cost = cost
+        self.trusted_proxies = parse_networks(trusted_proxies)
+
+    def client_key(self, request: Request) -> str:
+        """
+        The peer address, or, when the peer is a trusted proxy, the nearest
+        X-Forwarded-For hop that is not itself a trusted proxy
+        """
+        client = request.client.host if request.client else "unknown"
+        if not self.trusted_proxies or not _in_networks(client, self.trusted_proxies):
+            return client
+        forwarded = request.headers.get("x-forwarded-for")
+        if not forwarded:
+            return client
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        # Walk right to left: entries left of the first untrusted hop were
+        # written by the client and can be anything
+        for hop in reversed(hops):
+            if not _in_networks(hop, self.trusted_proxies):
+                return hop
+        return hops[0] if hops else client
+
+    def deadline_for(self, request: Request) -> float:
+        """Absolute deadline from X-Request-Timeout-Ms, capped at the default"""
+        budget = self.default_deadline
+        header = request.headers.get("x-request-timeout-ms")
+        if header:
+            try:
+                budget = min(budget, max(0.0, float(header) / 1000))
+            except ValueError:
+                pass
+        return time.monotonic() + budget
+
+    @asynccontextmanager
+    async def admit(self, request: Request, priority: int = PRIORITY_EXPENSIVE):
+        """
+        Hold a work slot for the body of the block.
+
+        Raises HTTPException(429/503) with Retry-After when not admitted.
+        """
+        try:
+            allowed, retry_after = await self.limiter.take(self.client_key(request), self.cost)
+            if not allowed:
+                raise Rejected(429, "Rate limit exceeded", retry_after)
+            await self.queue.acquire(priority, self.deadline_for(request))
+        except Rejected as rejected:
+            ADMISSION_REJECTIONS.inc("rate_limited" if rejected.status_code == 429 else "shed")
+            raise rejected.to_http()
+        finally:
+            QUEUE_DEPTH.set(value=self.queue.depth)
+
+        ACTIVE_WORK.set(value=self.queue.active)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.queue.release(time.monotonic() - start)
+            ACTIVE_WORK.set(value=self.queue.active)
+            QUEUE_DEPTH.set(value=self.queue.depth)
+
+
+def build_chat_admission() -> AdmissionController:
+    """Admission controller for /api/chat configured from the environment"""
+    rate = float(os.environ.get("CIVICPIE_CHAT_RATE", "1.0"))
+    burst = int(os.environ.get("CIVICPIE_CHAT_BURST", "10"))
+    if os.environ.get("CIVICPIE_RATE_LIMIT_BACKEND", "memory") == "redis":
+        limiter = RedisTokenBuckets.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"), rate, burst)
+    else:
+        limiter = InMemoryTokenBuckets(rate, burst)
+    queue = PriorityWorkQueue(
+        concurrency=int(os.environ.get("CIVICPIE_CHAT_CONCURRENCY", "32")),
+        max_queue=int(os.environ.get("CIVICPIE_CHAT_QUEUE", "256")),
+    )
+    return AdmissionController(
+        limiter,
+        queue,
+        default_deadline=float(os.environ.get("CIVICPIE_CHAT_DEADLINE_S", "10")),
+        trusted_proxies=os.environ.get("CIVICPIE_TRUSTED_PROXIES", "").split(","),
+    )
@@ -0,0 +1,200 @@
+"""
+Change notifications pushed to clients over WebSocket and SSE.
+
+Publishers (the ward snapshot watcher, scrape pipelines) call
+`EventBus.publish(ward_id, kind, fields)`. Events are coalesced for
+COALESCE_WINDOW seconds, so a sync touching one ward several times becomes a
+single event carrying the union of changed fields, then fanned out to the
+subscriptions interested in that ward.
+
+A subscription is a small dict of pending changes plus an asyncio.Event, with
+no task or queue of its own, so thousands of idle connections cost little.
+A slow client never builds a backlog either: undelivered changes for the same
+ward and kind are merged in place.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from monitoring.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Seconds to gather changes before fanning them out
+COALESCE_WINDOW = float(os.environ.get("CIVICPIE_EVENTS_COALESCE_S", "0.25"))
+
+KIND_WARD = "ward"
+KIND_MEETING = "meeting"
+
+EVENTS_PUBLISHED = REGISTRY.counter(
+    "civicpie_events_published_total",
+    "Change events fanned out to subscribers",
+    ("kind",),
+)
+SUBSCRIBERS = REGISTRY.gauge(
+    "civicpie_event_subscribers",
+    "Open change-notification subscriptions",
+)
+
+ChangeKey = Tuple[Optional[int], str]
+
+
+class Subscription:
+    """Pending changes for one client, filtered by ward (None = all wards)"""
+
+    def __init__(self, wards: Optional[Iterable[int]] = None):
+        self.wards: Optional[frozenset] = frozenset(wards) if wards else None
+        self._pending: Dict[ChangeKey, Set[str]] = {}
+        self._ready = asyncio.Event()
+
+    def deliver(self, key: ChangeKey, fields: Set[str]) -> None:
+        self._pending.setdefault(key, set()).update(fields)
+        self._ready.set()
+
+    def wake(self) -> None:
+        """Return from a pending next() early (e.g. the connection closed)"""
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Wait for changes; returns [] on timeout (time to send a keepalive)"""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        pending, self._pending = self._pending, {}
+        self._ready.clear()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        return [
+            {'ward_id': ward_id, 'kind': kind, 'fields': sorted(fields), 'timestamp': timestamp}
+            for (ward_id, kind), fields in pending.items()
+        ]
+
+
+class EventBus:
+    """In-process fan-out of coalesced change events"""
+
+    def __init__(self, coalesce_window: float = COALESCE_WINDOW):
+        self.coalesce_window = coalesce_window
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_ward: Dict[int, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self._pending: Dict[ChangeKey, Set[str]] = {}
+        self._flush_scheduled = False
+        self._count = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach to the serving event loop; publish() may then be called from any thread"""
+        self._loop = loop
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def subscribe(self, wards: Optional[Iterable[int]] = None) -> Subscription:
+        subscription = Subscription(wards)
+        self._index(subscription)
+        self._count += 1
+        SUBSCRIBERS.set(value=self.subscriber_count)
+        return subscription
+
+    def update(self, subscription: Subscription, wards: Optional[Iterable[int]]) -> None:
+        """Change a subscription's ward filter"""
+        self._unindex(subscription)
+        subscription.wards = frozenset(wards) if wards else None
+        self._index(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._unindex(subscription)
+        self._count -= 1
+        SUBSCRIBERS.set(value=self.subscriber_count)
+
+    def _index(self, subscription: Subscription) -> None:
+        if subscription.wards is None:
+            self._all.add(subscription)
+        else:
+            for ward_id in subscription.wards:
+                self._by_ward.setdefault(ward_id, set()).add(subscription)
+
+    def _unindex(self, subscription: Subscription) -> None:
+        self._all.discard(subscription)
+        for ward_id in subscription.wards or ():
+            subs = self._by_ward.get(ward_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._by_ward[ward_id]
+
+    def publish(self, ward_id: Optional[int], kind: str, fields: Iterable[str]) -> None:
+        """Queue a change; ward_id None means a city-wide change"""
+        fields = set(fields)
+        if self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._queue((ward_id, kind), fields)
+        else:
+            self._loop.call_soon_threadsafe(self._queue, (ward_id, kind), fields)
+
+    def _queue(self, key: ChangeKey, fields: Set[str]) -> None:
+        self._pending.setdefault(key, set()).update(fields)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_later(self.coalesce_window, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        batch, self._pending = self._pending, {}
+        for key, fields in batch.items():
+            ward_id, kind = key
+            EVENTS_PUBLISHED.inc(kind)
+            if ward_id is None:
+                targets = self._all.union(*self._by_ward.values())
+            else:
+                targets = self._all | self._by_ward.get(ward_id, set())
+            for subscription in targets:
+                subscription.deliver(key, fields)
+
+
+def diff_records(old: Dict[int, Dict[str, Any]], new: Dict[int, Dict[str, Any]]) -> List[Tuple[int, List[str]]]:
+    """(ward id, changed fields) for every ward that differs between two snapshots"""
+    changes = []
+    for ward_id in sorted(set(old) | set(new)):
+        before, after = old.get(ward_id, {}), new.get(ward_id, {})
+        fields = sorted(k for k in set(before) | set(after) if before.get(k) != after.get(k))
+        if fields:
+            changes.append((ward_id, fields))
+    return changes
+
+
+def file_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+async def watch_files(paths: Callable[[], Dict[str, Tuple[str, Optional[int]]]],
+                      on_change: Callable[[str], None], interval: float = 5.0) -> None:
+    """
+    Call on_change(key) (in a worker thread) whenever a watched file's mtime
+    differs from the one it was loaded at. paths() maps each key to (path,
+    loaded mtime) and is re-read every interval, so the watched set can change.
+
+    One stat per file per interval per worker replaces every client polling the API.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for key, (path, loaded) in paths().items():
+            current = file_mtime(path)
+            if current is not None and current != loaded:
+                try:
+                    await asyncio.to_thread(on_change, key)
+                except Exception:
+                    logger.exception("Reloading %s failed", path)
@@ -0,0 +1,175 @@
+"""
+Fast JSON serialization and response compression for the CivicPie API.
+
+Endpoints that serve trusted data (the ward snapshot, agent output) can
+bypass FastAPI's `response_model` validation and `jsonable_encoder` pass by
+returning a response built here:
+
+    - `dumps()` encodes pydantic models, dataclasses and datetimes straight
+      to bytes, using pydantic-core's Rust serializer for models and orjson
+      for plain containers
+    - `PreparedPayload` serializes once and caches compressed variants, for
+      data that only changes when the snapshot is reloaded
+    - `json_response()` encodes and compresses per request
+
+Compression is negotiated from Accept-Encoding: brotli (if installed) is
+preferred over gzip, and small bodies are sent uncompressed.
+"""
+
+import dataclasses
+import gzip
+import importlib.util
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# brotli is optional and only imported the first time a client asks for it
+SUPPORTED_ENCODINGS = ("br", "gzip") if importlib.util.find_spec("brotli") is not None else ("gzip",)
+
+# Bodies smaller than this are not worth compressing
+MINIMUM_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types orjson/json don't handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _is_model_content(content: Any) -> bool:
+    if isinstance(content, BaseModel):
+        return True
+    return isinstance(content, (list, tuple)) and bool(content) and isinstance(content[0], BaseModel)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes"""
+    # Models (and lists of models) serialize fastest in pydantic-core without
+    # a per-object Python round trip; plain dicts/lists are faster in orjson.
+    if orjson is None or _is_model_content(content):
+        return to_json(content)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+
+    Returns 'br', 'gzip' or None (identity).
+    """
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_q:
+            best, best_q = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        import brotli
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def _build_response(body: bytes, encoding: Optional[str], status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    response_headers = {"vary": "Accept-Encoding"}
+    if encoding:
+        response_headers["content-encoding"] = encoding
+    if headers:
+        response_headers.update(headers)
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=response_headers)
+
+
+class FastJSONResponse(Response):
+    """JSONResponse replacement that encodes with `dumps()`"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(request: Request, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize content and compress it if the client accepts it"""
+    body = dumps(content)
+    encoding = None
+    if len(body) >= MINIMUM_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            body = compress(body, encoding)
+    return _build_response(body, encoding, status_code, headers)
+
+
+class PreparedPayload:
+    """
+    A response body serialized once, with compressed variants cached on
+    first use. Use for read-mostly data such as the ward snapshot.
+
+    Bodies may be any bytes-like object, e.g. memoryviews into a shared
+    snapshot, with variants precompressed when the snapshot was built.
+    """
+    __slots__ = ("body", "_variants")
+
+    def __init__(self, body: bytes, variants: Optional[Dict[str, bytes]] = None):
+        self.body = body
+        self._variants: Dict[str, bytes] = dict(variants or {})
+
+    @classmethod
+    def from_content(cls, content: Any) -> "PreparedPayload":
+        return cls(dumps(content))
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if not encoding or len(self.body) < MINIMUM_COMPRESS_SIZE:
+            return self.body
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = compress(self.body, encoding)
+        return variant
+
+    def precompress(self) -> Dict[str, bytes]:
+        """Compress every supported variant now (e.g. before serving traffic)"""
+        if len(self.body) >= MINIMUM_COMPRESS_SIZE:
+            for encoding in SUPPORTED_ENCODINGS:
+                self.encoded(encoding)
+        return dict(self._variants)
+
+    def response(self, request: Request, headers: Optional[Dict[str, str]] = None, compressed: bool = True) -> Response:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) if compressed else None
+        if len(self.body) < MINIMUM_COMPRESS_SIZE:
+            encoding = None
+        return _build_response(bytes(self.encoded(encoding)), encoding, headers=headers)
@@ -0,0 +1,94 @@
+"""
+Benchmark typeahead lookups against the prefix trie.
+
+Replays every 1-8 character prefix of every suggestion label (what a user
+produces while typing) against the index built from the ward snapshot, and
+reports per-lookup latency percentiles plus the in-process endpoint latency.
+The target is p99 under 100 us for index lookups.
+
+Usage (from backend/):
+    python -m benchmarks.bench_autocomplete [--rounds N]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+from time import perf_counter, perf_counter_ns
+
+from benchmarks.load_test import BACKEND_DIR
+
+sys.path.insert(0, BACKEND_DIR)
+
+TARGET_P99_US = 100.0
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def bench_index(rounds: int) -> dict:
+    from data.autocomplete import build_index
+    from data.wards import load_ward_records
+
+    start = perf_counter()
+    index = build_index(load_ward_records())
+    build_ms = (perf_counter() - start) * 1e3
+
+    prefixes = sorted({
+        word[:n]
+        for entry in index.entries
+        for word in entry.label.lower().split()
+        for n in range(1, min(8, len(word)) + 1)
+    })
+    samples = []
+    for _ in range(rounds):
+        for prefix in prefixes:
+            t0 = perf_counter_ns()
+            index.suggest(prefix)
+            samples.append((perf_counter_ns() - t0) / 1000)
+    p99 = _percentile(samples, 99)
+    return {
+        "entries": len(index.entries),
+        "nodes": index.node_count,
+        "build_ms": round(build_ms, 2),
+        "lookups": len(samples),
+        "p50_us": round(_percentile(samples, 50), 2),
+        "p99_us": round(p99, 2),
+        "max_us": round(max(samples), 2),
+        "meets_target": p99 < TARGET_P99_US,
+    }
+
+
+async def bench_endpoint(requests: int) -> dict:
+    import httpx
+
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/autocomplete", params={"q": "w"})
+        start = perf_counter()
+        for i in range(requests):
+            response = await client.get("/api/autocomplete", params={"q": ("lo", "35", "quez", "wick")[i % 4]})
+            response.raise_for_status()
+        return {"endpoint_us": round((perf_counter() - start) / requests * 1e6, 1)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50, help="passes over the prefix set")
+    parser.add_argument("--requests", type=int, default=1000, help="in-process endpoint requests")
+    args = parser.parse_args(argv)
+
+    results = bench_index(args.rounds)
+    results.update(asyncio.run(bench_endpoint(args.requests)))
+    print(json.dumps(results, indent=2))
+    if not results["meets_target"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Scaling benchmark for the distributed crawl frontier.
+
+Simulates crawl workers as threads, each with its own RedisFrontier (the
+same object DistributedScheduler uses) against one shared Redis: fakeredis
+in-process by default, or a real server with --redis-url. A "fetch" sleeps
+for --latency-ms; every page links to two more pages of its site, up to
+--pages per site. Each worker honours a per-domain --delay-ms locally, the
+way Scrapy's download slots do.
+
+Reports pages/s per worker count, speedup over one worker, and politeness
+violations: fetches of the same domain, by any workers, closer together
+than the delay. Violations should be 0 at every worker count. Threads share
+one interpreter, and fakeredis runs the Lua scripts under the GIL, so on a
+single core the speedup is a lower bound; use --redis-url for real numbers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_distributed_crawl [--workers 1,2,4,8] [--domains 32]
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import Dict, List
+
+from scrapers.distributed import RedisFrontier, reset_crawl
+
+CRAWL = "bench"
+SPIDER = "bench"
+
+
+def _client_factory(redis_url: str):
+    if redis_url:
+        import redis
+
+        return lambda: redis.from_url(redis_url)
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit("Install fakeredis (and lupa) or pass --redis-url")
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeRedis(server=server)
+
+
+def _domain(site: int) -> str:
+    return f"site{site}.example.org"
+
+
+def _page(site: int, page: int) -> str:
+    return f"{_domain(site)}/{page}"
+
+
+def crawl(workers: int, args, make_client) -> Dict[str, float]:
+    reset_crawl(make_client(), CRAWL)
+    delay = args.delay_ms / 1000
+    latency = args.latency_ms / 1000
+    fetches: Dict[str, List[tuple]] = {}
+    lock = threading.Lock()
+
+    seed = RedisFrontier(make_client(), SPIDER, "seed", CRAWL)
+    for site in range(args.domains):
+        seed.add(_page(site, 0), 0, b"0", domain=_domain(site))
+
+    def worker(worker_id: str) -> None:
+        frontier = RedisFrontier(make_client(), SPIDER, worker_id, CRAWL, handoff_delay=delay)
+        frontier.heartbeat()
+        last_fetch: Dict[str, float] = {}
+        next_heartbeat = time.monotonic() + 1.0
+        while True:
+            if time.monotonic() >= next_heartbeat:
+                frontier.heartbeat()
+                next_heartbeat = time.monotonic() + 1.0
+            popped = frontier.pop()
+            if popped is None:
+                if frontier.pending == 0:
+                    break
+                time.sleep(0.005)
+                continue
+            url, data = popped
+            domain, page = url.split("/")[0], int(data)
+            site = int(domain[4:].split(".")[0])
+            wait = last_fetch.get(domain, 0.0) + delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            started = time.monotonic()
+            last_fetch[domain] = started
+            with lock:
+                fetches.setdefault(domain, []).append((started, worker_id))
+            time.sleep(latency)
+            for child in (2 * page + 1, 2 * page + 2):
+                if child < args.pages:
+                    frontier.add(_page(site, child), 0, str(child).encode(), domain=domain)
+            frontier.done(url)
+        frontier.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    pages = sum(len(f) for f in fetches.values())
+    violations = 0
+    for times in fetches.values():
+        times.sort()
+        violations += sum(1 for (a, _), (b, _) in zip(times, times[1:]) if b - a < delay * 0.99)
+    return {
+        "workers": workers,
+        "pages": pages,
+        "pages_per_s": round(pages / elapsed, 1),
+        "politeness_violations": violations,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--domains", type=int, default=32)
+    parser.add_argument("--pages", type=int, default=15, help="pages per site")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--delay-ms", type=float, default=100, help="per-domain politeness delay")
+    parser.add_argument("--redis-url", default="", help="real Redis instead of in-process fakeredis")
+    args = parser.parse_args(argv)
+
+    make_client = _client_factory(args.redis_url)
+    results = [crawl(int(n), args, make_client) for n in args.workers.split(",")]
+    base = results[0]["pages_per_s"] / results[0]["workers"]
+    for result in results:
+        result["speedup_per_worker"] = round(result["pages_per_s"] / base / result["workers"], 2)
+    print(json.dumps({"domains": args.domains, "pages_per_domain": args.pages, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Throughput benchmark for main-content extraction on saved HTML pages.
+
+Corpus layout: <corpus>/<domain>/<page>.html, one directory per site, e.g.
+pages saved from alderman websites with `curl -o` or the browser. When the
+corpus directory has no pages, a seeded synthetic corpus of alderman-style
+pages (nav, sidebar, footer, scripts, a newsletter body) is generated in a
+temporary directory instead.
+
+Variants:
+    selector   - the previous parse_subpage selector join (raw markup)
+    heuristic  - ContentExtractor scoring every page (no templates)
+    template   - ContentExtractor after one pass has learned per-domain templates
+
+Usage (from backend/):
+    python -m benchmarks.bench_extraction [--corpus DIR] [--pages N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+from typing import List, Tuple
+
+from benchmarks.load_test import BACKEND_DIR, BENCH_DIR
+
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, "data", "html")
+
+# Strings that only appear in boilerplate of the synthetic pages
+BOILERPLATE_MARKERS = ("Skip to content", "All rights reserved", "Sign up for updates", "function(", "<")
+
+_WORDS = (
+    "ward office residents community meeting budget alderperson street "
+    "permit zoning park library safety snow program senior youth housing "
+    "transit grant repair ordinance council service event neighborhood"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def _synthetic_page(rng: random.Random, ward: int, layout: int) -> str:
+    nav = "".join(f'<li><a href="/p{i}">Section {i}</a></li>' for i in range(12))
+    paragraphs = "".join(
+        f"<p>{' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))}</p>" for _ in range(rng.randint(4, 12))
+    )
+    items = "".join(f"<li>{_sentence(rng)}</li>" for _ in range(rng.randint(0, 5)))
+    sidebar = "".join(f'<div class="widget"><a href="/e{i}">Upcoming event {i}</a></div>' for i in range(6))
+    body = f"<h1>Ward {ward} Update</h1><h2>From the office</h2>{paragraphs}<ul>{items}</ul>"
+    wrapper = (
+        f'<main id="content"><article>{body}</article></main>' if layout == 0
+        else f'<div class="container"><div class="row"><div class="col-md-8 entry-content">{body}</div>'
+             f'<div class="col-md-4 sidebar">{sidebar}</div></div></div>'
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Ward {w}</title>"
+        "<script>function(){{var x = 1;}}</script><style>body{{margin:0}}</style></head><body>"
+        '<a class="skip-link" href="#content">Skip to content</a>'
+        "<header><nav><ul>{nav}</ul></nav></header>{wrapper}"
+        '<div class="newsletter-signup"><p>Sign up for updates from the ward office every week.</p></div>'
+        "<footer><p>Copyright Ward {w}. All rights reserved. 121 N LaSalle St, Chicago IL</p></footer>"
+        "</body></html>"
+    ).format(w=ward, nav=nav, wrapper=wrapper)
+
+
+def generate_corpus(directory: str, pages: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    for i in range(pages):
+        ward = i % 50 + 1
+        site = os.path.join(directory, f"ward{ward}.example.org")
+        os.makedirs(site, exist_ok=True)
+        with open(os.path.join(site, f"page{i}.html"), "w") as f:
+            f.write(_synthetic_page(rng, ward, layout=ward % 2))
+
+
+def load_corpus(directory: str) -> List[Tuple[str, str]]:
+    """(domain, html) pairs"""
+    pages = []
+    if not os.path.isdir(directory):
+        return pages
+    for domain in sorted(os.listdir(directory)):
+        site = os.path.join(directory, domain)
+        if not os.path.isdir(site):
+            continue
+        for name in sorted(os.listdir(site)):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(site, name), encoding="utf-8", errors="replace") as f:
+                    pages.append((domain, f.read()))
+    return pages
+
+
+def _run(label: str, pages: List[Tuple[str, str]], extract) -> dict:
+    start = perf_counter()
+    outputs = [extract(domain, html) for domain, html in pages]
+    elapsed = perf_counter() - start
+    total_bytes = sum(len(html.encode()) for _, html in pages)
+    return {
+        "variant": label,
+        "pages_per_s": round(len(pages) / elapsed, 1),
+        "mb_per_s": round(total_bytes / elapsed / 1e6, 2),
+        "avg_content_chars": round(sum(len(o) for o in outputs) / len(outputs)),
+        "pages_with_boilerplate": sum(1 for o in outputs if any(m in o for m in BOILERPLATE_MARKERS)),
+    }
+
+
+def bench(pages: List[Tuple[str, str]]) -> dict:
+    from scrapy.http import HtmlResponse
+
+    from scrapers.extract import ContentExtractor
+
+    def selector(domain, html):
+        response = HtmlResponse(url=f"https://{domain}/", body=html.encode(), encoding="utf-8")
+        return " ".join(response.css("main, .content, article, .entry-content p::text").getall())[:5000]
+
+    def heuristic(domain, html):
+        return ContentExtractor().extract(html)["content"]
+
+    templated = ContentExtractor()
+    for domain, html in pages:
+        templated.extract(html, domain=domain)
+    templated.stats = {"pages": 0, "template_hits": 0}
+
+    def template(domain, html):
+        return templated.extract(html, domain=domain)["content"]
+
+    results = [_run("selector", pages, selector), _run("heuristic", pages, heuristic), _run("template", pages, template)]
+    results[-1]["template_hit_rate"] = round(templated.stats["template_hits"] / max(1, templated.stats["pages"]), 3)
+    return {"pages": len(pages), "domains": len({d for d, _ in pages}), "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory of <domain>/<page>.html files")
+    parser.add_argument("--pages", type=int, default=1000, help="synthetic pages when the corpus is empty")
+    args = parser.parse_args(argv)
+
+    pages = load_corpus(args.corpus)
+    synthetic = not pages
+    if synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_corpus(tmp, args.pages)
+            pages = load_corpus(tmp)
+    results = bench(pages)
+    results["synthetic_corpus"] = synthetic
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
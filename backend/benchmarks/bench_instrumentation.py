@@ -0,0 +1,111 @@
+"""
+Benchmark the overhead of the request instrumentation.
+
+Measures the cost of a single span, a histogram observation, rendering
+/metrics, and an in-process request with and without MetricsMiddleware.
+
+Usage (from backend/):
+    python -m benchmarks.bench_instrumentation [--iterations N]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from time import perf_counter
+
+from monitoring.metrics import MetricsMiddleware, MetricsRegistry, span
+
+
+def _per_call_ns(fn, iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (perf_counter() - start) / iterations * 1e9
+
+
+def bench_primitives(iterations: int) -> dict:
+    """Time the recording primitives in isolation"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("stage",))
+
+    def empty():
+        pass
+
+    def with_span():
+        with span("bench", histogram):
+            pass
+
+    def observe():
+        histogram.observe(0.003, "bench")
+
+    baseline = _per_call_ns(empty, iterations)
+    for stage in ("retrieval", "classification", "llm", "serialization"):
+        histogram.observe(0.01, stage)
+    render_start = perf_counter()
+    for _ in range(1000):
+        registry.render()
+    render_us = (perf_counter() - render_start) / 1000 * 1e6
+
+    return {
+        "call_baseline_ns": round(baseline, 1),
+        "span_ns": round(_per_call_ns(with_span, iterations) - baseline, 1),
+        "histogram_observe_ns": round(_per_call_ns(observe, iterations) - baseline, 1),
+        "render_us": round(render_us, 2),
+    }
+
+
+async def _drive(app, requests: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get("/health")
+        start = perf_counter()
+        for _ in range(requests):
+            await client.get("/health")
+        return (perf_counter() - start) / requests * 1e6
+
+
+def bench_middleware(requests: int) -> dict:
+    """Compare in-process request latency with and without the middleware"""
+    from fastapi import FastAPI
+
+    def build(instrumented: bool):
+        app = FastAPI()
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        if instrumented:
+            app.add_middleware(MetricsMiddleware)
+        return app
+
+    plain_us = asyncio.run(_drive(build(False), requests))
+    instrumented_us = asyncio.run(_drive(build(True), requests))
+    return {
+        "request_plain_us": round(plain_us, 2),
+        "request_instrumented_us": round(instrumented_us, 2),
+        "middleware_overhead_us": round(instrumented_us - plain_us, 2),
+        "middleware_overhead_pct": round((instrumented_us - plain_us) / plain_us * 100, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000, help="iterations for primitive timings")
+    parser.add_argument("--requests", type=int, default=2_000, help="in-process requests per variant")
+    args = parser.parse_args(argv)
+
+    results = {"primitives": bench_primitives(args.iterations)}
+    try:
+        results["middleware"] = bench_middleware(args.requests)
+    except ImportError as exc:
+        print(f"  -> Skipping middleware benchmark ({exc})", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
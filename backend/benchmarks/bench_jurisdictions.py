@@ -0,0 +1,106 @@
+"""
+Benchmark startup time and memory against the number of hosted cities.
+
+For each --cities count, writes that many synthetic jurisdictions (copies
+of the ward snapshot) to a temporary registry and data directory, then in a
+fresh interpreter measures:
+
+    startup_ms      import main + app startup (warms only the default city)
+    startup_rss_mb  resident memory after startup
+    sweep_ms        one /wards request to every city, in turn
+    sweep_rss_mb    resident memory after the sweep
+    resident        partitions still loaded (bounded by --max-resident)
+
+Startup should stay flat as cities are added and memory after the sweep
+should track --max-resident, not the number of cities.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jurisdictions [--cities 1,10,100,1000] [--max-resident 8]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.load_test import BACKEND_DIR
+
+sys.path.insert(0, BACKEND_DIR)
+
+SNIPPET = """
+import json, os, time
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+start = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    startup_rss = rss_mb()
+    for jurisdiction_id in main.load_registry():
+        client.get(f'/api/jurisdictions/{jurisdiction_id}/wards').raise_for_status()
+    swept = time.perf_counter()
+    print(json.dumps({
+        'startup_ms': round((started - start) * 1e3, 1),
+        'startup_rss_mb': round(startup_rss, 1),
+        'sweep_ms': round((swept - started) * 1e3, 1),
+        'sweep_rss_mb': round(rss_mb(), 1),
+        'resident': len(main.partitions()),
+    }))
+"""
+
+
+def write_cities(directory: str, count: int) -> str:
+    """Registry of count synthetic cities under directory; returns the registry path"""
+    from data.wards import SNAPSHOT_PATH
+
+    with open(SNAPSHOT_PATH) as f:
+        snapshot = f.read()
+    entries = []
+    for i in range(count):
+        city_id = f"city-{i}"
+        os.makedirs(os.path.join(directory, city_id))
+        with open(os.path.join(directory, city_id, "wards.json"), "w") as f:
+            f.write(snapshot)
+        entries.append({"id": city_id, "name": f"City {i}", "state": "IL", "ward_count": 50})
+    registry = os.path.join(directory, "jurisdictions.json")
+    with open(registry, "w") as f:
+        json.dump(entries, f)
+    return registry
+
+
+def run(count: int, max_resident: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            CIVICPIE_JURISDICTIONS_FILE=write_cities(directory, count),
+            CIVICPIE_JURISDICTIONS_DIR=directory,
+            CIVICPIE_MAX_JURISDICTIONS=str(max_resident),
+            CIVICPIE_SNAPSHOT_WATCH_S="0",
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", SNIPPET],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+    return {"cities": count, **json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", default="1,10,100,1000", help="comma-separated city counts")
+    parser.add_argument("--max-resident", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    results = [run(int(count), args.max_resident) for count in args.cities.split(",")]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
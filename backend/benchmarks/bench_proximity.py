@@ -0,0 +1,101 @@
+"""
+Benchmark nearest-ward-office and neighborhood lookups.
+
+Generates --queries random points over the city's bounding box (seeded) and
+times, against the index built from the ward snapshot:
+
+    brute      per-point linear scan over every office (the baseline)
+    tree       per-point KD-tree k-nearest
+    radius     per-point KD-tree radius query
+    batch      one vectorized nearest_batch call over all points
+    neighborhood  per-query name lookups (names, aliases, partial words)
+
+and checks that tree and batch return the same wards as the linear scan.
+
+Usage (from backend/):
+    python -m benchmarks.bench_proximity [--queries 100000] [--k 5]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+from time import perf_counter
+
+from benchmarks.load_test import BACKEND_DIR
+
+sys.path.insert(0, BACKEND_DIR)
+
+# Roughly the city limits
+LAT_RANGE = (41.64, 42.02)
+LNG_RANGE = (-87.94, -87.52)
+
+
+def _timed(fn, queries) -> dict:
+    start = perf_counter()
+    results = [fn(q) for q in queries]
+    elapsed = perf_counter() - start
+    return {
+        "total_ms": round(elapsed * 1e3, 1),
+        "us_per_query": round(elapsed / len(queries) * 1e6, 2),
+        "queries_per_s": round(len(queries) / elapsed),
+    }, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--radius-km", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from data.wards import load_ward_records
+    from geo.proximity import ProximityIndex
+
+    start = perf_counter()
+    index = ProximityIndex(load_ward_records())
+    build_ms = (perf_counter() - start) * 1e3
+
+    rng = random.Random(args.seed)
+    points = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(args.queries)]
+    projected = [index.project(lat, lng) for lat, lng in points]
+    offices = [(index.project(o.lat, o.lng), o.ward_id) for o in index.offices]
+    k = args.k
+
+    def brute(xy):
+        x, y = xy
+        return [w for _, w in sorted((math.hypot(x - ox, y - oy), w) for (ox, oy), w in offices)[:k]]
+
+    tree = index.tree
+    ward_of = [o.ward_id for o in index.offices]
+    results = {"offices": len(index.offices), "queries": args.queries, "k": k, "build_ms": round(build_ms, 2)}
+    results["brute"], expected = _timed(brute, projected)
+    results["tree"], found = _timed(lambda xy: [ward_of[i] for _, i in tree.nearest(xy[0], xy[1], k)], projected)
+    results["radius"], _ = _timed(lambda xy: tree.within(xy[0], xy[1], args.radius_km), projected)
+
+    index.nearest_batch(points[:1], k)  # import NumPy and build the office arrays outside the timing
+    start = perf_counter()
+    batch_ids, _ = index.nearest_batch(points, k)
+    elapsed = perf_counter() - start
+    results["batch"] = {
+        "total_ms": round(elapsed * 1e3, 1),
+        "us_per_query": round(elapsed / args.queries * 1e6, 3),
+        "queries_per_s": round(args.queries / elapsed),
+    }
+
+    names = list(index.neighborhoods.names.values()) + list(index.neighborhoods.aliases) + ["kenwood", "the loop", "park"]
+    lookups = [names[i % len(names)] for i in range(args.queries)]
+    results["neighborhood"], _ = _timed(index.neighborhoods.match, lookups)
+
+    results["tree_matches_brute"] = found == expected
+    results["batch_matches_brute"] = batch_ids.tolist() == expected
+    results["batch_speedup_vs_brute"] = round(results["brute"]["total_ms"] / results["batch"]["total_ms"], 1)
+    print(json.dumps(results, indent=2))
+    if not (results["tree_matches_brute"] and results["batch_matches_brute"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the default FastAPI serialization path with the fast path.
+
+Encoding-only timings (per response):
+    default   - response_model validation + jsonable_encoder + json.dumps
+    fast      - dumps() of pre-validated models (orjson)
+    prepared  - cached PreparedPayload (serialize once, compress once)
+
+End-to-end timings drive /api/wards in-process with CIVICPIE_FAST_JSON
+off and on, with and without Accept-Encoding.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--scale N]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from time import perf_counter
+from typing import List
+
+from benchmarks.load_test import BACKEND_DIR
+
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _time_us(fn, iterations: int) -> float:
+    fn()
+    start = perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (perf_counter() - start) / iterations * 1e6
+
+
+def bench_encoding(scale: int, iterations: int) -> dict:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    import main
+    from api.responses import PreparedPayload, compress, dumps
+
+    wards = list(main.ward_snapshot().values()) * scale
+    adapter = TypeAdapter(List[main.Ward])
+
+    def default_path():
+        validated = adapter.validate_python(wards, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_path():
+        return dumps(wards)
+
+    payload = PreparedPayload.from_content(wards)
+    payload.encoded("gzip")
+
+    def prepared_path():
+        return payload.encoded("gzip")
+
+    body = fast_path()
+    results = {
+        "wards": len(wards),
+        "body_bytes": len(body),
+        "gzip_bytes": len(compress(body, "gzip")),
+        "default_us": round(_time_us(default_path, iterations), 2),
+        "fast_us": round(_time_us(fast_path, iterations), 2),
+        "prepared_gzip_us": round(_time_us(prepared_path, iterations), 3),
+    }
+    try:
+        results["br_bytes"] = len(compress(body, "br"))
+    except (ImportError, ValueError):
+        pass
+    results["speedup_fast"] = round(results["default_us"] / results["fast_us"], 1)
+    return results
+
+
+async def _drive(path: str, requests: int, headers: dict) -> float:
+    import httpx
+
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(20):
+            await client.get(path, headers=headers)
+        start = perf_counter()
+        for _ in range(requests):
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+        return (perf_counter() - start) / requests * 1e6
+
+
+def bench_endpoint(requests: int) -> dict:
+    import main
+
+    results = {}
+    for fast in (False, True):
+        main.FAST_JSON = fast
+        label = "fast" if fast else "default"
+        results[f"{label}_identity_us"] = round(asyncio.run(_drive("/api/wards", requests, {"accept-encoding": "identity"})), 2)
+        results[f"{label}_gzip_us"] = round(asyncio.run(_drive("/api/wards", requests, {"accept-encoding": "gzip"})), 2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20, help="multiply the 50-ward list to simulate large responses")
+    parser.add_argument("--iterations", type=int, default=200, help="encoding iterations")
+    parser.add_argument("--requests", type=int, default=500, help="in-process requests per variant")
+    args = parser.parse_args(argv)
+
+    results = {
+        "encoding_50": bench_encoding(1, args.iterations * 10),
+        f"encoding_{50 * args.scale}": bench_encoding(args.scale, args.iterations),
+        "endpoint_/api/wards": bench_endpoint(args.requests),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Import-time profile check for the backend.
+
+Imports `main` in a fresh interpreter with `-X importtime`, reports the
+slowest modules, and fails if a module that should only load on first use
+(LLM clients, pandas/openpyxl, scrapy, numpy, brotli, official models) was
+imported eagerly or if the total import time exceeds the budget. Also
+measures time to the first /api/wards response with warm start disabled,
+i.e. a serverless cold start. The deferred-module check also runs in the
+test suite (tests/test_import_time.py); this script adds the timings.
+
+Usage (from backend/):
+    python -m benchmarks.check_import_time [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.load_test import BACKEND_DIR
+
+# Modules that must never be imported by `import main`
+DEFERRED_MODULES = (
+    "openai",
+    "anthropic",
+    "pandas",
+    "openpyxl",
+    "numpy",
+    "scrapy",
+    "brotli",
+    "sqlalchemy",
+    "redis",
+    "models.official",
+)
+
+COLD_START_SNIPPET = """
+import os, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client_ready = time.perf_counter()
+with TestClient(main.app) as client:
+    client.get('/api/wards').raise_for_status()
+done = time.perf_counter()
+print(f'{(imported - start) * 1000:.1f} {(done - client_ready) * 1000:.1f}')
+"""
+
+
+def profile_imports() -> list:
+    """Return (module, self_us, cumulative_us) rows for `import main`"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        rows.append((parts[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def cold_start(env_overrides: dict) -> tuple:
+    env = dict(os.environ, **env_overrides)
+    proc = subprocess.run(
+        [sys.executable, "-c", COLD_START_SNIPPET],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    import_ms, first_request_ms = proc.stdout.split()
+    return float(import_ms), float(first_request_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="maximum cumulative import time of main")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    args = parser.parse_args(argv)
+
+    rows = profile_imports()
+    imported = {name for name, _, _ in rows}
+    total_ms = next(cum for name, _, cum in rows if name == "main") / 1000
+    eager = sorted(m for m in DEFERRED_MODULES if m in imported)
+
+    print(f"import main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print("slowest modules (self time):")
+    for name, self_us, cum_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cum_us / 1000:8.1f} ms)  {name}")
+
+    import_ms, first_ms = cold_start({"CIVICPIE_WARM_START": "0", "CIVICPIE_FAST_JSON": "1"})
+    print(json.dumps({"cold_import_ms": import_ms, "cold_first_request_ms": first_ms}))
+
+    failures = []
+    if eager:
+        failures.append(f"deferred modules imported eagerly: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
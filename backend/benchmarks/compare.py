@@ -0,0 +1,73 @@
+"""
+Compare two load-test result files and flag latency/throughput regressions.
+
+Usage (from backend/):
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Exits with status 1 if any scenario's p95 latency grew, or throughput
+dropped, by more than the threshold percentage.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = (
+    ("throughput_rps", "higher"),
+    ("p50_ms", "lower"),
+    ("p95_ms", "lower"),
+    ("p99_ms", "lower"),
+)
+
+# Metrics that fail the comparison when they regress past the threshold
+GATED = ("throughput_rps", "p95_ms")
+
+
+def change_pct(old: float, new: float) -> float:
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def compare(old: dict, new: dict, threshold: float):
+    """Yield (scenario, metric, old, new, change %, regressed) rows"""
+    for scenario, new_stats in new["scenarios"].items():
+        old_stats = old["scenarios"].get(scenario)
+        if old_stats is None:
+            continue
+        for metric, better in METRICS:
+            before, after = old_stats.get(metric), new_stats.get(metric)
+            if before is None or after is None:
+                continue
+            delta = change_pct(before, after)
+            worse = -delta if better == "higher" else delta
+            yield scenario, metric, before, after, delta, metric in GATED and worse > threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"Comparing {old.get('commit')} ({old.get('mode')}) -> {new.get('commit')} ({new.get('mode')})\n")
+    regressions = 0
+    for scenario, metric, before, after, delta, regressed in compare(old, new, args.threshold):
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {scenario:12s} {metric:15s} {before:12.3f} -> {after:12.3f}  ({delta:+7.1f}%){flag}")
+        regressions += regressed
+
+    if regressions:
+        print(f"\n{regressions} regression(s) beyond {args.threshold}%")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Load-test and benchmark suite for the CivicPie API.
+
+Drives the FastAPI app in-process (httpx ASGI transport, no network) or a
+running server (e.g. a local uvicorn) with a reproducible, weighted mix of
+requests against the ward, search and chat endpoints, then reports
+throughput and p50/p95/p99 latency per scenario.
+
+Usage (from backend/):
+    # In-process, results written to benchmarks/results/<commit>-<mode>.json
+    python -m benchmarks.load_test
+
+    # Against a local uvicorn started by the suite
+    python -m benchmarks.load_test --serve
+
+    # Against an already running server
+    python -m benchmarks.load_test --url http://localhost:8000
+
+    # Compare two runs
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+QUESTIONS_FILE = os.path.join(BENCH_DIR, "data", "questions.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+SCENARIOS = ("wards", "ward_detail", "search", "chat")
+
+# Simulated distinct clients, so per-client rate limits see realistic traffic.
+# They are sent as X-Forwarded-For, which the app only honors from a trusted
+# proxy, so local runs (in-process or --serve) trust loopback.
+CLIENT_POOL = 2000
+
+
+@dataclass
+class ScenarioResult:
+    """Latency samples and error count for one scenario"""
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, status: int, elapsed: float):
+        self.latencies.append(elapsed)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+
+    def summary(self, wall_time: float) -> Dict:
+        ordered = sorted(self.latencies)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+            "throughput_rps": round(len(ordered) / wall_time, 2) if wall_time else 0.0,
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+            "p50_ms": percentile_ms(ordered, 50),
+            "p95_ms": percentile_ms(ordered, 95),
+            "p99_ms": percentile_ms(ordered, 99),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+        }
+
+
+def percentile_ms(ordered: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted latencies (seconds), in milliseconds"""
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1] * 1000, 3)
+
+
+def load_mix(path: str = QUESTIONS_FILE) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """Load the weighted chat question and search query mixes"""
+    with open(path) as f:
+        data = json.load(f)
+    questions = [(q["message"], q["weight"]) for q in data["questions"]]
+    queries = [(q["query"], q["weight"]) for q in data["search_queries"]]
+    return questions, queries
+
+
+def build_plan(scenarios, requests: int, seed: int, mix_path: str = QUESTIONS_FILE) -> List[Tuple[str, str, str, Optional[Dict], Dict]]:
+    """
+    Build a deterministic request plan.
+
+    Returns a list of (scenario, method, path, json_body, headers) tuples;
+    the same seed always produces the same sequence so runs are comparable.
+    """
+    rng = random.Random(seed)
+    questions, queries = load_mix(mix_path)
+    q_texts, q_weights = zip(*questions)
+    s_texts, s_weights = zip(*queries)
+
+    plan = []
+    for scenario in scenarios:
+        for _ in range(requests):
+            client = rng.randrange(CLIENT_POOL)
+            headers = {"x-forwarded-for": f"10.{client >> 8}.{client & 255}.1"}
+            if scenario == "wards":
+                plan.append((scenario, "GET", "/api/wards", None, headers))
+            elif scenario == "ward_detail":
+                plan.append((scenario, "GET", f"/api/wards/{rng.randint(1, 50)}", None, headers))
+            elif scenario == "search":
+                query = rng.choices(s_texts, s_weights)[0]
+                ward_id = rng.choice([None, None, None, rng.randint(1, 50)])
+                path = f"/api/search?query={query.replace(' ', '+')}"
+                if ward_id:
+                    path += f"&ward_id={ward_id}"
+                plan.append((scenario, "GET", path, None, headers))
+            elif scenario == "chat":
+                body = {
+                    "message": rng.choices(q_texts, q_weights)[0],
+                    "ward_id": rng.choice([None, rng.randint(1, 50)]),
+                    "conversation_history": [],
+                }
+                plan.append((scenario, "POST", "/api/chat", body, headers))
+            else:
+                raise ValueError(f"Unknown scenario: {scenario}")
+    return plan
+
+
+async def run_scenario(client, name: str, plan, concurrency: int, warmup: int) -> Tuple[ScenarioResult, float]:
+    """Replay one scenario's plan with a fixed number of concurrent workers"""
+    items = [p for p in plan if p[0] == name]
+    for _, method, path, body, headers in items[:warmup]:
+        await client.request(method, path, json=body, headers=headers)
+
+    result = ScenarioResult(name=name)
+    queue = iter(items)
+
+    async def worker():
+        for _, method, path, body, headers in queue:
+            start = perf_counter()
+            try:
+                response = await client.request(method, path, json=body, headers=headers)
+                status = response.status_code
+                await response.aread()
+            except Exception:
+                status = 599
+            result.record(status, perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return result, perf_counter() - start
+
+
+async def run_suite(client, scenarios, requests: int, concurrency: int, warmup: int, seed: int) -> Dict:
+    plan = build_plan(scenarios, requests, seed)
+    summaries = {}
+    for name in scenarios:
+        result, wall = await run_scenario(client, name, plan, concurrency, warmup)
+        summaries[name] = result.summary(wall)
+        s = summaries[name]
+        print(
+            f"  {name:12s} {s['requests']:6d} req  {s['throughput_rps']:10.1f} req/s  "
+            f"p50 {s['p50_ms']:8.3f} ms  p95 {s['p95_ms']:8.3f} ms  p99 {s['p99_ms']:8.3f} ms  "
+            f"errors {s['errors']}",
+            file=sys.stderr,
+        )
+    return summaries
+
+
+def in_process_client(app_factory: Optional[Callable] = None):
+    """httpx client bound to the ASGI app, no sockets involved"""
+    import httpx
+
+    if app_factory is None:
+        sys.path.insert(0, BACKEND_DIR)
+        from main import app
+    else:
+        app = app_factory()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://inprocess", timeout=30)
+
+
+def http_client(url: str, concurrency: int):
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(base_url=url, limits=limits, timeout=30)
+
+
+def start_uvicorn(port: int, workers: int = 1) -> subprocess.Popen:
+    """Start a local uvicorn server for the app and wait until /health answers"""
+    import httpx
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"uvicorn did not become healthy on port {port}")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent client workers")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured warm-up requests per scenario")
+    parser.add_argument("--seed", type=int, default=48, help="RNG seed for the request mix")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    target.add_argument("--serve", action="store_true", help="start a local uvicorn and benchmark it")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --serve")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<mode>.json)")
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    os.environ.setdefault("CIVICPIE_TRUSTED_PROXIES", "127.0.0.1")
+    server = None
+    if args.serve:
+        server = start_uvicorn(args.port, args.workers)
+        mode, url = "uvicorn", f"http://127.0.0.1:{args.port}"
+    elif args.url:
+        mode, url = "http", args.url
+    else:
+        mode, url = "in-process", None
+
+    async def run():
+        client = http_client(url, args.concurrency) if url else in_process_client()
+        async with client:
+            return await run_suite(client, scenarios, args.requests, args.concurrency, args.warmup, args.seed)
+
+    print(f"[{datetime.now().isoformat()}] Benchmarking {mode} ({url or 'ASGI'})", file=sys.stderr)
+    try:
+        summaries = asyncio.run(run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "mode": mode,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "workers": args.workers if args.serve else None,
+        },
+        "scenarios": summaries,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}-{mode}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"  -> Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
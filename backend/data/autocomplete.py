@@ -0,0 +1,201 @@
+"""
+Typeahead suggestions backed by a prefix trie with precomputed top-k.
+
+Entries come from the ward snapshot: ward numbers, alderperson names,
+neighborhoods (the snapshot's `neighborhoods`, i.e. WARD_NEIGHBORHOODS from
+sync_ward_data.py) and the streets of ward offices. Every word of a label is
+indexed, so "quez" finds "Anthony J. Quezada" and "park" finds "Wicker Park".
+
+Each trie node stores the ids of its best TOP_K entries by weight, computed
+once at build time, so a lookup walks the prefix and returns that node's
+list: O(prefix length), independent of how many entries match.
+
+Weights are a per-type prior plus popularity counts (searches for a term).
+Only searches naming a known label are counted, so arbitrary client input
+cannot grow the counts beyond the number of labels.
+Indexes are immutable; callers rebuild and swap the reference when ward data
+or popularity changes.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+TOP_K = 10
+
+# Ward numbers and aldermen are what people look for most
+TYPE_PRIOR = {'ward': 3.0, 'alderman': 2.0, 'neighborhood': 1.5, 'street': 1.0}
+POPULARITY_WEIGHT = 1.0
+
+_WORD = re.compile(r"[a-z0-9]+")
+# "1234 N Milwaukee Ave, Suite 5" -> "Milwaukee Ave"
+_STREET = re.compile(r"^\s*\d+[A-Za-z]?\s+(?:[NSEW]\.?\s+)?([^,#]+?)(?:\s+(?:Suite|Ste|Unit|#).*)?\s*(?:,|$)", re.I)
+
+
+def normalize(text: str) -> str:
+    return ' '.join(_WORD.findall(text.lower()))
+
+
+@dataclass(frozen=True)
+class Entry:
+    type: str
+    label: str
+    ward_ids: Tuple[int, ...]
+    weight: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.type, 'label': self.label, 'ward_ids': list(self.ward_ids)}
+
+
+def street_name(address: str) -> Optional[str]:
+    match = _STREET.match(address or '')
+    return match.group(1).strip() if match else None
+
+
+def build_entries(records: Iterable[Dict[str, Any]], popularity: Optional[Mapping[str, int]] = None) -> List[Entry]:
+    """Suggestion entries from ward records, weighted by popularity counts"""
+    popularity = popularity or {}
+    by_label: Dict[Tuple[str, str], set] = {}
+    for record in records:
+        ward_id = record['ward']
+        by_label.setdefault(('ward', f"Ward {ward_id}"), set()).add(ward_id)
+        if record.get('alderperson'):
+            by_label.setdefault(('alderman', record['alderperson']), set()).add(ward_id)
+        for neighborhood in record.get('neighborhoods', ()):
+            by_label.setdefault(('neighborhood', neighborhood), set()).add(ward_id)
+        street = street_name(record.get('wardOfficeAddress', ''))
+        if street:
+            by_label.setdefault(('street', street), set()).add(ward_id)
+
+    entries = []
+    for (kind, label), wards in by_label.items():
+        weight = TYPE_PRIOR[kind] + POPULARITY_WEIGHT * popularity.get(normalize(label), 0)
+        entries.append(Entry(kind, label, tuple(sorted(wards)), weight))
+    return entries
+
+
+def _keys(entry: Entry) -> List[str]:
+    """Every word-start suffix of the label ("ward 35", "35")"""
+    words = normalize(entry.label).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """Character trie; node i has children[i] (char -> node) and top[i] (entry ids)"""
+
+    def __init__(self, entries: List[Entry], k: int = TOP_K):
+        self.entries = entries
+        self.k = k
+        self._children: List[Dict[str, int]] = [{}]
+        self._top: List[Tuple[int, ...]] = []
+        terminal: Dict[int, List[int]] = {}
+        for entry_id, entry in enumerate(entries):
+            for key in _keys(entry):
+                node = 0
+                for char in key:
+                    child = self._children[node].get(char)
+                    if child is None:
+                        child = len(self._children)
+                        self._children.append({})
+                        self._children[node][char] = child
+                    node = child
+                terminal.setdefault(node, []).append(entry_id)
+        self._top = [()] * len(self._children)
+        self._fill_top(terminal)
+
+    def _rank(self, entry_id: int) -> Tuple[float, str]:
+        entry = self.entries[entry_id]
+        return (-entry.weight, entry.label)
+
+    def _fill_top(self, terminal: Dict[int, List[int]]) -> None:
+        # Children always have higher ids than their parent, so a reverse
+        # pass sees every child before the node itself
+        for node in range(len(self._children) - 1, -1, -1):
+            candidates = set(terminal.get(node, ()))
+            for child in self._children[node].values():
+                candidates.update(self._top[child])
+            self._top[node] = tuple(sorted(candidates, key=self._rank)[:self.k])
+
+    @property
+    def node_count(self) -> int:
+        return len(self._children)
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[Entry]:
+        """Best entries whose label has a word starting with prefix"""
+        node = 0
+        children = self._children
+        for char in normalize(prefix):
+            node = children[node].get(char)
+            if node is None:
+                return []
+        return [self.entries[i] for i in self._top[node][:limit]]
+
+
+def build_index(records: Iterable[Dict[str, Any]], popularity: Optional[Mapping[str, int]] = None) -> PrefixIndex:
+    return PrefixIndex(build_entries(records, popularity))
+
+
+class Autocomplete:
+    """
+    Current index plus popularity counts. Rebuilds happen off the request
+    path and replace `index` in one assignment, so readers always see a
+    complete index.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], rebuild_interval: float = 60.0):
+        self.rebuild_interval = rebuild_interval
+        self.popularity: Counter = Counter()
+        self._records = list(records)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+        self._set_index(build_index(self._records))
+
+    def _set_index(self, index: PrefixIndex) -> None:
+        self.labels = frozenset(normalize(entry.label) for entry in index.entries)
+        self.index = index
+
+    def record_query(self, query: str) -> None:
+        """Count a search for popularity weighting (only if it names a suggestion)"""
+        key = normalize(query)
+        if key in self.labels:
+            self.popularity[key] += 1
+            self._dirty = True
+
+    @property
+    def stale(self) -> bool:
+        return self._dirty and time.monotonic() - self.built_at > self.rebuild_interval
+
+    def rebuild(self, records: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """Build a new index (new ward records and/or popularity) and swap it in"""
+        with self._lock:
+            self._rebuild(records)
+
+    def rebuild_if_stale(self) -> bool:
+        """Fold in new popularity counts if due; no-op while another rebuild runs"""
+        if not self.stale or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._rebuild(None)
+        finally:
+            self._lock.release()
+        return True
+
+    def _rebuild(self, records: Optional[Iterable[Dict[str, Any]]]) -> None:
+        if records is not None:
+            self._records = list(records)
+        self._dirty = False
+        self.built_at = time.monotonic()
+        index = build_index(self._records, dict(self.popularity))
+        if records is not None:
+            # Forget counts of labels the new ward data no longer has
+            labels = {normalize(entry.label) for entry in index.entries}
+            for key in [key for key in self.popularity if key not in labels]:
+                del self.popularity[key]
+        self._set_index(index)
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[Entry]:
+        return self.index.suggest(prefix, limit)
@@ -0,0 +1,206 @@
+"""
+Append-only temporal history of ward seats and officials.
+
+Each sync records the current state of every entity (e.g. "ward:35", or an
+Official id); only fields that changed are appended, as a delta line, so the
+log grows with changes rather than with sync runs. Every CHECKPOINT_EVERY
+deltas an entity also gets a checkpoint line with its full state.
+
+In memory each entity keeps its delta times in a sorted list. "State as of
+X" is a bisect over those times (O(log n)) plus at most CHECKPOINT_EVERY - 1
+deltas applied on top of the preceding checkpoint, never a replay of the
+full history.
+
+Log format (JSON lines, times in UTC epoch seconds):
+    {"t": 1684108800, "e": "ward:35", "s": {"alderperson": "..."}, "u": ["wardFax"]}
+    {"t": 1684108800, "e": "ward:35", "c": {...full state...}}
+"""
+
+import bisect
+import json
+import os
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+HISTORY_PATH = os.environ.get(
+    "CIVICPIE_HISTORY_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'ward-history.jsonl'),
+)
+
+CHECKPOINT_EVERY = 32
+
+# Bookkeeping fields that change on every sync and are not history
+IGNORED_FIELDS = frozenset(('scraped_at', 'last_updated'))
+
+Timestamp = Union[int, float, datetime, date, str]
+
+
+def to_epoch(value: Timestamp, end_of_day: bool = True) -> int:
+    """
+    Epoch seconds for a datetime, date, ISO string or number. A bare date
+    means the end of that day, so "on 2023-05-15" includes changes made
+    that day.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if 'T' in value or ' ' in value else date.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.max if end_of_day else time.min)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def ward_entity(ward_id: int) -> str:
+    return f"ward:{ward_id}"
+
+
+class _Timeline:
+    """Delta times, deltas and checkpoints for one entity"""
+
+    __slots__ = ('times', 'deltas', 'checkpoints', 'current')
+
+    def __init__(self):
+        self.times: List[int] = []
+        self.deltas: List[Tuple[Dict[str, Any], Tuple[str, ...]]] = []
+        # checkpoints[k] = full state after deltas[k * CHECKPOINT_EVERY]
+        self.checkpoints: List[Dict[str, Any]] = []
+        self.current: Dict[str, Any] = {}
+
+    def append(self, t: int, changed: Dict[str, Any], unset: Tuple[str, ...],
+               checkpoint: Optional[Dict[str, Any]] = None) -> bool:
+        """Add a delta; returns True when a checkpoint is due at this index"""
+        self.times.append(t)
+        self.deltas.append((changed, unset))
+        self.current = _apply(self.current, changed, unset)
+        if (len(self.deltas) - 1) % CHECKPOINT_EVERY == 0:
+            self.checkpoints.append(checkpoint if checkpoint is not None else dict(self.current))
+            return True
+        return False
+
+    def state_at(self, t: int) -> Optional[Dict[str, Any]]:
+        index = bisect.bisect_right(self.times, t) - 1
+        if index < 0:
+            return None
+        base = index - index % CHECKPOINT_EVERY
+        state = dict(self.checkpoints[base // CHECKPOINT_EVERY])
+        for changed, unset in self.deltas[base + 1:index + 1]:
+            state = _apply(state, changed, unset)
+        return state
+
+
+def _apply(state: Dict[str, Any], changed: Dict[str, Any], unset: Iterable[str]) -> Dict[str, Any]:
+    state = {**state, **changed}
+    for field in unset:
+        state.pop(field, None)
+    return state
+
+
+class HistoryStore:
+    """Field-level delta log with per-entity checkpoints"""
+
+    def __init__(self, path: Optional[str] = HISTORY_PATH):
+        self.path = path
+        self._timelines: Dict[str, _Timeline] = {}
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'c' in entry:
+                    # A checkpoint follows the delta it describes
+                    timeline = self._timelines[entry['e']]
+                    index = (len(timeline.deltas) - 1) // CHECKPOINT_EVERY
+                    timeline.checkpoints[index] = entry['c']
+                    continue
+                timeline = self._timelines.setdefault(entry['e'], _Timeline())
+                timeline.append(entry['t'], entry.get('s', {}), tuple(entry.get('u', ())))
+
+    def __len__(self) -> int:
+        return sum(len(t.deltas) for t in self._timelines.values())
+
+    def entities(self) -> List[str]:
+        return list(self._timelines)
+
+    def record(self, entity: str, state: Dict[str, Any], at: Optional[Timestamp] = None) -> Optional[Dict[str, Any]]:
+        """Record an entity's current state; returns the delta written, or None if unchanged"""
+        return self.record_many({entity: state}, at).get(entity)
+
+    def record_many(self, states: Dict[str, Dict[str, Any]], at: Optional[Timestamp] = None) -> Dict[str, Dict[str, Any]]:
+        """Record several entities at one time with a single append"""
+        t = to_epoch(at if at is not None else datetime.now(timezone.utc), end_of_day=False)
+        for entity in states:
+            timeline = self._timelines.get(entity)
+            if timeline is not None and timeline.times and t < timeline.times[-1]:
+                raise ValueError(f"History for {entity} is append-only; {t} is before {timeline.times[-1]}")
+        lines, written = [], {}
+        for entity, state in states.items():
+            state = {k: v for k, v in state.items() if k not in IGNORED_FIELDS}
+            timeline = self._timelines.setdefault(entity, _Timeline())
+            changed = {k: v for k, v in state.items() if k not in timeline.current or timeline.current[k] != v}
+            unset = tuple(sorted(k for k in timeline.current if k not in state))
+            if not changed and not unset:
+                continue
+            entry: Dict[str, Any] = {'t': t, 'e': entity, 's': changed}
+            if unset:
+                entry['u'] = list(unset)
+            lines.append(entry)
+            if timeline.append(t, changed, unset) and len(timeline.deltas) > 1:
+                lines.append({'t': t, 'e': entity, 'c': timeline.checkpoints[-1]})
+            written[entity] = entry
+        if lines and self.path:
+            with open(self.path, 'a') as f:
+                f.write(''.join(json.dumps(line, separators=(',', ':'), sort_keys=True) + '\n' for line in lines))
+        return written
+
+    def state_at(self, entity: str, at: Timestamp) -> Optional[Dict[str, Any]]:
+        """Full state of an entity as of a time, or None if it had no history yet"""
+        timeline = self._timelines.get(entity)
+        return timeline.state_at(to_epoch(at)) if timeline else None
+
+    def value_at(self, entity: str, field: str, at: Timestamp) -> Any:
+        state = self.state_at(entity, at)
+        return state.get(field) if state else None
+
+    def all_at(self, at: Timestamp, prefix: str = '') -> Dict[str, Dict[str, Any]]:
+        """State of every entity (optionally with a key prefix such as 'ward:') as of a time"""
+        t = to_epoch(at)
+        result = {}
+        for entity, timeline in self._timelines.items():
+            if entity.startswith(prefix):
+                state = timeline.state_at(t)
+                if state is not None:
+                    result[entity] = state
+        return result
+
+    def changes(self, entity: str) -> List[Dict[str, Any]]:
+        """Every recorded delta for an entity, oldest first"""
+        timeline = self._timelines.get(entity)
+        if timeline is None:
+            return []
+        return [
+            {'at': datetime.fromtimestamp(t, timezone.utc).isoformat(), 'changed': changed, 'unset': list(unset)}
+            for t, (changed, unset) in zip(timeline.times, timeline.deltas)
+        ]
+
+    def record_official(self, official, at: Optional[Timestamp] = None) -> Optional[Dict[str, Any]]:
+        """Record an Official model under its id"""
+        return self.record(official.id, official.model_dump(mode='json'), at)
+
+    # Ward seat helpers
+
+    def record_wards(self, records: Iterable[Dict[str, Any]], at: Optional[Timestamp] = None) -> Dict[str, Dict[str, Any]]:
+        return self.record_many({ward_entity(r['ward']): r for r in records}, at)
+
+    def holder(self, ward_id: int, at: Timestamp) -> Optional[str]:
+        """Who held a ward seat at a time"""
+        return self.value_at(ward_entity(ward_id), 'alderperson', at)
+
+    def wards_at(self, at: Timestamp) -> Dict[int, Dict[str, Any]]:
+        """State of every ward as of a time, keyed by ward number"""
+        return {int(entity.split(':', 1)[1]): state for entity, state in self.all_at(at, 'ward:').items()}
@@ -0,0 +1,139 @@
+"""
+Jurisdictions (cities) served by the API.
+
+Every city is a partition key: its own ward data, indexes and caches (see
+data/partitions.py) and its own routes under /api/jurisdictions/{id}/. The
+unscoped /api/... routes serve DEFAULT_JURISDICTION.
+
+Chicago is built in and keeps the existing CIVICPIE_* data paths. Other
+cities are listed in the registry file (CIVICPIE_JURISDICTIONS_FILE), a JSON
+list of entries such as
+
+    {"id": "evanston", "name": "Evanston", "state": "IL", "ward_count": 9,
+     "population": 75000, "website": "https://www.cityofevanston.org",
+     "origins": ["https://evanston.civicpie.com"]}
+
+Their data lives under CIVICPIE_JURISDICTIONS_DIR/<id>/: wards.json (same
+record shape as the Chicago snapshot), districts/, officials.json, votes/
+and history.jsonl. An entry may point any of these elsewhere (snapshot_path,
+districts_dir, officials_file, votes_dir, history_path). The registry is
+only this metadata, so a city costs nothing until it is first requested.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from geo.proximity import ALIASES
+
+SHARED_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data')
+JURISDICTIONS_FILE = os.environ.get(
+    "CIVICPIE_JURISDICTIONS_FILE", os.path.join(SHARED_DATA_DIR, 'jurisdictions.json'),
+)
+JURISDICTIONS_DIR = os.environ.get(
+    "CIVICPIE_JURISDICTIONS_DIR", os.path.join(SHARED_DATA_DIR, 'jurisdictions'),
+)
+DEFAULT_JURISDICTION = os.environ.get("CIVICPIE_DEFAULT_JURISDICTION", "chicago")
+
+# Ids appear in URLs and file names
+_ID = re.compile(r"^[a-z0-9][a-z0-9-]{0,63}$")
+
+
+@dataclass(frozen=True)
+class Jurisdiction:
+    id: str
+    name: str
+    state: str = ''
+    # Seats on the council; 0 means however many wards the data has
+    ward_count: int = 0
+    population: int = 0
+    district_label: str = 'Ward'
+    representative_title: str = 'Alderperson'
+    website: str = ''
+    # Named pages cited by the chat agent: council, voting_records, elections, services
+    links: Dict[str, str] = field(default_factory=dict)
+    # CORS origins of city-specific frontends
+    origins: Tuple[str, ...] = ()
+    # Colloquial neighborhood names (see geo/proximity.py)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    # Data paths; None means the CIVICPIE_* defaults (the built-in Chicago layout)
+    snapshot_path: Optional[str] = None
+    districts_dir: Optional[str] = None
+    officials_file: Optional[str] = None
+    votes_dir: Optional[str] = None
+    history_path: Optional[str] = None
+
+    def link(self, name: str) -> str:
+        """A named page, or the city website when the registry has none"""
+        return self.links.get(name) or self.website
+
+    def summary(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name, 'state': self.state, 'ward_count': self.ward_count}
+
+
+CHICAGO = Jurisdiction(
+    id='chicago',
+    name='Chicago',
+    state='IL',
+    ward_count=50,
+    population=2_700_000,
+    website='https://chicago.gov',
+    links={
+        'council': 'https://chicago.gov/city/en/about/wards.html',
+        'voting_records': 'https://chicityclerk.com/city-council-news/voting-records/',
+        'elections': 'https://chicagoelections.gov/',
+        'services': 'https://www.chicago.gov/city/en/depts/311.html',
+    },
+    aliases=ALIASES,
+)
+
+_LAYOUT = {
+    'snapshot_path': 'wards.json',
+    'districts_dir': 'districts',
+    'officials_file': 'officials.json',
+    'votes_dir': 'votes',
+    'history_path': 'history.jsonl',
+}
+
+
+def from_entry(entry: Dict[str, Any], directory: str = JURISDICTIONS_DIR) -> Jurisdiction:
+    """Jurisdiction from a registry entry, with data paths defaulting to directory/<id>/"""
+    entry = dict(entry)
+    jurisdiction_id = entry.pop('id', '')
+    if not _ID.match(jurisdiction_id):
+        raise ValueError(f"Invalid jurisdiction id {jurisdiction_id!r}")
+    data_dir = entry.pop('data_dir', None) or os.path.join(directory, jurisdiction_id)
+    for key, name in _LAYOUT.items():
+        entry.setdefault(key, os.path.join(data_dir, name))
+    entry['origins'] = tuple(entry.get('origins', ()))
+    return Jurisdiction(id=jurisdiction_id, **entry)
+
+
+@lru_cache(maxsize=1)
+def load_registry(path: str = JURISDICTIONS_FILE) -> Dict[str, Jurisdiction]:
+    """Built-in Chicago plus every registry entry (an entry with the same id replaces it)"""
+    registry = {CHICAGO.id: CHICAGO}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for entry in json.load(f):
+                jurisdiction = from_entry(entry)
+                registry[jurisdiction.id] = jurisdiction
+    return registry
+
+
+def get_jurisdiction(jurisdiction_id: str) -> Optional[Jurisdiction]:
+    return load_registry().get(jurisdiction_id)
+
+
+def shared_snapshot_path(base: Optional[str], jurisdiction_id: str) -> Optional[str]:
+    """
+    Shared snapshot file of a jurisdiction: base itself for the default one,
+    '<name>.<id><ext>' next to it for the others
+    """
+    if not base or jurisdiction_id == DEFAULT_JURISDICTION:
+        return base
+    root, ext = os.path.splitext(base)
+    return f"{root}.{jurisdiction_id}{ext}"
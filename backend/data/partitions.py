@@ -0,0 +1,189 @@
+"""
+Per-jurisdiction partitions of read-mostly state.
+
+A Partition holds everything built from one city's data (records, validated
+models, search/typeahead/proximity indexes, prepared payloads, resolvers,
+vote and history stores) in named slots filled on first use, so a city
+costs only what its requests actually touch. PartitionCache keeps at most
+MAX_RESIDENT partitions, evicting the least recently used, and drops any
+left idle for IDLE_EVICT_S; an evicted city is rebuilt from its files on
+its next request. Memory is bounded by the resident set, not by how many
+cities are registered, and startup only warms the default city.
+
+Inside `built_only()` a slot that is not built yet raises SlotNotBuilt
+instead of building, so async callers can read built state inline and move
+a first build to a worker thread.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+from data.jurisdictions import Jurisdiction
+from monitoring.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+MAX_RESIDENT = int(os.environ.get("CIVICPIE_MAX_JURISDICTIONS", "8"))
+IDLE_EVICT_S = float(os.environ.get("CIVICPIE_JURISDICTION_IDLE_S", "900"))
+
+# Minimum seconds between idle sweeps (done on access, no background task)
+SWEEP_INTERVAL = 10.0
+
+RESIDENT = REGISTRY.gauge(
+    "civicpie_jurisdictions_resident",
+    "Jurisdictions with data loaded in this worker",
+)
+LOADS = REGISTRY.counter(
+    "civicpie_jurisdiction_loads_total",
+    "Jurisdiction partitions created (first use or after eviction)",
+)
+EVICTIONS = REGISTRY.counter(
+    "civicpie_jurisdiction_evictions_total",
+    "Jurisdiction partitions dropped",
+    ("reason",),
+)
+
+_MISSING = object()
+
+_built_only = contextvars.ContextVar("built_only", default=False)
+
+
+class SlotNotBuilt(Exception):
+    """A slot read inside built_only() has not been built"""
+
+
+@contextmanager
+def built_only():
+    """Make Partition.get raise SlotNotBuilt rather than build a missing slot"""
+    token = _built_only.set(True)
+    try:
+        yield
+    finally:
+        _built_only.reset(token)
+
+
+class Partition:
+    """Lazily built state of one jurisdiction"""
+
+    def __init__(self, jurisdiction: Jurisdiction):
+        self.jurisdiction = jurisdiction
+        self.last_used = time.monotonic()
+        self._slots: Dict[str, Any] = {}
+        # One lock per slot being built, so a slow build (votes) never holds
+        # up another slot; builders may read other slots of the partition
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Bumped by clear(), so a build that started before it is not stored
+        self._generation = 0
+
+    def get(self, name: str, build: Callable[[], Any]) -> Any:
+        """A slot's value, building it once on first use"""
+        value = self._slots.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        if _built_only.get():
+            raise SlotNotBuilt(name)
+        with self._lock:
+            slot_lock = self._building.setdefault(name, threading.Lock())
+        with slot_lock:
+            value = self._slots.get(name, _MISSING)
+            if value is _MISSING:
+                generation = self._generation
+                value = build()
+                with self._lock:
+                    if generation == self._generation:
+                        self._slots[name] = value
+            return value
+
+    def peek(self, name: str, default: Any = None) -> Any:
+        """A slot's value if it was built, without building it"""
+        return self._slots.get(name, default)
+
+    def set(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._slots[name] = value
+
+    def clear(self, keep: Collection[str] = ()) -> None:
+        """Drop every slot except keep (they are rebuilt on next use)"""
+        with self._lock:
+            self._slots = {name: value for name, value in self._slots.items() if name in keep}
+            self._generation += 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots
+
+
+class PartitionCache:
+    """Resident partitions in least recently used order"""
+
+    def __init__(self, lookup: Callable[[str], Optional[Jurisdiction]], max_resident: int = MAX_RESIDENT,
+                 idle_evict: float = IDLE_EVICT_S, pinned: Collection[str] = ()):
+        self.lookup = lookup
+        self.max_resident = max(1, max_resident)
+        self.idle_evict = idle_evict
+        # Never evicted (the default city warmed at startup)
+        self.pinned = frozenset(pinned)
+        self._partitions: "OrderedDict[str, Partition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def get(self, jurisdiction_id: str) -> Optional[Partition]:
+        """The jurisdiction's partition, created if needed; None if it is not registered"""
+        now = time.monotonic()
+        with self._lock:
+            partition = self._partitions.get(jurisdiction_id)
+            if partition is None:
+                jurisdiction = self.lookup(jurisdiction_id)
+                if jurisdiction is None:
+                    return None
+                partition = self._partitions[jurisdiction_id] = Partition(jurisdiction)
+                LOADS.inc()
+                self._evict_over_capacity(jurisdiction_id)
+            self._partitions.move_to_end(jurisdiction_id)
+            partition.last_used = now
+            if now - self._last_sweep >= SWEEP_INTERVAL:
+                self._sweep(now)
+            RESIDENT.set(value=len(self._partitions))
+        return partition
+
+    def _evict_over_capacity(self, added: str) -> None:
+        """Drop least recently used partitions (never pinned ones or the one just added)"""
+        for jurisdiction_id in list(self._partitions):
+            if len(self._partitions) <= self.max_resident:
+                break
+            if jurisdiction_id in self.pinned or jurisdiction_id == added:
+                continue
+            del self._partitions[jurisdiction_id]
+            EVICTIONS.inc("capacity")
+            logger.info("Evicted jurisdiction %s (capacity)", jurisdiction_id)
+
+    def _sweep(self, now: float) -> None:
+        self._last_sweep = now
+        for jurisdiction_id, partition in list(self._partitions.items()):
+            if jurisdiction_id not in self.pinned and now - partition.last_used > self.idle_evict:
+                del self._partitions[jurisdiction_id]
+                EVICTIONS.inc("idle")
+                logger.info("Evicted jurisdiction %s (idle)", jurisdiction_id)
+
+    def evict(self, jurisdiction_id: str) -> bool:
+        with self._lock:
+            evicted = self._partitions.pop(jurisdiction_id, None) is not None
+            RESIDENT.set(value=len(self._partitions))
+        return evicted
+
+    def resident(self) -> List[Partition]:
+        """Resident partitions, least recently used first"""
+        with self._lock:
+            return list(self._partitions.values())
+
+    def __contains__(self, jurisdiction_id: str) -> bool:
+        return jurisdiction_id in self._partitions
+
+    def __len__(self) -> int:
+        return len(self._partitions)
@@ -0,0 +1,76 @@
+"""
+Inverted index over the ward snapshot for /api/search.
+
+Tokens come from the alderperson name, neighborhoods and ward number. The
+index is a plain dict of token -> sorted ward numbers so it can be stored
+in the shared snapshot and loaded without rebuilding.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def build_search_index(records: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Build token -> ward numbers postings from snapshot records"""
+    postings: Dict[str, set] = {}
+    for record in records:
+        ward = record['ward']
+        fields = [record['alderperson'], str(ward), *record['neighborhoods']]
+        for field in fields:
+            for token in tokenize(field):
+                postings.setdefault(token, set()).add(ward)
+    return {token: sorted(wards) for token, wards in sorted(postings.items())}
+
+
+def search_wards(
+    index: Dict[str, List[int]],
+    records_by_ward: Dict[int, Dict[str, Any]],
+    query: str,
+    ward_id: Optional[int] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Find wards matching every query token.
+
+    A token matches exactly or as a prefix of an indexed token, so partial
+    words ("bronze") still find "Bronzeville".
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    matched: Optional[set] = None
+    for token in tokens:
+        wards = set(index.get(token, ()))
+        if not wards:
+            for indexed, postings in index.items():
+                if indexed.startswith(token):
+                    wards.update(postings)
+        matched = wards if matched is None else matched & wards
+        if not matched:
+            return []
+
+    if ward_id is not None:
+        matched &= {ward_id}
+
+    q_lower = query.lower()
+    results = []
+    for ward in sorted(matched):
+        record = records_by_ward[ward]
+        neighborhoods = [n for n in record['neighborhoods'] if any(t in n.lower() for t in tokens)]
+        results.append({
+            'type': 'ward',
+            'ward_id': ward,
+            'title': f"Ward {ward} - {record['alderperson']}",
+            'neighborhoods': neighborhoods or record['neighborhoods'],
+            'url': f"/wards/{ward}",
+            'exact': q_lower == str(ward) or q_lower in record['alderperson'].lower(),
+        })
+    results.sort(key=lambda r: (not r['exact'], r['ward_id']))
+    return results[:limit]
@@ -0,0 +1,97 @@
+"""
+Memory-mapped snapshot file for sharing read-mostly data between workers.
+
+The launcher builds the file once before starting workers; each worker maps
+it read-only. Blobs served as-is (prepared response bodies) live once in the
+OS page cache instead of once per process; blobs read through json() are
+decoded into the caller's heap.
+
+File layout:
+    MAGIC (8 bytes) | TOC length (8 bytes, little endian) | TOC (JSON) | blobs
+
+The TOC maps blob name -> [offset, length] with offsets relative to the
+start of the file.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, Optional
+
+MAGIC = b"CPSNAP1\n"
+_HEADER = struct.Struct("<8sQ")
+
+
+def write_snapshot(path: str, blobs: Dict[str, bytes]) -> None:
+    """Write blobs to a snapshot file atomically"""
+    toc: Dict[str, list] = {}
+    # Offsets depend on the TOC size, so lay out blobs relative to the data
+    # section first and shift them once the TOC is encoded
+    position = 0
+    for name, blob in blobs.items():
+        toc[name] = [position, len(blob)]
+        position += len(blob)
+
+    toc_bytes = json.dumps(toc).encode()
+    # Shifting offsets can grow the TOC; iterate until its size is stable
+    while True:
+        data_start = _HEADER.size + len(toc_bytes)
+        shifted = {name: [data_start + offset, length] for name, (offset, length) in toc.items()}
+        encoded = json.dumps(shifted).encode()
+        if len(encoded) == len(toc_bytes):
+            toc_bytes = encoded
+            break
+        toc_bytes = encoded
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(toc_bytes)))
+        f.write(toc_bytes)
+        for blob in blobs.values():
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class SharedSnapshot:
+    """Read-only view over a snapshot file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, toc_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a CivicPie snapshot")
+        toc_start = _HEADER.size
+        self._toc: Dict[str, list] = json.loads(self._mmap[toc_start:toc_start + toc_length])
+        self._view = memoryview(self._mmap)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._toc
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._toc)
+
+    def blob(self, name: str) -> memoryview:
+        """Zero-copy view of a blob"""
+        offset, length = self._toc[name]
+        return self._view[offset:offset + length]
+
+    def get(self, name: str) -> Optional[memoryview]:
+        return self.blob(name) if name in self._toc else None
+
+    def json(self, name: str) -> Any:
+        return json.loads(bytes(self.blob(name)))
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+
+def open_snapshot(path: Optional[str]) -> Optional[SharedSnapshot]:
+    """Open the snapshot at path, or return None if unset or missing"""
+    if not path or not os.path.exists(path):
+        return None
+    return SharedSnapshot(path)
@@ -0,0 +1,327 @@
+"""
+Columnar roll-call vote store.
+
+Roll-call votes (City Council, state legislature, Congress) are ingested from
+local CSV files in long format, one row per legislator per vote:
+
+    body,vote_id,date,question,legislator_id,name,party,position
+
+Each body is a legislator x vote int8 matrix (YEA/NAY/PRESENT/ABSENT, or
+NOT_SEATED when a legislator was not a member for that vote), grown by
+appending columns. Party alignment, attendance and pairwise agreement are
+kept as running counts updated with matrix operations over only the vote
+columns that arrived or changed, so a refresh costs O(new votes). After each
+refresh a per-official summary table is rebuilt and served as-is.
+
+One refresh runs at a time. It updates copies of the bodies that changed (a
+copy of their arrays, no recomputation) and swaps them in together with the
+new tables, so readers never see a half-applied update.
+
+Ward alderpersons use the legislator id "alderman-{ward}", matching the API.
+
+NumPy is imported lazily by callers (main.vote_store) so the API cold start
+does not pay for it.
+"""
+
+import copy
+import csv
+import glob
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+VOTES_DIR = os.environ.get(
+    "CIVICPIE_VOTES_DIR",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'votes'),
+)
+
+YEA = 1
+NAY = -1
+PRESENT = 2
+ABSENT = 0
+NOT_SEATED = -128
+
+POSITIONS = {
+    'yea': YEA, 'yes': YEA, 'aye': YEA, 'y': YEA,
+    'nay': NAY, 'no': NAY, 'n': NAY,
+    'present': PRESENT, 'pass': PRESENT, 'abstain': PRESENT,
+    'absent': ABSENT, 'not voting': ABSENT, 'excused': ABSENT, 'nv': ABSENT,
+}
+POSITION_NAMES = {YEA: 'yea', NAY: 'nay', PRESENT: 'present', ABSENT: 'absent'}
+
+# Pairs with fewer shared yea/nay votes than this are left out of rankings
+MIN_SHARED_VOTES = 5
+TOP_AGREEMENT = 5
+
+
+@dataclass
+class VoteInfo:
+    vote_id: str
+    date: str
+    question: str
+
+
+@dataclass
+class BodyVotes:
+    """Vote matrix and running aggregates for one legislative body"""
+    name: str
+    legislators: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    parties: List[str] = field(default_factory=list)
+    votes: List[VoteInfo] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    columns: Dict[str, int] = field(default_factory=dict)
+    matrix: np.ndarray = field(default_factory=lambda: np.full((0, 0), NOT_SEATED, dtype=np.int8))
+    # Running counts per legislator; these and the pair counts are allocated
+    # with spare capacity, so only the first len(legislators) entries are live
+    seated: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    cast: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    party_votes: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    with_party: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    # Running counts per legislator pair: same yea/nay position, both yea/nay
+    agree: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+    shared: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+
+    @property
+    def vote_count(self) -> int:
+        return len(self.votes)
+
+    def _ensure_capacity(self, legislators: int, votes: int) -> None:
+        """Grow the matrix geometrically so appends are amortized O(1) per cell"""
+        rows, cols = self.matrix.shape
+        if legislators <= rows and votes <= cols:
+            return
+        new_rows = max(legislators, rows if legislators <= rows else max(8, rows * 2))
+        new_cols = max(votes, cols if votes <= cols else max(64, cols * 2))
+        grown = np.full((new_rows, new_cols), NOT_SEATED, dtype=np.int8)
+        grown[:rows, :cols] = self.matrix
+        self.matrix = grown
+
+    def copy(self) -> 'BodyVotes':
+        """Independent copy, updated while readers keep using this one"""
+        return BodyVotes(**{f.name: copy.copy(getattr(self, f.name)) for f in fields(self)})
+
+    def _add_legislator(self, legislator_id: str, name: str, party: str) -> int:
+        row = len(self.legislators)
+        self.rows[legislator_id] = row
+        self.legislators.append(legislator_id)
+        self.names.append(name)
+        self.parties.append(party)
+        capacity = len(self.seated)
+        if row >= capacity:
+            # Geometric growth, so adding n legislators costs O(n^2) in total
+            capacity = max(8, capacity * 2)
+            for attr in ('seated', 'cast', 'party_votes', 'with_party'):
+                counts = getattr(self, attr)
+                grown = np.zeros(capacity, dtype=np.int64)
+                grown[:row] = counts[:row]
+                setattr(self, attr, grown)
+            for attr in ('agree', 'shared'):
+                counts = getattr(self, attr)
+                grown = np.zeros((capacity, capacity), dtype=np.int64)
+                grown[:row, :row] = counts[:row, :row]
+                setattr(self, attr, grown)
+        return row
+
+    def _accumulate(self, columns: np.ndarray, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) the contribution of vote columns"""
+        if len(columns) == 0:
+            return
+        n = len(self.legislators)
+        block = self.matrix[:n, columns]
+        yea = (block == YEA).astype(np.int64)
+        nay = (block == NAY).astype(np.int64)
+        voted = yea + nay
+
+        self.seated[:n] += sign * (block != NOT_SEATED).sum(axis=1)
+        self.cast[:n] += sign * ((block != NOT_SEATED) & (block != ABSENT)).sum(axis=1)
+        self.agree[:n, :n] += sign * (yea @ yea.T + nay @ nay.T)
+        self.shared[:n, :n] += sign * (voted @ voted.T)
+
+        # Party majority position per vote (0 on ties), broadcast to members
+        party_names, party_index = np.unique(np.array(self.parties, dtype=object), return_inverse=True)
+        membership = np.zeros((n, len(party_names)), dtype=np.int64)
+        membership[np.arange(n), party_index] = 1
+        majority = np.sign(membership.T @ yea - membership.T @ nay)
+        member_majority = majority[party_index]
+        counted = (voted == 1) & (member_majority != 0)
+        self.party_votes[:n] += sign * counted.sum(axis=1)
+        self.with_party[:n] += sign * (counted & (block == member_majority)).sum(axis=1)
+
+    def apply(self, rows: Iterable[Dict[str, str]]) -> int:
+        """Apply CSV rows; returns the number of cells written"""
+        updates: List[Tuple[int, int, int]] = []
+        for row in rows:
+            position = POSITIONS.get(row['position'].strip().lower())
+            if position is None:
+                continue
+            legislator_id = row['legislator_id']
+            r = self.rows.get(legislator_id)
+            if r is None:
+                r = self._add_legislator(legislator_id, row.get('name', ''), row.get('party', '') or 'unknown')
+            c = self.columns.get(row['vote_id'])
+            if c is None:
+                c = len(self.votes)
+                self.columns[row['vote_id']] = c
+                self.votes.append(VoteInfo(row['vote_id'], row.get('date', ''), row.get('question', '')))
+            updates.append((r, c, position))
+        if not updates:
+            return 0
+
+        self._ensure_capacity(len(self.legislators), len(self.votes))
+        rows_idx, cols_idx, values = (np.array(v) for v in zip(*updates))
+        touched = np.unique(cols_idx)
+        # Columns that already counted toward the aggregates are removed
+        # first and re-added with the new cells, so corrections are exact
+        previous = touched[self.matrix[:len(self.legislators), touched].max(axis=0) != NOT_SEATED] if len(touched) else touched
+        self._accumulate(previous, -1)
+        self.matrix[rows_idx, cols_idx] = values.astype(np.int8)
+        self._accumulate(touched, 1)
+        return len(updates)
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Per-legislator attendance, party alignment and closest/furthest colleagues"""
+        n = len(self.legislators)
+        agree, shared = self.agree[:n, :n], self.shared[:n, :n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            agreement = np.where(shared >= MIN_SHARED_VOTES, agree / shared, np.nan)
+        np.fill_diagonal(agreement, np.nan)
+        tables = {}
+        for row, legislator_id in enumerate(self.legislators):
+            seated, cast = int(self.seated[row]), int(self.cast[row])
+            party_votes, with_party = int(self.party_votes[row]), int(self.with_party[row])
+            ranked = [
+                (self.legislators[other], round(float(agreement[row, other]) * 100, 1))
+                for other in np.argsort(-np.nan_to_num(agreement[row], nan=-1.0))
+                if not np.isnan(agreement[row, other])
+            ]
+            tables[legislator_id] = {
+                'legislator_id': legislator_id,
+                'name': self.names[row],
+                'party': self.parties[row],
+                'body': self.name,
+                'votes_eligible': seated,
+                'votes_cast': cast,
+                'missed_votes_percentage': round((seated - cast) / seated * 100, 1) if seated else None,
+                'votes_with_party_percentage': round(with_party / party_votes * 100, 1) if party_votes else None,
+                'votes_against_party_percentage': round((party_votes - with_party) / party_votes * 100, 1) if party_votes else None,
+                'most_aligned': [{'legislator_id': i, 'agreement_percentage': p} for i, p in ranked[:TOP_AGREEMENT]],
+                'least_aligned': [{'legislator_id': i, 'agreement_percentage': p} for i, p in ranked[::-1][:TOP_AGREEMENT]],
+            }
+        return tables
+
+    def recent_votes(self, legislator_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        row = self.rows[legislator_id]
+        votes = []
+        for column in range(len(self.votes) - 1, -1, -1):
+            value = int(self.matrix[row, column])
+            if value == NOT_SEATED:
+                continue
+            info = self.votes[column]
+            votes.append({'vote_id': info.vote_id, 'date': info.date, 'question': info.question,
+                          'position': POSITION_NAMES[value]})
+            if len(votes) == limit:
+                break
+        return votes
+
+
+class VoteStore:
+    """All bodies' vote matrices plus precomputed per-official tables"""
+
+    def __init__(self, directory: str = VOTES_DIR):
+        self.directory = directory
+        # (bodies, per-official tables), replaced as a whole by each update
+        self._tables: Tuple[Dict[str, BodyVotes], Dict[str, Dict[str, Any]]] = ({}, {})
+        # path -> (size, bytes consumed), so appended files are read incrementally
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        # Held by the one update in progress
+        self._lock = threading.Lock()
+        self.refreshed_at = 0.0
+
+    @property
+    def bodies(self) -> Dict[str, BodyVotes]:
+        return self._tables[0]
+
+    @property
+    def officials(self) -> Dict[str, Dict[str, Any]]:
+        return self._tables[1]
+
+    def ingest(self, rows: Iterable[Dict[str, str]]) -> int:
+        """Apply rows from any source and refresh the tables of bodies that changed"""
+        with self._lock:
+            return self._ingest(rows)
+
+    def _ingest(self, rows: Iterable[Dict[str, str]]) -> int:
+        by_body: Dict[str, List[Dict[str, str]]] = {}
+        for row in rows:
+            by_body.setdefault(row['body'], []).append(row)
+        bodies, officials = dict(self.bodies), dict(self.officials)
+        written = 0
+        for name, body_rows in by_body.items():
+            body = bodies[name].copy() if name in bodies else BodyVotes(name)
+            written += body.apply(body_rows)
+            bodies[name] = body
+            officials.update(body.summaries())
+        self._tables = (bodies, officials)
+        return written
+
+    def _read_new_rows(self, path: str) -> List[Dict[str, str]]:
+        size = os.path.getsize(path)
+        previous_size, offset = self._offsets.get(path, (0, 0))
+        if size == previous_size:
+            return []
+        if size < previous_size:
+            offset = 0  # Rewritten; cells are overwritten so a full reread is safe
+        with open(path, 'rb') as f:
+            header = f.readline()
+            if offset:
+                f.seek(offset)
+            data = f.read()
+            end = f.tell()
+        # Only consume complete lines; a partial last line is read next time
+        complete = data[:data.rfind(b'\n') + 1]
+        self._offsets[path] = (size, end - (len(data) - len(complete)))
+        lines = (header + complete).decode('utf-8').splitlines(keepends=True)
+        return list(csv.DictReader(lines))
+
+    def refresh(self) -> int:
+        """
+        Ingest new rows from every CSV in the votes directory. Returns 0 at
+        once if another refresh is already running.
+        """
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            self.refreshed_at = time.monotonic()
+            rows: List[Dict[str, str]] = []
+            for path in sorted(glob.glob(os.path.join(self.directory, '*.csv'))):
+                rows.extend(self._read_new_rows(path))
+            return self._ingest(rows) if rows else 0
+        finally:
+            self._lock.release()
+
+    def official(self, legislator_id: str, recent: int = 10) -> Optional[Dict[str, Any]]:
+        bodies, officials = self._tables
+        summary = officials.get(legislator_id)
+        if summary is None:
+            return None
+        body = bodies[summary['body']]
+        return {**summary, 'recent_votes': body.recent_votes(legislator_id, recent)}
+
+    def agreement(self, body_name: str, a: str, b: str) -> Optional[Dict[str, Any]]:
+        """Pairwise agreement between two legislators of one body"""
+        body = self.bodies.get(body_name)
+        if body is None or a not in body.rows or b not in body.rows:
+            return None
+        i, j = body.rows[a], body.rows[b]
+        shared = int(body.shared[i, j])
+        return {
+            'body': body_name,
+            'legislators': [a, b],
+            'shared_votes': shared,
+            'agreement_percentage': round(int(body.agree[i, j]) / shared * 100, 1) if shared else None,
+        }
@@ -0,0 +1,67 @@
+"""
+Ward snapshot access for the API.
+
+The snapshot (shared/data/chicago-wards.json) mirrors the master TypeScript
+data file and is regenerated by scrapers/sync_ward_data.py. Records use the
+same shape as `WardDataRecord` on the frontend.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List
+
+SNAPSHOT_PATH = os.environ.get(
+    "CIVICPIE_WARD_SNAPSHOT",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'chicago-wards.json'),
+)
+
+# Defaults for fields the data portal does not provide (matches frontend toWard)
+DEFAULT_TERM_START = '2023-05-15'
+DEFAULT_TERM_END = '2027-05-15'
+DEFAULT_POPULATION = 54000  # ~2.7 M / 50
+DEFAULT_OFFICE_HOURS = 'Mon-Fri: 9:00 AM - 5:00 PM'
+
+
+def read_ward_records(path: str = SNAPSHOT_PATH) -> List[Dict[str, Any]]:
+    """Read a ward snapshot, sorted by ward number"""
+    with open(path) as f:
+        records = json.load(f)
+    return sorted(records, key=lambda r: r['ward'])
+
+
+@lru_cache(maxsize=1)
+def load_ward_records(path: str = SNAPSHOT_PATH) -> List[Dict[str, Any]]:
+    """The Chicago snapshot, read once (the API keeps per-city copies in data/partitions.py)"""
+    return read_ward_records(path)
+
+
+def to_ward(record: Dict[str, Any], district_label: str = 'Ward', title: str = 'Alderperson',
+            population: int = DEFAULT_POPULATION) -> Dict[str, Any]:
+    """Convert a snapshot record into the API `Ward` shape"""
+    ward_id = record['ward']
+    return {
+        'id': ward_id,
+        'name': f"{district_label} {ward_id}",
+        'alderman': {
+            'id': f"alderman-{ward_id}",
+            'name': record['alderperson'],
+            'title': title,
+            'email': record['email'],
+            'phone': record['wardPhone'],
+            'photo_url': record.get('photoUrl'),
+            'website': record.get('website'),
+            'twitter': None,
+            'facebook': None,
+            'biography': '',
+            'term_start': DEFAULT_TERM_START,
+            'term_end': DEFAULT_TERM_END,
+            'committees': [],
+        },
+        'neighborhoods': record['neighborhoods'],
+        'population': population,
+        'office_address': f"{record['wardOfficeAddress']}, {record['wardOfficeCity']}, {record['wardOfficeState']} {record['wardOfficeZip']}",
+        'office_phone': record['wardPhone'],
+        'office_email': record['email'],
+        'office_hours': DEFAULT_OFFICE_HOURS,
+    }
@@ -0,0 +1,271 @@
+"""
+District geometries and a precomputed overlay index across district layers.
+
+Every layer (wards, state house/senate, county commission, congressional
+districts) is rasterized onto one shared grid. Each grid cell stores a single
+"combo" id describing, per layer, either the one district that fully covers
+the cell or the few candidate districts whose boundaries cross it. A point
+lookup is then one dict probe plus, only for boundary cells, a point-in-
+polygon test against two or three candidates, instead of testing every
+polygon in every layer.
+
+Coordinates are (longitude, latitude) as in GeoJSON.
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+Point = Tuple[float, float]
+Ring = List[Point]
+
+# ~500 m in latitude; small enough that most cells are interior to every layer
+DEFAULT_CELL_SIZE = 0.005
+
+
+def normalize_district_id(value) -> str:
+    """'Ward 07', 'IL-07', '7' and 7 all normalize to '7'"""
+    text = str(value).strip()
+    digits = ''.join(ch for ch in text if ch.isdigit())
+    return str(int(digits)) if digits else text.lower()
+
+
+@dataclass
+class District:
+    """One district polygon (possibly multi-part, with holes)"""
+    layer: str
+    id: str
+    rings: List[Ring]
+    name: Optional[str] = None
+    bbox: Tuple[float, float, float, float] = field(init=False)
+
+    def __post_init__(self):
+        xs = [x for ring in self.rings for x, _ in ring]
+        ys = [y for ring in self.rings for _, y in ring]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    def edges(self) -> Iterable[Tuple[float, float, float, float]]:
+        for ring in self.rings:
+            for i in range(len(ring)):
+                x1, y1 = ring[i - 1]
+                x2, y2 = ring[i]
+                if (x1, y1) != (x2, y2):
+                    yield x1, y1, x2, y2
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd test across all rings (handles holes and multi-part)"""
+        min_x, min_y, max_x, max_y = self.bbox
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            return False
+        inside = False
+        for ring in self.rings:
+            j = len(ring) - 1
+            for i in range(len(ring)):
+                xi, yi = ring[i]
+                xj, yj = ring[j]
+                if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                    inside = not inside
+                j = i
+        return inside
+
+
+def load_geojson_layer(path: str, layer: str, id_property: str = 'district') -> List[District]:
+    """Load districts from a GeoJSON FeatureCollection of (Multi)Polygons"""
+    with open(path) as f:
+        collection = json.load(f)
+    districts = []
+    for feature in collection['features']:
+        props = feature.get('properties') or {}
+        geometry = feature['geometry']
+        if geometry['type'] == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry['type'] == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            continue
+        rings = [[(float(x), float(y)) for x, y, *_ in ring] for polygon in polygons for ring in polygon]
+        districts.append(District(
+            layer=layer,
+            id=normalize_district_id(props[id_property]),
+            rings=rings,
+            name=props.get('name'),
+        ))
+    return districts
+
+
+def load_layers(directory: str, layer_names: Iterable[str]) -> Dict[str, List[District]]:
+    """Load `<layer>.geojson` from directory for every layer that exists"""
+    layers = {}
+    for layer in layer_names:
+        path = os.path.join(directory, f"{layer}.geojson")
+        if os.path.exists(path):
+            layers[layer] = load_geojson_layer(path, layer)
+    return layers
+
+
+# Per layer, a cell is covered by one district (str), crossed by several
+# candidate boundaries (tuple), or not covered at all (None)
+LayerValue = Union[None, str, Tuple[str, ...]]
+
+
+def _segment_hits_rect(x1, y1, x2, y2, rx0, ry0, rx1, ry1) -> bool:
+    """Liang-Barsky clip test: does the segment intersect the rectangle?"""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for p, q in ((-dx, x1 - rx0), (dx, rx1 - x1), (-dy, y1 - ry0), (dy, ry1 - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return False
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return False
+                t1 = min(t1, t)
+    return True
+
+
+class OverlayIndex:
+    """Grid overlay of several district layers"""
+
+    def __init__(self, layers: Dict[str, List[District]], cell_size: float = DEFAULT_CELL_SIZE):
+        self.layer_names: Tuple[str, ...] = tuple(layers)
+        self.cell_size = cell_size
+        self._districts: Dict[Tuple[str, str], District] = {
+            (d.layer, d.id): d for districts in layers.values() for d in districts
+        }
+        boxes = [d.bbox for d in self._districts.values()]
+        if boxes:
+            self.origin = (min(b[0] for b in boxes), min(b[1] for b in boxes))
+            self.cols = int(math.ceil((max(b[2] for b in boxes) - self.origin[0]) / cell_size)) + 1
+            self.rows = int(math.ceil((max(b[3] for b in boxes) - self.origin[1]) / cell_size)) + 1
+        else:
+            self.origin, self.cols, self.rows = (0.0, 0.0), 0, 0
+
+        # cell -> combo id; combos[id] = per-layer values
+        self._cells: Dict[int, int] = {}
+        self.combos: List[Tuple[LayerValue, ...]] = []
+        self._build(layers)
+
+    def _cell_range(self, lo: float, hi: float, axis: int) -> range:
+        limit = self.cols if axis == 0 else self.rows
+        start = max(0, int((lo - self.origin[axis]) / self.cell_size))
+        stop = min(limit, int((hi - self.origin[axis]) / self.cell_size) + 1)
+        return range(start, stop)
+
+    def _boundary_cells(self, district: District) -> Set[int]:
+        cells = set()
+        size = self.cell_size
+        ox, oy = self.origin
+        for x1, y1, x2, y2 in district.edges():
+            for row in self._cell_range(min(y1, y2), max(y1, y2), 1):
+                ry0 = oy + row * size
+                for col in self._cell_range(min(x1, x2), max(x1, x2), 0):
+                    rx0 = ox + col * size
+                    if _segment_hits_rect(x1, y1, x2, y2, rx0, ry0, rx0 + size, ry0 + size):
+                        cells.add(row * self.cols + col)
+        return cells
+
+    def _interior_cells(self, district: District) -> Set[int]:
+        """Scanline fill: cells whose centers fall inside the district"""
+        cells = set()
+        size = self.cell_size
+        ox, oy = self.origin
+        edges = list(district.edges())
+        min_x, min_y, max_x, max_y = district.bbox
+        for row in self._cell_range(min_y, max_y, 1):
+            yc = oy + (row + 0.5) * size
+            crossings = sorted(
+                x1 + (yc - y1) * (x2 - x1) / (y2 - y1)
+                for x1, y1, x2, y2 in edges
+                if (y1 > yc) != (y2 > yc)
+            )
+            for left, right in zip(crossings[::2], crossings[1::2]):
+                first = max(0, int(math.ceil((left - ox) / size - 0.5)))
+                last = min(self.cols - 1, int(math.floor((right - ox) / size - 0.5)))
+                for col in range(first, last + 1):
+                    cells.add(row * self.cols + col)
+        return cells
+
+    def _build(self, layers: Dict[str, List[District]]) -> None:
+        per_layer: List[Dict[int, LayerValue]] = []
+        for layer, districts in layers.items():
+            boundary: Dict[int, Set[str]] = {}
+            interior: Dict[int, str] = {}
+            for district in districts:
+                for cell in self._boundary_cells(district):
+                    boundary.setdefault(cell, set()).add(district.id)
+                for cell in self._interior_cells(district):
+                    interior[cell] = district.id
+            values: Dict[int, LayerValue] = {}
+            for cell, district_id in interior.items():
+                values[cell] = district_id
+            for cell, candidates in boundary.items():
+                if cell in interior:
+                    candidates = candidates | {interior[cell]}
+                values[cell] = tuple(sorted(candidates))
+            per_layer.append(values)
+
+        interned: Dict[Tuple[LayerValue, ...], int] = {}
+        all_cells = set().union(*per_layer) if per_layer else set()
+        for cell in all_cells:
+            combo = tuple(values.get(cell) for values in per_layer)
+            combo_id = interned.get(combo)
+            if combo_id is None:
+                combo_id = interned[combo] = len(self.combos)
+                self.combos.append(combo)
+            self._cells[cell] = combo_id
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._cells)
+
+    def district(self, layer: str, district_id: str) -> Optional[District]:
+        return self._districts.get((layer, district_id))
+
+    def lookup(self, lng: float, lat: float) -> Dict[str, str]:
+        """Districts containing the point, keyed by layer"""
+        col = int((lng - self.origin[0]) / self.cell_size)
+        row = int((lat - self.origin[1]) / self.cell_size)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return {}
+        combo_id = self._cells.get(row * self.cols + col)
+        if combo_id is None:
+            return {}
+        found = {}
+        for layer, value in zip(self.layer_names, self.combos[combo_id]):
+            if value is None:
+                continue
+            if isinstance(value, str):
+                found[layer] = value
+                continue
+            for candidate in value:
+                if self._districts[(layer, candidate)].contains(lng, lat):
+                    found[layer] = candidate
+                    break
+        return found
+
+    def overlapping(self, layer: str, district_id: str) -> Dict[str, List[str]]:
+        """
+        Districts in other layers that share at least one cell with a district.
+
+        Boundary cells make this conservative: a neighbouring district that
+        only touches the edge may be included.
+        """
+        result: Dict[str, Set[str]] = {name: set() for name in self.layer_names if name != layer}
+        position = self.layer_names.index(layer)
+        for combo in self.combos:
+            value = combo[position]
+            if value != district_id and not (isinstance(value, tuple) and district_id in value):
+                continue
+            for name, other in zip(self.layer_names, combo):
+                if name == layer or other is None:
+                    continue
+                result[name].update((other,) if isinstance(other, str) else other)
+        return {name: sorted(ids, key=lambda i: (len(i), i)) for name, ids in result.items()}
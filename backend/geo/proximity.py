@@ -0,0 +1,350 @@
+"""
+Nearest ward offices and neighborhood -> ward lookups.
+
+Ward offices (the snapshot's `latitude`/`longitude`) are projected onto a
+local equirectangular plane in kilometres (accurate to well under 1% across
+a city) and stored in a 2-d KD-tree for k-nearest and radius queries. Batch
+queries are vectorized with NumPy instead: a chunk of points against every
+office as one distance matrix, which for a few dozen offices beats walking
+the tree point by point. NumPy is imported only when a batch is served.
+
+Neighborhoods come from the snapshot's `neighborhoods` (WARD_NEIGHBORHOODS
+in sync_ward_data.py), a many-to-many map: 'Bronzeville' belongs to wards 3
+and 4. The inverted index maps normalized names and common aliases to their
+wards, plus every word to the neighborhoods containing it, so "kenwood" also
+finds "North Kenwood" as a weaker match.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from data.autocomplete import normalize
+
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_K = 5
+MAX_K = 50
+MAX_BATCH_SIZE = 10000
+# Largest radius_km accepted; a city is a few tens of kilometres across
+MAX_RADIUS_KM = 100.0
+
+# Rows of the batch distance matrix computed at once (bounds memory per chunk)
+BATCH_CHUNK_CELLS = 1 << 20
+
+EXACT_MATCH = 1.0
+PARTIAL_MATCH = 0.5
+
+# Colloquial name -> name used in the ward data (a leading "the" is ignored)
+ALIASES = {
+    'mag mile': 'Magnificent Mile',
+    'ukie village': 'Ukrainian Village',
+    'downtown': 'Loop',
+    'uic': 'University Village',
+    'la villita': 'Little Village',
+    'boys town': 'Boystown',
+    'northalsted': 'Boystown',
+    'lake view': 'Lakeview',
+    'lakeview east': 'East Lakeview',
+    'wrigley': 'Wrigleyville',
+    'ohare': "O'Hare",
+    'gap': 'Bronzeville',
+    'river west': 'West Town',
+    'old town triangle': 'Old Town',
+    'printers row': 'South Loop',
+}
+
+
+@dataclass(frozen=True)
+class Office:
+    ward_id: int
+    lat: float
+    lng: float
+    alderperson: Optional[str] = None
+    address: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'ward_id': self.ward_id, 'alderperson': self.alderperson, 'office_address': self.address}
+
+
+class Projection:
+    """Equirectangular projection to kilometres around a reference latitude"""
+
+    def __init__(self, ref_lat: float):
+        self.kx = math.radians(1) * EARTH_RADIUS_KM * math.cos(math.radians(ref_lat))
+        self.ky = math.radians(1) * EARTH_RADIUS_KM
+
+    def __call__(self, lat: float, lng: float) -> Tuple[float, float]:
+        return lng * self.kx, lat * self.ky
+
+
+class KDTree:
+    """
+    Static 2-d tree over points, stored implicitly: the node of a range
+    [lo, hi) is its median `mid`, with children [lo, mid) and [mid + 1, hi),
+    splitting on x at even depths and y at odd ones. Ranges of at most
+    LEAF_SIZE points are scanned linearly.
+    """
+
+    LEAF_SIZE = 8
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        self._order = list(range(len(points)))
+        self._points = list(points)
+        self._build(0, len(points), 0)
+        self._xs = [self._points[i][0] for i in self._order]
+        self._ys = [self._points[i][1] for i in self._order]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _build(self, lo: int, hi: int, axis: int) -> None:
+        if hi - lo <= self.LEAF_SIZE:
+            return
+        self._order[lo:hi] = sorted(self._order[lo:hi], key=lambda i: self._points[i][axis])
+        mid = (lo + hi) // 2
+        self._build(lo, mid, 1 - axis)
+        self._build(mid + 1, hi, 1 - axis)
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        """k nearest points as (distance, point index), closest first"""
+        k = min(k, len(self._order))
+        if k <= 0:
+            return []
+        # Max-heap of the best k as (-squared distance, -point index): among
+        # equidistant points the lowest index wins, as in a stable sort
+        heap: List[Tuple[float, int]] = []
+        xs, ys, order, leaf = self._xs, self._ys, self._order, self.LEAF_SIZE
+        # (lo, hi, axis, squared distance to the range's half-plane)
+        stack = [(0, len(order), 0, 0.0)]
+        while stack:
+            lo, hi, axis, bound = stack.pop()
+            if len(heap) == k and bound > -heap[0][0]:
+                continue
+            if hi - lo <= leaf:
+                slots = range(lo, hi)
+            else:
+                slots = ((lo + hi) // 2,)
+            for slot in slots:
+                dx = x - xs[slot]
+                dy = y - ys[slot]
+                entry = (-(dx * dx + dy * dy), -order[slot])
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            if hi - lo <= leaf:
+                continue
+            mid = slots[0]
+            diff = x - xs[mid] if axis == 0 else y - ys[mid]
+            if diff < 0:
+                stack.append((mid + 1, hi, 1 - axis, max(bound, diff * diff)))
+                stack.append((lo, mid, 1 - axis, bound))
+            else:
+                stack.append((lo, mid, 1 - axis, max(bound, diff * diff)))
+                stack.append((mid + 1, hi, 1 - axis, bound))
+        return sorted((math.sqrt(-d2), -index) for d2, index in heap)
+
+    def within(self, x: float, y: float, radius: float) -> List[Tuple[float, int]]:
+        """Points within radius as (distance, point index), closest first"""
+        found: List[Tuple[float, int]] = []
+        r2 = radius * radius
+        xs, ys, order, leaf = self._xs, self._ys, self._order, self.LEAF_SIZE
+        stack = [(0, len(order), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= leaf:
+                for slot in range(lo, hi):
+                    dx = x - xs[slot]
+                    dy = y - ys[slot]
+                    d2 = dx * dx + dy * dy
+                    if d2 <= r2:
+                        found.append((math.sqrt(d2), order[slot]))
+                continue
+            mid = (lo + hi) // 2
+            dx = x - xs[mid]
+            dy = y - ys[mid]
+            d2 = dx * dx + dy * dy
+            if d2 <= r2:
+                found.append((math.sqrt(d2), order[mid]))
+            diff = dx if axis == 0 else dy
+            if diff < 0 or diff * diff <= r2:
+                stack.append((lo, mid, 1 - axis))
+            if diff >= 0 or diff * diff <= r2:
+                stack.append((mid + 1, hi, 1 - axis))
+        found.sort()
+        return found
+
+
+class NeighborhoodIndex:
+    """Inverted index from neighborhood names (and aliases) to wards"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], aliases: Optional[Dict[str, str]] = None):
+        self.names: Dict[str, str] = {}  # normalized -> display name
+        self.wards: Dict[str, Tuple[int, ...]] = {}
+        self.by_word: Dict[str, Tuple[str, ...]] = {}
+        wards: Dict[str, set] = {}
+        for record in records:
+            for name in record.get('neighborhoods', ()):
+                key = normalize(name)
+                self.names.setdefault(key, name)
+                wards.setdefault(key, set()).add(record['ward'])
+        self.wards = {key: tuple(sorted(ids)) for key, ids in wards.items()}
+        words: Dict[str, List[str]] = {}
+        for key in self.wards:
+            for word in set(key.split()):
+                words.setdefault(word, []).append(key)
+        self.by_word = {word: tuple(sorted(keys)) for word, keys in words.items()}
+        # Aliases of names missing from the data are dropped
+        self.aliases = {
+            normalize(alias): normalize(target)
+            for alias, target in (ALIASES if aliases is None else aliases).items()
+            if normalize(target) in self.wards
+        }
+
+    def __len__(self) -> int:
+        return len(self.wards)
+
+    def match(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Neighborhoods matching query as (normalized name, quality): the exact
+        name or alias at EXACT_MATCH, then other names containing every
+        query word at PARTIAL_MATCH.
+        """
+        key = normalize(query)
+        if key.startswith('the '):
+            key = key[4:]
+        if not key:
+            return []
+        key = self.aliases.get(key, key)
+        exact = [(key, EXACT_MATCH)] if key in self.wards else []
+        words = key.split()
+        keys = set(self.by_word.get(words[0], ()))
+        for word in words[1:]:
+            keys &= set(self.by_word.get(word, ()))
+        keys.discard(key)
+        return exact + [(k, PARTIAL_MATCH) for k in sorted(keys)]
+
+
+class ProximityIndex:
+    """Ward offices in a KD-tree plus the neighborhood index"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], aliases: Optional[Dict[str, str]] = None):
+        records = list(records)
+        # normalize() in sync_ward_data.py writes 0, 0 when a location is missing
+        # Ward order, so ties (offices sharing a building) rank by ward id
+        self.offices = [
+            Office(r['ward'], float(r['latitude']), float(r['longitude']),
+                   r.get('alderperson'), r.get('wardOfficeAddress'))
+            for r in sorted(records, key=lambda r: r['ward'])
+            if r.get('latitude') and r.get('longitude')
+        ]
+        self.by_ward = {office.ward_id: office for office in self.offices}
+        ref_lat = sum(o.lat for o in self.offices) / len(self.offices) if self.offices else 0.0
+        self.project = Projection(ref_lat)
+        self.tree = KDTree([self.project(o.lat, o.lng) for o in self.offices])
+        self.neighborhoods = NeighborhoodIndex(records, aliases)
+        self._arrays = None
+
+    def _candidate(self, office: Office, distance: float) -> Dict[str, Any]:
+        return dict(office.to_dict(), distance_km=round(distance, 3))
+
+    def nearest(self, lat: float, lng: float, k: int = DEFAULT_K,
+                radius_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Closest ward offices to a point, optionally only those within radius_km"""
+        x, y = self.project(lat, lng)
+        if radius_km is None:
+            hits = self.tree.nearest(x, y, k)
+        else:
+            hits = self.tree.within(x, y, radius_km)[:k]
+        return [self._candidate(self.offices[i], d) for d, i in hits]
+
+    def for_neighborhood(self, name: str, lat: Optional[float] = None, lng: Optional[float] = None,
+                         k: int = MAX_K) -> Dict[str, Any]:
+        """
+        Wards for a neighborhood name, ranked by match quality and, when a
+        point is given, by distance from it to each ward office.
+        """
+        matches = self.neighborhoods.match(name)
+        scores: Dict[int, float] = {}
+        matched: Dict[int, List[str]] = {}
+        for key, quality in matches:
+            for ward_id in self.neighborhoods.wards[key]:
+                scores[ward_id] = max(scores.get(ward_id, 0.0), quality)
+                matched.setdefault(ward_id, []).append(self.neighborhoods.names[key])
+        point = self.project(lat, lng) if lat is not None and lng is not None else None
+        candidates = []
+        for ward_id, score in scores.items():
+            office = self.by_ward.get(ward_id)
+            candidate = office.to_dict() if office else {'ward_id': ward_id}
+            candidate.update(score=score, matched=matched[ward_id])
+            if point is not None and office is not None:
+                ox, oy = self.project(office.lat, office.lng)
+                candidate['distance_km'] = round(math.hypot(ox - point[0], oy - point[1]), 3)
+            candidates.append(candidate)
+        candidates.sort(key=lambda c: (-c['score'], c.get('distance_km', math.inf), c['ward_id']))
+        return {
+            'query': name,
+            'neighborhoods': [self.neighborhoods.names[key] for key, _ in matches],
+            'candidates': candidates[:k],
+        }
+
+    def _office_arrays(self):
+        if self._arrays is None:
+            import numpy as np
+
+            points = np.array([self.project(o.lat, o.lng) for o in self.offices], dtype=np.float64).reshape(-1, 2)
+            ward_ids = np.array([o.ward_id for o in self.offices], dtype=np.int64)
+            self._arrays = (points, ward_ids)
+        return self._arrays
+
+    def nearest_batch(self, points: Sequence[Tuple[float, float]], k: int = DEFAULT_K,
+                      radius_km: Optional[float] = None):
+        """
+        Vectorized nearest for many (lat, lng) points. Returns (ward_ids,
+        distances_km), both (len(points), k) arrays, closest first; slots
+        beyond radius_km (or the number of offices) hold ward id 0 and inf.
+        """
+        import numpy as np
+
+        office_xy, office_ids = self._office_arrays()
+        query = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n, m = len(query), len(office_ids)
+        ward_ids = np.zeros((n, k), dtype=np.int64)
+        distances = np.full((n, k), np.inf)
+        take = min(k, m)
+        if not n or not take:
+            return ward_ids, distances
+        xs = query[:, 1] * self.project.kx
+        ys = query[:, 0] * self.project.ky
+        chunk = max(1, BATCH_CHUNK_CELLS // m)
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            d2 = (xs[start:stop, None] - office_xy[None, :, 0]) ** 2
+            d2 += (ys[start:stop, None] - office_xy[None, :, 1]) ** 2
+            # Stable, so ties rank by ward id like the tree
+            best = np.argsort(d2, axis=1, kind='stable')[:, :take]
+            ward_ids[start:stop, :take] = office_ids[best]
+            distances[start:stop, :take] = np.sqrt(np.take_along_axis(d2, best, axis=1))
+        if radius_km is not None:
+            outside = distances > radius_km
+            ward_ids[outside] = 0
+            distances[outside] = np.inf
+        return ward_ids, distances
+
+    def resolve_batch(self, points: Sequence[Tuple[float, float]], k: int = DEFAULT_K,
+                      radius_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """nearest_batch as JSON-ready results, one per point"""
+        ward_ids, distances = self.nearest_batch(points, k, radius_km)
+        results = []
+        for (lat, lng), ids, dists in zip(points, ward_ids.tolist(), distances.tolist()):
+            results.append({
+                'lat': lat,
+                'lng': lng,
+                'candidates': [
+                    {'ward_id': ward_id, 'distance_km': round(d, 3)}
+                    for ward_id, d in zip(ids, dists) if ward_id
+                ],
+            })
+        return results
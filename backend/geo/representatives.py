@@ -0,0 +1,236 @@
+"""
+"All my representatives" resolver.
+
+Maps a point or a ward to every official who represents it: alderperson,
+state representative and senator, county commissioner, U.S. representative,
+plus at-large officials (mayor, U.S. senators) who represent everyone in
+the jurisdiction. District lookups go through the precomputed OverlayIndex.
+
+Batch usage for bulk address files (CSV with latitude/longitude columns,
+geocoded upstream):
+    python -m geo.representatives addresses.csv representatives.csv
+"""
+
+import csv
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from geo.overlay import OverlayIndex, load_layers, normalize_district_id
+from models.official import (
+    Branch,
+    FederalLegislator,
+    GovernmentLevel,
+    Official,
+    StateLegislator,
+)
+
+# District layers, in the order officials are listed
+LAYERS = ('ward', 'state_house', 'state_senate', 'county_commission', 'congressional')
+
+DISTRICTS_DIR = os.environ.get(
+    "CIVICPIE_DISTRICTS_DIR",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'districts'),
+)
+OFFICIALS_FILE = os.environ.get(
+    "CIVICPIE_OFFICIALS_FILE",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'officials.json'),
+)
+
+# Maximum points per batch request
+MAX_BATCH_SIZE = 1000
+
+
+def official_district_key(official: Official) -> Optional[Tuple[str, str]]:
+    """The (layer, district id) an official represents, or None if at-large"""
+    if not official.district and getattr(official, 'district_number', None) is None:
+        return None
+    district_id = normalize_district_id(
+        official.district_number if getattr(official, 'district_number', None) is not None else official.district
+    )
+    if isinstance(official, FederalLegislator):
+        return ('congressional', district_id) if official.chamber == 'house' else None
+    if isinstance(official, StateLegislator):
+        return ('state_house' if official.chamber == 'lower' else 'state_senate', district_id)
+    if official.level == GovernmentLevel.COUNTY and official.branch == Branch.LEGISLATIVE:
+        return ('county_commission', district_id)
+    if official.level == GovernmentLevel.CITY and official.branch == Branch.LEGISLATIVE:
+        return ('ward', district_id)
+    return None
+
+
+def alderperson_official(record: Dict[str, Any], city: str = 'Chicago', district_label: str = 'Ward',
+                         title: str = 'Alderperson') -> Official:
+    """Build an Official for a ward snapshot record"""
+    ward = record['ward']
+    return Official(
+        id=f"alderman-{ward}",
+        name=record['alderperson'],
+        title=title,
+        level=GovernmentLevel.CITY,
+        branch=Branch.LEGISLATIVE,
+        jurisdiction=city,
+        district=f"{district_label} {ward}",
+        district_name=f"{district_label} {ward}",
+        contact_phone=record.get('wardPhone'),
+        contact_email=record.get('email'),
+        office_address=record.get('wardOfficeAddress'),
+        office_city=record.get('wardOfficeCity'),
+        office_state=record.get('wardOfficeState'),
+        office_zip=record.get('wardOfficeZip'),
+        official_website=record.get('website'),
+        photo_url=record.get('photoUrl'),
+    )
+
+
+def load_officials(path: str = OFFICIALS_FILE) -> List[Official]:
+    """Load officials from a JSON list, picking the model by chamber/level"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = json.load(f)
+    officials = []
+    for record in records:
+        if record.get('level') == GovernmentLevel.FEDERAL.value and record.get('chamber'):
+            officials.append(FederalLegislator(**record))
+        elif record.get('level') == GovernmentLevel.STATE.value and record.get('chamber'):
+            officials.append(StateLegislator(**record))
+        else:
+            officials.append(Official(**record))
+    return officials
+
+
+class RepresentativeResolver:
+    """Resolve points and wards to the officials who represent them"""
+
+    def __init__(self, index: Optional[OverlayIndex], officials: Iterable[Official]):
+        self.index = index
+        self._by_district: Dict[Tuple[str, str], List[Official]] = {}
+        self.at_large: List[Official] = []
+        for official in officials:
+            key = official_district_key(official)
+            if key is None:
+                self.at_large.append(official)
+            else:
+                self._by_district.setdefault(key, []).append(official)
+
+    def _officials_for(self, districts: Dict[str, Sequence[str]]) -> List[Official]:
+        found = []
+        for layer in LAYERS:
+            for district_id in districts.get(layer, ()):
+                found.extend(self._by_district.get((layer, district_id), ()))
+        return found + self.at_large
+
+    @staticmethod
+    def _serialize(officials: List[Official]) -> List[Dict[str, Any]]:
+        return [o.model_dump(mode='json', exclude_none=True) for o in officials]
+
+    def resolve_point(self, lat: float, lng: float) -> Dict[str, Any]:
+        """Every official for a point; districts maps layer -> district id"""
+        districts = self.index.lookup(lng, lat) if self.index is not None else {}
+        # At-large officials are returned even when the point is in no known district
+        officials = self._officials_for({layer: [d] for layer, d in districts.items()})
+        ward = districts.get('ward')
+        return {
+            'lat': lat,
+            'lng': lng,
+            'ward_id': int(ward) if ward and ward.isdigit() else None,
+            'districts': districts,
+            'officials': self._serialize(officials),
+        }
+
+    def resolve_ward(self, ward_id: int) -> Dict[str, Any]:
+        """
+        Every official for a ward. Other layers may split a ward, so each
+        layer lists all districts overlapping it.
+        """
+        ward = str(ward_id)
+        districts: Dict[str, List[str]] = {'ward': [ward]}
+        if self.index is not None and 'ward' in self.index.layer_names:
+            districts.update(self.index.overlapping('ward', ward))
+        return {
+            'ward_id': ward_id,
+            'districts': districts,
+            'officials': self._serialize(self._officials_for(districts)),
+        }
+
+    def resolve_batch(self, points: Iterable[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """Resolve many points, sharing official lists between identical district sets"""
+        cache: Dict[Tuple[Tuple[str, str], ...], List[Dict[str, Any]]] = {}
+        results = []
+        for lat, lng in points:
+            districts = self.index.lookup(lng, lat) if self.index is not None else {}
+            key = tuple(sorted(districts.items()))
+            officials = cache.get(key)
+            if officials is None:
+                officials = cache[key] = self._serialize(self._officials_for({l: [d] for l, d in districts.items()}))
+            ward = districts.get('ward')
+            results.append({
+                'lat': lat,
+                'lng': lng,
+                'ward_id': int(ward) if ward and ward.isdigit() else None,
+                'districts': districts,
+                'officials': officials,
+            })
+        return results
+
+
+def build_resolver(ward_records: Iterable[Dict[str, Any]], districts_dir: str = DISTRICTS_DIR,
+                   officials_file: str = OFFICIALS_FILE, **alderperson) -> RepresentativeResolver:
+    """
+    Resolver from district GeoJSON files, the ward snapshot and officials.json;
+    alderperson is passed to alderperson_official (city, district_label, title)
+    """
+    layers = load_layers(districts_dir, LAYERS)
+    index = OverlayIndex(layers) if layers else None
+    officials = [alderperson_official(record, **alderperson) for record in ward_records]
+    officials.extend(load_officials(officials_file))
+    return RepresentativeResolver(index, officials)
+
+
+def resolve_file(resolver: RepresentativeResolver, input_path: str, output_path: str) -> int:
+    """Resolve every row of a CSV with latitude/longitude columns; returns rows written"""
+    with open(input_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    points, valid = [], []
+    for row in rows:
+        try:
+            points.append((float(row['latitude']), float(row['longitude'])))
+            valid.append(True)
+        except (KeyError, TypeError, ValueError):
+            valid.append(False)
+    resolved = iter(resolver.resolve_batch(points))
+
+    input_fields = list(rows[0].keys()) if rows else ['latitude', 'longitude']
+    fieldnames = input_fields + list(LAYERS) + ['officials', 'error']
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row, ok in zip(rows, valid):
+            out = dict(row)
+            if not ok:
+                out['error'] = 'missing or invalid latitude/longitude'
+            else:
+                result = next(resolved)
+                out.update(result['districts'])
+                out['officials'] = '; '.join(f"{o['title']}: {o['name']}" for o in result['officials'])
+                if not result['districts']:
+                    out['error'] = 'outside known districts'
+            writer.writerow(out)
+    return len(rows)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    from data.wards import load_ward_records
+
+    resolver = build_resolver(load_ward_records())
+    count = resolve_file(resolver, sys.argv[1], sys.argv[2])
+    print(f"Resolved {count} rows -> {sys.argv[2]}")
+
+
+if __name__ == '__main__':
+    main()
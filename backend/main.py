@@ -1,27 +1,102 @@
 # FastAPI Backend for CivicPie
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import APIRouter, FastAPI, HTTPException, BackgroundTasks, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import asyncio
+import json
+import os
+import time
 from datetime import datetime
 
+from agents.civic_guide import CivicGuideAgent, ConversationContext
+from api.events import KIND_WARD, EventBus, diff_records, file_mtime, watch_files
+from api.admission import PRIORITY_CHEAP, PRIORITY_EXPENSIVE, AdmissionController, build_chat_admission
+from api.responses import FastJSONResponse, PreparedPayload, SUPPORTED_ENCODINGS, json_response
+from data.autocomplete import TOP_K, Autocomplete
+from data.history import HISTORY_PATH, HistoryStore, to_epoch, ward_entity
+from data.jurisdictions import (
+    DEFAULT_JURISDICTION, Jurisdiction, get_jurisdiction, load_registry, shared_snapshot_path,
+)
+from data.partitions import Partition, PartitionCache, SlotNotBuilt, built_only
+from data.search import build_search_index, search_wards
+from data.shared_snapshot import SharedSnapshot, open_snapshot, write_snapshot
+from data.wards import SNAPSHOT_PATH, read_ward_records, to_ward
+from geo.proximity import DEFAULT_K, MAX_K, MAX_RADIUS_KM, ProximityIndex
+from geo.proximity import MAX_BATCH_SIZE as MAX_NEARBY_BATCH_SIZE
+from monitoring.metrics import REGISTRY, CONTENT_TYPE_LATEST, MetricsMiddleware
+
+# Opt-in fast serialization: trusted data is encoded straight to bytes with
+# orjson (skipping response_model validation) and compressed per request.
+FAST_JSON = os.environ.get("CIVICPIE_FAST_JSON", "0") == "1"
+
+# Snapshot file shared by all workers (built by serve.py before they start,
+# or prebuilt at deploy time with `python serve.py --build-snapshot PATH`).
+# Other jurisdictions use sibling files (see shared_snapshot_path).
+SHARED_SNAPSHOT_PATH = os.environ.get("CIVICPIE_SHARED_SNAPSHOT")
+
+# Warm the default jurisdiction's caches at startup (other cities load on
+# first use). Serverless deploys set this to 0 so a cold start only pays for
+# what the first request actually touches.
+WARM_START = os.environ.get("CIVICPIE_WARM_START", "1") == "1"
+
+# Seconds between checks of the vote files for new roll calls
+VOTES_REFRESH_INTERVAL = float(os.environ.get("CIVICPIE_VOTES_REFRESH_S", "60"))
+
+# Seconds between checks of resident jurisdictions' ward data files for sync updates (0 = off)
+SNAPSHOT_WATCH_INTERVAL = float(os.environ.get("CIVICPIE_SNAPSHOT_WATCH_S", "5"))
+
+# Keepalive interval for idle WebSocket/SSE change subscriptions
+EVENTS_KEEPALIVE = 15.0
+
+# Platform frontends; each jurisdiction can add its own origins in the registry
+CORS_ORIGINS = ["http://localhost:3000", "https://civicpie.com"]
+
+# Serving loop, bound into each jurisdiction's event bus
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm caches before accepting traffic; /ready reflects the result"""
+    global _event_loop
+    app.state.ready = False
+    _event_loop = asyncio.get_running_loop()
+    watcher = None
+    if SNAPSHOT_WATCH_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_files(_watched_ward_data, reload_ward_data, SNAPSHOT_WATCH_INTERVAL))
+    if WARM_START:
+        await asyncio.to_thread(warm_caches)
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    if watcher is not None:
+        watcher.cancel()
+
 app = FastAPI(
     title="CivicPie API",
-    description="Backend API for Chicago civic engagement platform",
-    version="1.0.0"
+    description="Backend API for the CivicPie civic engagement platform",
+    version="1.0.0",
+    default_response_class=FastJSONResponse if FAST_JSON else JSONResponse,
+    lifespan=lifespan,
 )
+app.state.ready = False
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "https://civicpie.com"],
+    allow_origins=CORS_ORIGINS + [origin for j in load_registry().values() for origin in j.origins],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Request instrumentation (latency, in-flight, sizes, status counts)
+app.add_middleware(MetricsMiddleware)
+
 # Models
 class Alderman(BaseModel):
     id: str
@@ -70,54 +145,583 @@ class ChatRequest(BaseModel):
     ward_id: Optional[int]
     conversation_history: List[ChatMessage]
 
+class GeoPoint(BaseModel):
+    lat: float
+    lng: float
+
+class RepresentativesBatchRequest(BaseModel):
+    points: List[GeoPoint]
+
+class NearbyBatchRequest(BaseModel):
+    points: List[GeoPoint]
+    k: int = DEFAULT_K
+    radius_km: Optional[float] = None
+
 class ChatResponse(BaseModel):
     message: str
     sources: List[dict]
     suggested_followups: List[str]
 
+# Read-mostly state, partitioned by jurisdiction. Each city's structures are
+# built on first use in its partition (from its shared snapshot when one is
+# mapped, otherwise from its ward data file) and dropped with it when the
+# city is evicted for capacity or idleness (see data/partitions.py).
+@lru_cache(maxsize=1)
+def partitions() -> PartitionCache:
+    return PartitionCache(get_jurisdiction, pinned=(DEFAULT_JURISDICTION,))
+
+def partition(jurisdiction: str = DEFAULT_JURISDICTION) -> Partition:
+    """A jurisdiction's partition; 404 if it is not registered"""
+    part = partitions().get(jurisdiction)
+    if part is None:
+        raise HTTPException(status_code=404, detail="Jurisdiction not found")
+    return part
+
+T = TypeVar("T")
+
+async def _load(accessor: Callable[..., T], *args) -> T:
+    """
+    accessor(*args) from a request handler: inline when the partition state
+    it reads is built, otherwise in a worker thread, so a city's first
+    request never blocks the event loop while its structures are built
+    """
+    try:
+        with built_only():
+            return accessor(*args)
+    except SlotNotBuilt:
+        return await asyncio.to_thread(accessor, *args)
+
+def ward_data_path(jurisdiction: Jurisdiction) -> str:
+    return jurisdiction.snapshot_path or SNAPSHOT_PATH
+
+# Jurisdictions reloaded since their shared snapshot was built; served from files
+_stale_snapshots: Set[str] = set()
+
+def shared_snapshot(jurisdiction: str = DEFAULT_JURISDICTION) -> Optional[SharedSnapshot]:
+    if jurisdiction in _stale_snapshots:
+        return None
+    path = shared_snapshot_path(SHARED_SNAPSHOT_PATH, jurisdiction)
+    return partition(jurisdiction).get("shared_snapshot", lambda: open_snapshot(path))
+
+def ward_records(jurisdiction: str = DEFAULT_JURISDICTION) -> Dict[int, Dict[str, Any]]:
+    """Raw ward records keyed by ward number"""
+    part = partition(jurisdiction)
+    path = ward_data_path(part.jurisdiction)
+
+    def load():
+        shared = shared_snapshot(jurisdiction)
+        if shared is not None:
+            records = shared.json("records")
+        else:
+            try:
+                records = read_ward_records(path)
+            except OSError:
+                raise HTTPException(status_code=404, detail="No ward data for this jurisdiction")
+        return {record['ward']: record for record in records}
+
+    # Taken before reading, so a sync landing mid-load is still noticed
+    part.get("ward_data_mtime", lambda: file_mtime(path))
+    return part.get("records", load)
+
+def _ward_shape(jurisdiction: Jurisdiction, ward_count: int) -> Dict[str, Any]:
+    """to_ward() keyword arguments for a jurisdiction"""
+    shape = {"district_label": jurisdiction.district_label, "title": jurisdiction.representative_title}
+    if jurisdiction.population:
+        shape["population"] = jurisdiction.population // (jurisdiction.ward_count or ward_count or 1)
+    return shape
+
+def ward_snapshot(jurisdiction: str = DEFAULT_JURISDICTION) -> Dict[int, Ward]:
+    """All wards from the snapshot as validated models, keyed by ward number"""
+    part = partition(jurisdiction)
+
+    def build():
+        records = ward_records(jurisdiction)
+        shape = _ward_shape(part.jurisdiction, len(records))
+        return {ward_id: Ward(**to_ward(record, **shape)) for ward_id, record in records.items()}
+
+    return part.get("wards", build)
+
+def search_index(jurisdiction: str = DEFAULT_JURISDICTION) -> Dict[str, List[int]]:
+    def build():
+        shared = shared_snapshot(jurisdiction)
+        if shared is not None:
+            return shared.json("search_index")
+        return build_search_index(list(ward_records(jurisdiction).values()))
+
+    return partition(jurisdiction).get("search_index", build)
+
+def _prepared(jurisdiction: str, name: str, build: Callable[[], Any]) -> PreparedPayload:
+    """Prepared payload from the shared snapshot, or serialized locally; cached in the partition"""
+    def prepare():
+        shared = shared_snapshot(jurisdiction)
+        if shared is not None and name in shared:
+            variants = {enc: shared.blob(f"{name}.{enc}") for enc in SUPPORTED_ENCODINGS if f"{name}.{enc}" in shared}
+            return PreparedPayload(shared.blob(name), variants)
+        return PreparedPayload.from_content(build())
+
+    return partition(jurisdiction).get(f"payload:{name}", prepare)
+
+def _all_wards_payload(jurisdiction: str = DEFAULT_JURISDICTION) -> PreparedPayload:
+    return _prepared(jurisdiction, "wards", lambda: list(ward_snapshot(jurisdiction).values()))
+
+def _ward_payload(ward_id: int, jurisdiction: str = DEFAULT_JURISDICTION) -> PreparedPayload:
+    return _prepared(jurisdiction, f"ward/{ward_id}", lambda: ward_snapshot(jurisdiction)[ward_id])
+
+def representative_resolver(jurisdiction: str = DEFAULT_JURISDICTION):
+    """District overlay index plus every known official; the official models are imported on first use"""
+    part = partition(jurisdiction)
+    j = part.jurisdiction
+
+    def build():
+        from geo.representatives import DISTRICTS_DIR, OFFICIALS_FILE, build_resolver
+        return build_resolver(
+            ward_records(jurisdiction).values(),
+            j.districts_dir or DISTRICTS_DIR,
+            j.officials_file or OFFICIALS_FILE,
+            city=j.name, district_label=j.district_label, title=j.representative_title,
+        )
+
+    return part.get("representatives", build)
+
+def proximity_index(jurisdiction: str = DEFAULT_JURISDICTION) -> ProximityIndex:
+    """KD-tree over ward offices plus the neighborhood -> wards index"""
+    part = partition(jurisdiction)
+    return part.get("proximity", lambda: ProximityIndex(ward_records(jurisdiction).values(), part.jurisdiction.aliases))
+
+@lru_cache(maxsize=1)
+def chat_admission() -> AdmissionController:
+    """Rate limits and work queue in front of the chat agent (shared by all jurisdictions)"""
+    return build_chat_admission()
+
+def civic_agent(jurisdiction: str = DEFAULT_JURISDICTION) -> CivicGuideAgent:
+    """The CivicGuide agent for a jurisdiction"""
+    part = partition(jurisdiction)
+    return part.get("agent", lambda: CivicGuideAgent(part.jurisdiction, len(ward_records(jurisdiction))))
+
+def autocomplete(jurisdiction: str = DEFAULT_JURISDICTION) -> Autocomplete:
+    """Typeahead index over wards, aldermen, neighborhoods and office streets"""
+    return partition(jurisdiction).get("autocomplete", lambda: Autocomplete(ward_records(jurisdiction).values()))
+
+def ward_history(jurisdiction: str = DEFAULT_JURISDICTION) -> HistoryStore:
+    """Temporal history of ward seats, appended by each sync"""
+    part = partition(jurisdiction)
+    return part.get("history", lambda: HistoryStore(part.jurisdiction.history_path or HISTORY_PATH))
+
+def vote_store(jurisdiction: str = DEFAULT_JURISDICTION):
+    """Roll-call vote matrices; NumPy is only imported once votes are requested"""
+    part = partition(jurisdiction)
+
+    def build():
+        from data.votes import VOTES_DIR, VoteStore
+        store = VoteStore(part.jurisdiction.votes_dir or VOTES_DIR)
+        store.refresh()
+        return store
+
+    return part.get("votes", build)
+
+async def fresh_vote_store(jurisdiction: str = DEFAULT_JURISDICTION):
+    """Vote store with newly appended roll calls ingested (incrementally)"""
+    store = await asyncio.to_thread(vote_store, jurisdiction)
+    if time.monotonic() - store.refreshed_at > VOTES_REFRESH_INTERVAL:
+        await asyncio.to_thread(store.refresh)
+    return store
+
+def event_bus(jurisdiction: str = DEFAULT_JURISDICTION) -> EventBus:
+    """
+    Change notifications for a jurisdiction's WebSocket/SSE subscribers. Kept
+    outside the partitions so open subscriptions survive an eviction.
+    """
+    # Cached by the id alone, so event_bus() and event_bus("chicago") are one bus
+    return _event_bus(jurisdiction)
+
+@lru_cache(maxsize=None)
+def _event_bus(jurisdiction: str) -> EventBus:
+    bus = EventBus()
+    if _event_loop is not None:
+        bus.bind(_event_loop)
+    return bus
+
+def reload_ward_data(jurisdiction: str = DEFAULT_JURISDICTION) -> None:
+    """
+    Reload a jurisdiction's ward data file after a sync and notify
+    subscribers of the wards and fields that changed.
+    """
+    if jurisdiction not in partitions():
+        return  # Not loaded; its next request reads the new file
+    part = partition(jurisdiction)
+    path = ward_data_path(part.jurisdiction)
+    part.set("ward_data_mtime", file_mtime(path))
+    new = {record['ward']: record for record in read_ward_records(path)}
+    changes = diff_records(part.peek("records") or {}, new)
+    if not changes:
+        return
+    # The shared snapshot was built from the old data; serve from the file now
+    _stale_snapshots.add(jurisdiction)
+    # Everything derived from the records is rebuilt on next use; the typeahead
+    # (popularity counts), agent and vote store carry over
+    part.clear(keep=("ward_data_mtime", "autocomplete", "agent", "votes"))
+    part.set("records", new)
+    # Swap in a rebuilt typeahead index
+    autocomplete(jurisdiction).rebuild(new.values())
+    for ward_id, fields in changes:
+        event_bus(jurisdiction).publish(ward_id, KIND_WARD, fields)
+
+def _watched_ward_data() -> Dict[str, Tuple[str, Optional[int]]]:
+    """Ward data file and the mtime it was loaded at, per resident jurisdiction"""
+    return {
+        part.jurisdiction.id: (ward_data_path(part.jurisdiction), part.peek("ward_data_mtime"))
+        for part in partitions().resident()
+        if "ward_data_mtime" in part
+    }
+
+def _mapped_wards(jurisdiction: str) -> bool:
+    """
+    Whether ward responses are served from the shared snapshot's bodies (built
+    from validated Ward models), so this worker never builds its own models
+    """
+    return shared_snapshot(jurisdiction) is not None
+
+def warm_caches(jurisdiction: str = DEFAULT_JURISDICTION) -> None:
+    """Load every read-mostly structure of a jurisdiction so its first request pays nothing"""
+    if not _mapped_wards(jurisdiction):
+        ward_snapshot(jurisdiction)
+    search_index(jurisdiction)
+    autocomplete(jurisdiction)
+    _all_wards_payload(jurisdiction).precompress()
+    for ward_id in ward_records(jurisdiction):
+        _ward_payload(ward_id, jurisdiction).precompress()
+    representative_resolver(jurisdiction)
+    proximity_index(jurisdiction)
+    civic_agent(jurisdiction)
+
+def build_shared_snapshot(path: str, jurisdiction: str = DEFAULT_JURISDICTION) -> str:
+    """
+    Write a jurisdiction's records, search index and precompressed ward
+    payloads to its snapshot file next to path; returns the file written
+    """
+    j = get_jurisdiction(jurisdiction)
+    if j is None:
+        raise ValueError(f"Unknown jurisdiction {jurisdiction!r}")
+    records = read_ward_records(ward_data_path(j))
+    shape = _ward_shape(j, len(records))
+    wards = {record['ward']: Ward(**to_ward(record, **shape)) for record in records}
+    blobs = {
+        "records": json.dumps(records).encode(),
+        "search_index": json.dumps(build_search_index(records)).encode(),
+    }
+    payloads = {"wards": PreparedPayload.from_content(list(wards.values()))}
+    payloads.update({f"ward/{ward_id}": PreparedPayload.from_content(ward) for ward_id, ward in wards.items()})
+    for name, payload in payloads.items():
+        blobs[name] = payload.body
+        for encoding, variant in payload.precompress().items():
+            blobs[f"{name}.{encoding}"] = variant
+    target = shared_snapshot_path(path, jurisdiction)
+    write_snapshot(target, blobs)
+    return target
+
 # Health check
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
+# Readiness check (503 until caches are warm)
+@app.get("/ready")
+async def readiness_check():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming"})
+    return {
+        "status": "ready",
+        "shared_snapshot": shared_snapshot() is not None,
+        "jurisdictions_resident": len(partitions()),
+    }
+
+# Prometheus metrics
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose request and stage metrics in Prometheus text format"""
+    # As a header, since Starlette would append a second charset to media_type
+    return Response(content=REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+# Jurisdictions
+@app.get("/api/jurisdictions")
+async def list_jurisdictions():
+    """Registered jurisdictions; each is served under /api/jurisdictions/{id}/"""
+    resident = {part.jurisdiction.id for part in partitions().resident()}
+    return {
+        "default": DEFAULT_JURISDICTION,
+        "jurisdictions": [
+            dict(j.summary(), resident=j.id in resident) for j in load_registry().values()
+        ],
+    }
+
+# Jurisdiction-scoped routes: mounted at /api for the default jurisdiction
+# (which also accepts ?jurisdiction=) and at /api/jurisdictions/{jurisdiction}
+router = APIRouter()
+
 # Ward endpoints
-@app.get("/api/wards", response_model=List[Ward])
-async def get_all_wards():
-    """Get all 50 Chicago wards"""
-    # This would query the database
-    # For now, return placeholder
-    return []
+@router.get("/wards", response_model=List[Ward])
+async def get_all_wards(request: Request, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Get every ward of a jurisdiction"""
+    if FAST_JSON or await _load(_mapped_wards, jurisdiction):
+        return (await _load(_all_wards_payload, jurisdiction)).response(request, compressed=FAST_JSON)
+    return list((await _load(ward_snapshot, jurisdiction)).values())
 
-@app.get("/api/wards/{ward_id}", response_model=Ward)
-async def get_ward(ward_id: int):
-    """Get specific ward details"""
-    if ward_id < 1 or ward_id > 50:
+def _check_radius(radius_km: Optional[float]) -> None:
+    """400 unless radius_km is absent or in (0, MAX_RADIUS_KM]"""
+    if radius_km is not None and not 0 < radius_km <= MAX_RADIUS_KM:
+        raise HTTPException(status_code=400, detail=f"radius_km must be positive and at most {MAX_RADIUS_KM:g}")
+
+# Registered before /wards/{ward_id} so "nearby" is not parsed as an id
+@router.get("/wards/nearby")
+async def get_nearby_wards(
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    neighborhood: Optional[str] = None,
+    k: int = DEFAULT_K,
+    radius_km: Optional[float] = None,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+):
+    """
+    Ranked candidate wards for a neighborhood name (ties broken by distance
+    when lat/lng are also given) or for a point (nearest ward offices,
+    optionally within radius_km)
+    """
+    if k < 1 or k > MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_K}")
+    _check_radius(radius_km)
+    index = await _load(proximity_index, jurisdiction)
+    if neighborhood:
+        return index.for_neighborhood(neighborhood, lat, lng, k)
+    if lat is not None and lng is not None:
+        return {"lat": lat, "lng": lng, "candidates": index.nearest(lat, lng, k, radius_km)}
+    raise HTTPException(status_code=400, detail="Provide neighborhood, or lat and lng")
+
+@router.post("/wards/nearby/batch")
+async def get_nearby_wards_batch(request: NearbyBatchRequest, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Nearest ward offices for many points, computed as one vectorized batch"""
+    if len(request.points) > MAX_NEARBY_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_NEARBY_BATCH_SIZE} points per request")
+    if request.k < 1 or request.k > MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_K}")
+    _check_radius(request.radius_km)
+    index = await _load(proximity_index, jurisdiction)
+    results = await asyncio.to_thread(
+        index.resolve_batch, [(p.lat, p.lng) for p in request.points], request.k, request.radius_km
+    )
+    return {"results": results}
+
+def _check_ward(ward_id: int, jurisdiction: str) -> None:
+    """404 unless the jurisdiction has this ward"""
+    if ward_id not in ward_records(jurisdiction):
         raise HTTPException(status_code=404, detail="Ward not found")
-    # Query database for ward
-    return {}
 
-@app.get("/api/wards/{ward_id}/meetings", response_model=List[Meeting])
-async def get_ward_meetings(ward_id: int):
+@router.get("/wards/{ward_id}", response_model=Ward)
+async def get_ward(ward_id: int, request: Request, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Get specific ward details"""
+    await _load(_check_ward, ward_id, jurisdiction)
+    if FAST_JSON or await _load(_mapped_wards, jurisdiction):
+        return (await _load(_ward_payload, ward_id, jurisdiction)).response(request, compressed=FAST_JSON)
+    return (await _load(ward_snapshot, jurisdiction))[ward_id]
+
+@router.get("/wards/{ward_id}/meetings", response_model=List[Meeting])
+async def get_ward_meetings(ward_id: int, jurisdiction: str = DEFAULT_JURISDICTION):
     """Get meetings for a specific ward"""
+    await _load(_check_ward, ward_id, jurisdiction)
     return []
 
+# Representatives endpoints
+@router.get("/representatives")
+async def get_representatives(lat: Optional[float] = None, lng: Optional[float] = None, ward_id: Optional[int] = None,
+                              jurisdiction: str = DEFAULT_JURISDICTION):
+    """Every official representing a point (lat/lng) or a ward"""
+    resolver = await _load(representative_resolver, jurisdiction)
+    if lat is not None and lng is not None:
+        return resolver.resolve_point(lat, lng)
+    if ward_id is not None:
+        await _load(_check_ward, ward_id, jurisdiction)
+        return resolver.resolve_ward(ward_id)
+    raise HTTPException(status_code=400, detail="Provide lat and lng, or ward_id")
+
+@router.post("/representatives/batch")
+async def get_representatives_batch(request: RepresentativesBatchRequest, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Resolve many points at once (bulk address files)"""
+    from geo.representatives import MAX_BATCH_SIZE
+    if len(request.points) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} points per request")
+    resolver = await _load(representative_resolver, jurisdiction)
+    results = await asyncio.to_thread(resolver.resolve_batch, [(p.lat, p.lng) for p in request.points])
+    return {"results": results}
+
 # AI Chat endpoint
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat_with_civic_guide(request: ChatRequest):
+@router.post("/chat", response_model=ChatResponse)
+async def chat_with_civic_guide(request: ChatRequest, http_request: Request, jurisdiction: str = DEFAULT_JURISDICTION):
     """Chat with the CivicGuide AI assistant"""
-    # This would integrate with OpenAI/Claude
-    # For now, return placeholder response
+    agent = await _load(civic_agent, jurisdiction)
+    # The agent returns template responses until OpenAI/Claude is wired in
+    context = ConversationContext(
+        ward_id=request.ward_id,
+        user_location=None,
+        conversation_history=[m.model_dump() for m in request.conversation_history],
+        user_preferences={},
+    )
+    # Questions answerable from cached ward data jump the queue and are shed last
+    priority = PRIORITY_CHEAP if agent.answerable_from_cache(request.message) else PRIORITY_EXPENSIVE
+    async with chat_admission().admit(http_request, priority):
+        result = await agent.answer_question(request.message, context)
+    if FAST_JSON:
+        return json_response(http_request, {
+            'message': result['answer'],
+            'sources': result['sources'],
+            'suggested_followups': result['suggested_followups'],
+        })
     return ChatResponse(
-        message="I'm CivicGuide, your AI assistant for Chicago civic engagement. I'm here to help you understand your local government.",
-        sources=[],
-        suggested_followups=[
-            "When is my next ward meeting?",
-            "Who is my alderman?",
-            "What issues are being voted on?"
-        ]
+        message=result['answer'],
+        sources=result['sources'],
+        suggested_followups=result['suggested_followups'],
     )
 
-# Scraping endpoints
+# Typeahead
+@router.get("/autocomplete")
+async def autocomplete_suggestions(q: str, limit: int = Query(TOP_K, ge=1, le=TOP_K),
+                                   jurisdiction: str = DEFAULT_JURISDICTION):
+    """Suggestions for a partially typed ward number, alderman, neighborhood or street"""
+    completer = await _load(autocomplete, jurisdiction)
+    if completer.stale:
+        # Fold new popularity counts in without blocking this request
+        asyncio.get_running_loop().run_in_executor(None, completer.rebuild_if_stale)
+    return {"query": q, "suggestions": [entry.to_dict() for entry in completer.suggest(q, limit)]}
+
+# Voting records
+@router.get("/votes/officials/{legislator_id}")
+async def get_official_votes(legislator_id: str, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Attendance, party alignment, closest colleagues and recent votes"""
+    record = (await fresh_vote_store(jurisdiction)).official(legislator_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="No voting record for this official")
+    return record
+
+@router.get("/wards/{ward_id}/votes")
+async def get_ward_votes(ward_id: int, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Voting record of a ward's alderperson"""
+    await _load(_check_ward, ward_id, jurisdiction)
+    return await get_official_votes(f"alderman-{ward_id}", jurisdiction)
+
+@router.get("/votes/agreement")
+async def get_vote_agreement(body: str, a: str, b: str, jurisdiction: str = DEFAULT_JURISDICTION):
+    """How often two legislators of the same body cast the same yea/nay vote"""
+    result = (await fresh_vote_store(jurisdiction)).agreement(body, a, b)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Legislators not found in this body")
+    return result
+
+# Ward history
+def _parse_as_of(as_of: str) -> int:
+    try:
+        return to_epoch(as_of)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="as_of must be a date (YYYY-MM-DD) or ISO datetime")
+
+@router.get("/history/wards")
+async def get_wards_history(as_of: str, jurisdiction: str = DEFAULT_JURISDICTION):
+    """State of every ward as of a date"""
+    as_of_epoch = _parse_as_of(as_of)
+    return {"as_of": as_of, "wards": (await _load(ward_history, jurisdiction)).wards_at(as_of_epoch)}
+
+@router.get("/history/wards/{ward_id}")
+async def get_ward_history(ward_id: int, as_of: Optional[str] = None, jurisdiction: str = DEFAULT_JURISDICTION):
+    """A ward's state (and alderperson) as of a date, or its full change log"""
+    await _load(_check_ward, ward_id, jurisdiction)
+    history = await _load(ward_history, jurisdiction)
+    if as_of is None:
+        return {"ward_id": ward_id, "changes": history.changes(ward_entity(ward_id))}
+    state = history.state_at(ward_entity(ward_id), _parse_as_of(as_of))
+    return {
+        "ward_id": ward_id,
+        "as_of": as_of,
+        "alderperson": state.get("alderperson") if state else None,
+        "state": state,
+    }
+
+# Change notifications (instead of polling /api/wards)
+def _parse_wards(wards: Optional[str], jurisdiction: str) -> Optional[List[int]]:
+    """'1,2,35' -> [1, 2, 35]; None or '' subscribes to every ward"""
+    partition(jurisdiction)
+    if not wards:
+        return None
+    try:
+        parsed = [int(w) for w in wards.split(",") if w.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="wards must be comma-separated ward numbers")
+    known = ward_records(jurisdiction)
+    if any(w not in known for w in parsed):
+        raise HTTPException(status_code=400, detail="Unknown ward numbers for this jurisdiction")
+    return parsed
+
+@router.get("/events")
+async def stream_events(wards: Optional[str] = None, jurisdiction: str = DEFAULT_JURISDICTION):
+    """Server-sent events for ward changes, optionally filtered by ward"""
+    ward_filter = await _load(_parse_wards, wards, jurisdiction)
+    bus = event_bus(jurisdiction)
+    subscription = bus.subscribe(ward_filter)
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while True:
+                events = await subscription.next(EVENTS_KEEPALIVE)
+                if not events:
+                    yield ": keepalive\n\n"
+                for event in events:
+                    yield f"event: change\ndata: {json.dumps(event)}\n\n"
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.websocket("/events/ws")
+async def websocket_events(websocket: WebSocket, wards: Optional[str] = None, jurisdiction: str = DEFAULT_JURISDICTION):
+    """
+    WebSocket change notifications. Send {"wards": [1, 2]} to change the
+    filter ([] or null for every ward).
+    """
+    try:
+        ward_filter = await _load(_parse_wards, wards, jurisdiction)
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=exc.detail)
+        return
+    await websocket.accept()
+    bus = event_bus(jurisdiction)
+    subscription = bus.subscribe(ward_filter)
+
+    async def receive_filters():
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and "wards" in message:
+                    bus.update(subscription, [int(w) for w in message["wards"] or []])
+        except (WebSocketDisconnect, ValueError, TypeError):
+            pass
+        finally:
+            # Wake the sender so a closed connection is released immediately
+            subscription.wake()
+
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        while True:
+            events = await subscription.next(EVENTS_KEEPALIVE)
+            if receiver.done():
+                break
+            if not events:
+                await websocket.send_json({"type": "keepalive"})
+            for event in events:
+                await websocket.send_json({"type": "change", **event})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        bus.unsubscribe(subscription)
+
+# Scraping endpoints (the spiders only cover Chicago)
 @app.post("/api/scrape/ward/{ward_id}")
 async def scrape_ward_data(ward_id: int, background_tasks: BackgroundTasks):
     """Trigger scraping for a specific ward"""
@@ -131,14 +735,19 @@ async def scrape_all_wards(background_tasks: BackgroundTasks):
     return {"message": "Scraping started for all wards"}
 
 # Search endpoint
-@app.get("/api/search")
-async def search(query: str, ward_id: Optional[int] = None):
+@router.get("/search")
+async def search(query: str, ward_id: Optional[int] = None, jurisdiction: str = DEFAULT_JURISDICTION):
     """Search across all civic data"""
+    (await _load(autocomplete, jurisdiction)).record_query(query)
+    index, records = await _load(search_index, jurisdiction), await _load(ward_records, jurisdiction)
     return {
         "query": query,
-        "results": []
+        "results": search_wards(index, records, query, ward_id)
     }
 
+app.include_router(router, prefix="/api")
+app.include_router(router, prefix="/api/jurisdictions/{jurisdiction}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
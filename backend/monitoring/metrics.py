@@ -0,0 +1,330 @@
+"""
+Lightweight request instrumentation and Prometheus exposition for the CivicPie API.
+
+Metrics are kept in-process with plain dicts and rendered in the Prometheus
+text format (version 0.0.4) on demand, so recording a sample costs a
+perf_counter call and a couple of dict updates.
+"""
+
+import bisect
+import threading
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Default latency buckets in seconds (tuned for API requests and model calls)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets in bytes
+SIZE_BUCKETS = (100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple[str, ...]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return labels
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. in-flight requests)"""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; buckets are stored non-cumulatively and summed on render"""
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default registry and the metrics the API records
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "civicpie_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "civicpie_http_requests_in_flight",
+    "HTTP requests currently being served",
+    ("method", "route"),
+)
+REQUESTS_TOTAL = REGISTRY.counter(
+    "civicpie_http_requests_total",
+    "HTTP requests by route and status code",
+    ("method", "route", "status"),
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "civicpie_http_response_size_bytes",
+    "HTTP response body size by route",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "civicpie_stage_duration_seconds",
+    "Duration of internal processing stages (retrieval, classification, llm, serialization)",
+    ("stage",),
+)
+
+
+class span:
+    """
+    Time an internal stage and record it in the stage histogram.
+
+    Implemented as a plain class rather than a generator-based context
+    manager to keep per-span overhead to two perf_counter calls.
+
+    Usage:
+        with span("retrieval"):
+            sources = agent.get_relevant_sources(query)
+    """
+    __slots__ = ("stage", "histogram", "start", "elapsed")
+
+    def __init__(self, stage: str, histogram: Histogram = STAGE_LATENCY):
+        self.stage = stage
+        self.histogram = histogram
+        self.start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "span":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.elapsed = perf_counter() - self.start
+        self.histogram.observe(self.elapsed, self.stage)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, in-flight requests,
+    response sizes and status counts.
+
+    Routes are labelled by their path template (e.g. /api/wards/{ward_id})
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    # Bound on cached (method, path) -> route template entries
+    ROUTE_CACHE_SIZE = 4096
+
+    def __init__(self, app, routes=None, exclude_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self._routes = routes
+        self.exclude_paths = frozenset(exclude_paths)
+        self._route_cache: Dict[Tuple[str, str], str] = {}
+
+    def _route_template(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        route = self._route_cache.get(key)
+        if route is None:
+            route = self._match_route(scope)
+            if len(self._route_cache) >= self.ROUTE_CACHE_SIZE:
+                self._route_cache.clear()
+            self._route_cache[key] = route
+        return route
+
+    def _match_route(self, scope) -> str:
+        from starlette.routing import Match
+
+        routes = self._routes
+        if routes is None:
+            routes = getattr(getattr(scope.get("app"), "router", None), "routes", ())
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = "500"
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method, route)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.observe(perf_counter() - start, method, route)
+            REQUESTS_IN_FLIGHT.dec(method, route)
+            REQUESTS_TOTAL.inc(method, route, status)
+            RESPONSE_SIZE.observe(size, method, route)
@@ -3,9 +3,17 @@ Scrapy spiders for collecting Chicago civic data from public sources.
 """
 
 import scrapy
+from scrapy import signals
 from scrapy.crawler import CrawlerProcess
+from scrapy.exceptions import DontCloseSpider
 from datetime import datetime
+import argparse
 import json
+import os
+
+from scrapers.dedup import NearDuplicatePipeline
+from scrapers.extract import ContentExtractor
+from scrapers.frontier import FRONTIER_DIR
 
 class ChicagoCityCouncilSpider(scrapy.Spider):
     """Spider to scrape Chicago City Council website for alderman information"""
@@ -56,20 +64,54 @@ class AldermanWebsiteSpider(scrapy.Spider):
         'USER_AGENT': 'CivicPie Bot (civic engagement platform)',
         'ROBOTSTXT_OBEY': True,
         'DOWNLOAD_DELAY': 2,  # Be respectful to individual sites
+        # Sites republish the same newsletter on several pages; drop the copies
+        'ITEM_PIPELINES': {NearDuplicatePipeline: 300},
+        'DEDUP_INDEX_PATH': os.environ.get('CIVICPIE_DEDUP_INDEX', '/data/dedup_index.json'),
     }
     
-    def __init__(self, ward_data=None):
-        super().__init__()
+    def __init__(self, ward_data=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.ward_data = ward_data or []
+        self.extractor = ContentExtractor(
+            templates_path=os.environ.get('CIVICPIE_EXTRACT_TEMPLATES', '/data/extract_templates.json')
+        )
+        # True while an upstream spider can still feed wards (see chain_spiders)
+        self.awaiting_upstream = False
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        return spider
+
+    def spider_idle(self):
+        if self.awaiting_upstream:
+            raise DontCloseSpider
+
+    def closed(self, reason):
+        self.extractor.save()
     
     def start_requests(self):
         for ward in self.ward_data:
-            if ward.get('website'):
-                yield scrapy.Request(
-                    url=ward['website'],
-                    callback=self.parse_alderman_site,
-                    meta={'ward_number': ward['ward_number']}
-                )
+            request = self.ward_request(ward)
+            if request is not None:
+                yield request
+
+    def ward_request(self, ward):
+        """Request for a ward's website, or None when the ward has none"""
+        if not ward.get('website'):
+            return None
+        return scrapy.Request(
+            url=ward['website'],
+            callback=self.parse_alderman_site,
+            meta={'ward_number': ward['ward_number']}
+        )
+
+    def add_ward(self, ward):
+        """Schedule a ward's website while the crawl is running"""
+        request = self.ward_request(ward)
+        if request is not None:
+            self.crawler.engine.crawl(request)
     
     def parse_alderman_site(self, response):
         """Extract content from alderman website"""
@@ -105,15 +147,16 @@ class AldermanWebsiteSpider(scrapy.Spider):
         ward_number = response.meta['ward_number']
         page_type = response.meta['page_type']
         
-        # Extract main content
-        content = ' '.join(response.css('main, .content, article, .entry-content p::text').getall())
+        # Extract main content (boilerplate removed, truncated on paragraph boundaries)
+        extracted = self.extractor.extract(response.body, response.url, encoding=response.encoding)
         
         yield {
             'ward_number': ward_number,
             'page_type': page_type,
             'url': response.url,
-            'title': response.css('h1, .page-title::text').get(),
-            'content': content[:5000],  # Limit content length
+            'title': extracted['title'],
+            'content': extracted['content'],
+            'paragraphs': extracted['paragraphs'],
             'scraped_at': datetime.now().isoformat(),
         }
     
@@ -178,19 +221,101 @@ class ChicagoDataPortalSpider(scrapy.Spider):
             'note': 'Would integrate with Socrata API for ward statistics',
         }
 
-def run_spiders():
-    """Run all spiders"""
-    process = CrawlerProcess(settings={
-        'FEED_FORMAT': 'json',
-        'FEED_URI': 'file:///data/scraped_data.json',
+def known_ward_sites():
+    """Ward websites from the ward snapshot, to seed the alderman crawl"""
+    from data.wards import load_ward_records
+
+    try:
+        records = load_ward_records()
+    except OSError:
+        return []
+    return [{'ward_number': r['ward'], 'website': r['website']} for r in records if r.get('website')]
+
+def chain_spiders(upstream, downstream):
+    """
+    Feed each item the upstream crawler scrapes to the downstream spider's
+    `add_ward` as it is scraped. The downstream spider stays open while the
+    upstream one runs. Call after both crawlers have been started.
+
+    The downstream frontier is committed (`checkpoint()`) after each
+    `add_ward`, so the requests queued from an upstream item survive a
+    crash; otherwise the upstream page could be checkpointed as done
+    without them and those wards would never be crawled on resume.
+    """
+    downstream.spider.awaiting_upstream = True
+
+    def item_scraped(item, response, spider):
+        downstream.spider.add_ward(item)
+        scheduler = downstream.engine.slot.scheduler
+        if hasattr(scheduler, 'checkpoint'):
+            scheduler.checkpoint()
+
+    def spider_closed(spider, reason):
+        downstream.spider.awaiting_upstream = False
+
+    upstream.signals.connect(item_scraped, signal=signals.item_scraped, weak=False)
+    upstream.signals.connect(spider_closed, signal=signals.spider_closed, weak=False)
+
+def crawl_settings(resume=False, distributed=False, worker_id=None):
+    """
+    Process settings for a local crawl on the persistent frontier, or for one
+    worker of a distributed crawl sharing its frontier through Redis.
+    """
+    settings = {
         'LOG_LEVEL': 'INFO',
-    })
+        'SCHEDULER': 'scrapers.frontier.FrontierScheduler',
+        'SPIDER_MIDDLEWARES': {'scrapers.frontier.FrontierMiddleware': 0},
+        'DOWNLOADER_MIDDLEWARES': {'scrapers.frontier.FrontierDownloaderMiddleware': 0},
+        'FRONTIER_DIR': FRONTIER_DIR,
+        'FRONTIER_RESUME': resume,
+        'FEEDS': {
+            'file:///data/scraped_data.jsonl': {'format': 'jsonlines', 'overwrite': not resume},
+        },
+        # Only drop content emitted by earlier runs when their output is kept
+        'DEDUP_ACROSS_RUNS': resume,
+    }
+    if distributed:
+        from scrapers.distributed import CRAWL_ID, REDIS_URL, default_worker_id
+
+        worker_id = worker_id or default_worker_id()
+        settings.update({
+            'SCHEDULER': 'scrapers.distributed.DistributedScheduler',
+            'REDIS_URL': REDIS_URL,
+            'CRAWL_ID': CRAWL_ID,
+            'CRAWL_WORKER_ID': worker_id,
+            # The crawl outlives any one worker, so each appends to its own file
+            'FEEDS': {
+                f'file:///data/scraped_data-{worker_id}.jsonl': {'format': 'jsonlines', 'overwrite': False},
+            },
+            'DEDUP_ACROSS_RUNS': True,
+        })
+    return settings
+
+def run_spiders(resume=False, distributed=False, worker_id=None):
+    """
+    Run all spiders on the persistent frontier. With resume, continue the
+    queue and seen-set of an interrupted run and append to its output. With
+    distributed, run as one worker of a crawl shared through Redis (state
+    there always carries over; see scrapers/distributed.py).
+    """
+    process = CrawlerProcess(settings=crawl_settings(resume, distributed, worker_id))
     
-    process.crawl(ChicagoCityCouncilSpider)
-    process.crawl(AldermanWebsiteSpider)
+    council = process.create_crawler(ChicagoCityCouncilSpider)
+    aldermen = process.create_crawler(AldermanWebsiteSpider)
+    process.crawl(council)
+    # Known sites start right away; sites found by the council spider follow
+    # as its items stream in (the frontier drops repeats)
+    process.crawl(aldermen, ward_data=known_ward_sites())
+    chain_spiders(council, aldermen)
     process.crawl(ChicagoDataPortalSpider)
     
     process.start()
 
 if __name__ == '__main__':
-    run_spiders()
+    # Run from backend/: python -m scrapers.chicago_spiders [--resume | --distributed]
+    parser = argparse.ArgumentParser(description='Run the CivicPie spiders')
+    parser.add_argument('--resume', action='store_true', help='continue an interrupted crawl')
+    parser.add_argument('--distributed', action='store_true', help='run as a worker of a crawl shared through REDIS_URL')
+    parser.add_argument('--worker-id', help='distributed worker id (default: host-pid)')
+    args = parser.parse_args()
+    run_spiders(resume=args.resume, distributed=args.distributed, worker_id=args.worker_id)
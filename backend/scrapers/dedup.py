@@ -0,0 +1,245 @@
+"""
+Near-duplicate detection for scraped alderman content.
+
+Alderman sites often republish the same newsletter on several pages (home,
+news, about). Each subpage item and each news item is fingerprinted with a
+64-bit SimHash over word shingles; two texts whose fingerprints differ in at
+most MAX_DISTANCE bits are treated as the same content.
+
+Candidates are found with an LSH index that splits every fingerprint into
+MAX_DISTANCE + 1 bands: by pigeonhole, any two fingerprints within the
+distance threshold agree exactly on at least one band, so only fingerprints
+sharing a band bucket are compared.
+
+The index is persisted between runs (DEDUP_INDEX_PATH). When the output
+accumulates across runs (DEDUP_ACROSS_RUNS, set for resumed and distributed
+crawls), content that an earlier run already emitted is dropped too; a fresh
+crawl that overwrites its output starts from an empty index so its output is
+complete. A page re-crawled under the same URL never counts as a duplicate of
+itself; its fingerprint is updated instead. Savings are reported in the crawl
+stats under `dedup/*` and logged when the spider closes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scrapy.exceptions import DropItem
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+MAX_DISTANCE = 3
+SHINGLE_SIZE = 3
+
+# Rough chars-per-token ratio used to estimate embedding tokens saved
+CHARS_PER_TOKEN = 4
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Overlapping word n-grams of normalized text"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+# Spreads each bit of a 64-bit hash into its own 32-bit lane of a big int, so
+# summing spread hashes counts set bits per position in one big-int addition
+_SPREAD = str.maketrans({'0': '00000000', '1': '00000001'})
+_LANE_MASK = (1 << 32) - 1
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of text, or None if it has no words"""
+    features: Dict[str, int] = {}
+    for shingle in shingles(text):
+        features[shingle] = features.get(shingle, 0) + 1
+    if not features:
+        return None
+    lanes = 0
+    for shingle, count in features.items():
+        lanes += int(format(_hash64(shingle), '064b').translate(_SPREAD), 16) * count
+    total = sum(features.values())
+    fingerprint = 0
+    # Lane k (counting from the least significant end) holds bit k
+    for bit in range(FINGERPRINT_BITS):
+        if 2 * (lanes >> (32 * bit) & _LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """LSH index over SimHash fingerprints, keyed by the URL they came from"""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self._band_bits = -(-FINGERPRINT_BITS // self.bands)
+        self._buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self._owners: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def _band_keys(self, fingerprint: int) -> Iterable[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        for band in range(self.bands):
+            yield band, fingerprint >> (band * self._band_bits) & mask
+
+    def find(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[str]:
+        """Owner (other than exclude) of an indexed fingerprint within max_distance, if any"""
+        seen = set()
+        for key in self._band_keys(fingerprint):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if hamming(candidate, fingerprint) <= self.max_distance and self._owners[candidate] != exclude:
+                    return self._owners[candidate]
+        return None
+
+    def add(self, fingerprint: int, owner: str) -> None:
+        self._owners[fingerprint] = owner
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, set()).add(fingerprint)
+
+    def remove(self, fingerprint: int) -> None:
+        if self._owners.pop(fingerprint, None) is None:
+            return
+        for key in self._band_keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self._buckets[key]
+
+    def items(self) -> Iterable[Tuple[int, str]]:
+        return self._owners.items()
+
+
+class NearDuplicatePipeline:
+    """
+    Item pipeline that drops near-duplicate subpages and merges repeated
+    news items before they reach storage, search and embeddings.
+
+    Settings:
+        DEDUP_INDEX_PATH    - fingerprint index kept across runs ('' = in-memory only)
+        DEDUP_ACROSS_RUNS   - also drop content emitted by earlier runs (only
+                              when their output is kept, e.g. appended to)
+        DEDUP_MAX_DISTANCE  - Hamming distance still counted as a duplicate
+    """
+
+    def __init__(self, index_path: Optional[str] = None, max_distance: int = MAX_DISTANCE, stats=None,
+                 across_runs: bool = False):
+        self.index_path = index_path
+        self.across_runs = across_runs
+        self.index = SimHashIndex(max_distance)
+        self.stats = stats
+        # Latest fingerprint per content key (url or url#news-title), so a
+        # page whose content changed replaces its old fingerprint
+        self._by_key: Dict[str, int] = {}
+        self.saved = {'items': 0, 'news_items': 0, 'chars': 0}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            index_path=crawler.settings.get('DEDUP_INDEX_PATH') or None,
+            max_distance=crawler.settings.getint('DEDUP_MAX_DISTANCE', MAX_DISTANCE),
+            stats=crawler.stats,
+            across_runs=crawler.settings.getbool('DEDUP_ACROSS_RUNS', False),
+        )
+
+    def open_spider(self, spider):
+        if not self.across_runs or not self.index_path or not os.path.exists(self.index_path):
+            return
+        with open(self.index_path) as f:
+            stored = json.load(f)
+        for key, fingerprint in stored.get('fingerprints', {}).items():
+            fingerprint = int(fingerprint, 16)
+            self._by_key[key] = fingerprint
+            self.index.add(fingerprint, key)
+        logger.info("Loaded %d content fingerprints from %s", len(self.index), self.index_path)
+
+    def close_spider(self, spider):
+        tokens = self.saved['chars'] // CHARS_PER_TOKEN
+        logger.info(
+            "Near-duplicate filter dropped %d pages and %d news items (%d chars, ~%d embedding tokens)",
+            self.saved['items'], self.saved['news_items'], self.saved['chars'], tokens,
+        )
+        if self.stats is not None:
+            self.stats.set_value('dedup/tokens_saved_estimate', tokens)
+        if not self.index_path:
+            return
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprints': {key: format(fp, '016x') for key, fp in self._by_key.items()}}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _inc(self, key: str, count: int = 1) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f'dedup/{key}', count)
+
+    def check(self, key: str, text: str) -> Optional[str]:
+        """
+        Record text under key; returns the key of earlier near-identical
+        content under another key, or None if the text is new. Re-crawling
+        the same key only updates its fingerprint.
+        """
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None
+        original = self.index.find(fingerprint, exclude=key)
+        if original is not None:
+            return original
+        previous = self._by_key.get(key)
+        if previous is not None:
+            self.index.remove(previous)
+        self._by_key[key] = fingerprint
+        self.index.add(fingerprint, key)
+        return None
+
+    def process_item(self, item, spider):
+        self._inc('items_seen')
+        if item.get('news_items'):
+            item['news_items'] = self._merge_news(item)
+        if item.get('content'):
+            original = self.check(item['url'], item['content'])
+            if original is not None:
+                self.saved['items'] += 1
+                self.saved['chars'] += len(item['content'])
+                self._inc('items_dropped')
+                self._inc('chars_saved', len(item['content']))
+                raise DropItem(f"Near-duplicate of {original}: {item['url']}")
+        return item
+
+    def _merge_news(self, item) -> List[dict]:
+        """Keep the first copy of each news item; later copies are dropped"""
+        kept = []
+        for news in item['news_items']:
+            text = ' '.join(filter(None, (news.get('title'), news.get('summary'))))
+            key = f"{item['url']}#{news.get('link') or news.get('title') or ''}"
+            if text and self.check(key, text) is not None:
+                self.saved['news_items'] += 1
+                self.saved['chars'] += len(text)
+                self._inc('news_items_dropped')
+                self._inc('chars_saved', len(text))
+                continue
+            kept.append(news)
+        return kept
@@ -0,0 +1,597 @@
+"""
+Distributed crawling: a crawl frontier shared by several worker processes
+through Redis.
+
+Every worker runs the same spiders with `DistributedScheduler`. Per spider,
+Redis holds the seen-set (request fingerprints), one priority queue per
+domain and the serialized requests, so any worker can schedule a request and
+each URL is crawled once across the fleet.
+
+Domain affinity: a domain's queue is leased to one worker at a time and only
+that worker pops it, so Scrapy's per-domain DOWNLOAD_DELAY and concurrency
+limits hold globally. Every CLAIM_BACKOFF_S a worker moves towards a fair
+share of the domains with work (domains / live workers): it gives back idle
+domains above its share and leases free ones, a few at a time, below it. So
+added workers pick up load and throughput grows with the worker count as
+long as there are more domains than workers. A released domain cannot be
+claimed again for DOWNLOAD_DELAY seconds.
+
+Workers heartbeat every DISTRIBUTED_HEARTBEAT seconds, publishing their crawl
+stats. A worker silent for DISTRIBUTED_WORKER_TIMEOUT seconds is reaped by
+the others: its in-flight requests go back to their queues and its domains
+are released. `python -m scrapers.distributed stats` sums the stats of all
+workers.
+
+All multi-key updates are Lua scripts, so they are atomic. Scripts get every
+key they touch through KEYS, and a spider's keys share the `{spider}` hash
+tag, so they also run on Redis Cluster. Requests are stored as JSON, never
+pickled: whoever can write to the Redis must not be able to run code on the
+workers. `client` is any redis-py compatible client, e.g.
+`fakeredis.FakeRedis()` in tests.
+
+Settings (chicago_spiders --distributed sets these):
+    SCHEDULER = 'scrapers.distributed.DistributedScheduler'
+    REDIS_URL, CRAWL_ID, CRAWL_WORKER_ID
+    DISTRIBUTED_HEARTBEAT, DISTRIBUTED_WORKER_TIMEOUT
+"""
+
+import argparse
+import base64
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from scrapers.frontier import FrontierScheduler
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+# Namespace of a crawl; start a clean crawl with a new id or `reset`
+CRAWL_ID = os.environ.get('CIVICPIE_CRAWL_ID', 'default')
+HEARTBEAT_INTERVAL = float(os.environ.get('CIVICPIE_CRAWL_HEARTBEAT_S', '5'))
+WORKER_TIMEOUT = float(os.environ.get('CIVICPIE_CRAWL_WORKER_TIMEOUT_S', '30'))
+
+# Seconds a zero-pending read is trusted; positive reads are cached briefly
+PENDING_CACHE_S = 0.25
+# Seconds between balancing rounds (giving back or leasing domains)
+CLAIM_BACKOFF_S = 0.2
+# Domains leased per round, so the first worker up does not take the whole
+# crawl before the others register
+CLAIM_BATCH = 4
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def crawl_prefix(crawl_id: str = CRAWL_ID) -> str:
+    return f'civicpie:crawl:{crawl_id}:'
+
+
+def spider_prefix(spider: str, crawl_id: str = CRAWL_ID) -> str:
+    """Key prefix of one spider; the {spider} hash tag keeps its keys in one cluster slot"""
+    return f'{crawl_prefix(crawl_id)}{{{spider}}}:'
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _to_json(value):
+    if isinstance(value, bytes):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, dict):
+        if any(not isinstance(k, (str, bytes, int, float, bool)) and k is not None for k in value):
+            raise TypeError('Unsupported dict key')
+        if all(isinstance(k, str) for k in value) and not {'$bytes', '$items'} & value.keys():
+            return {k: _to_json(v) for k, v in value.items()}
+        return {'$items': [[_to_json(k), _to_json(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _from_json(value):
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if isinstance(value, dict):
+        if value.keys() == {'$bytes'}:
+            return base64.b64decode(value['$bytes'])
+        if value.keys() == {'$items'}:
+            return {_from_json(k): _from_json(v) for k, v in value['$items']}
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+def encode_request(d: Dict[str, Any]) -> bytes:
+    """
+    JSON form of Request.to_dict() for the shared queue (bytes and non-str
+    keys are tagged). Raises TypeError for values JSON cannot hold.
+    """
+    return json.dumps(_to_json(d), separators=(',', ':')).encode()
+
+
+def decode_request(data: bytes, spider=None):
+    """
+    Request from encode_request output. A `_class` must name an already
+    imported Request subclass, so queue contents cannot load code.
+    """
+    from scrapy import Request
+    from scrapy.utils.request import request_from_dict
+
+    d = _from_json(json.loads(data))
+    if not isinstance(d, dict):
+        raise ValueError('Request data is not an object')
+    if '_class' in d:
+        module, _, name = str(d['_class']).rpartition('.')
+        cls = getattr(sys.modules.get(module), name, None)
+        if not (isinstance(cls, type) and issubclass(cls, Request)):
+            raise ValueError(f"Not a request class: {d['_class']}")
+    return request_from_dict(d, spider=spider)
+
+
+# Give a domain back. Nobody may claim it before available_at (now + the
+# handoff delay), whether it still has work or gets new work later.
+_RELEASE = """
+local function release(lease, free, busy, owned, released, domain, available_at, queue)
+  redis.call('HDEL', lease, domain)
+  redis.call('HDEL', busy, domain)
+  redis.call('SREM', owned, domain)
+  redis.call('HSET', released, domain, available_at)
+  if redis.call('ZCARD', queue) > 0 then
+    redis.call('ZADD', free, available_at, domain)
+  end
+end
+"""
+
+# KEYS seen, requests, free, lease, released, active, seq, queue
+# ARGV fingerprint, domain, priority, data, force
+_ADD = """
+local fp, domain = ARGV[1], ARGV[2]
+local is_new = redis.call('SADD', KEYS[1], fp) == 1
+local force = ARGV[5] == '1'
+if not is_new and not force then
+  return 0
+end
+local score = -tonumber(ARGV[3]) * 1e9 + redis.call('INCR', KEYS[7])
+redis.call('HSET', KEYS[2], fp, ARGV[4])
+if redis.call('ZADD', KEYS[8], score, fp) == 1 then
+  redis.call('INCR', KEYS[6])
+end
+if redis.call('HEXISTS', KEYS[4], domain) == 0 then
+  redis.call('ZADD', KEYS[3], 'NX', redis.call('HGET', KEYS[5], domain) or 0, domain)
+end
+return 1
+"""
+
+# KEYS requests, inflight, busy, lease, free, owned, active, released, queue of each domain
+# ARGV worker, available_at, domains in round-robin order
+# Pops the first domain with work. Returns {fingerprint, data, index, lost...}
+# (fingerprint '' when none had work); lost are domains whose lease is gone
+# or that were released because they ran out of work.
+_POP = _RELEASE + """
+local lost = {}
+local function result(fp, data, index)
+  local reply = {fp, data, index}
+  for _, domain in ipairs(lost) do
+    reply[#reply + 1] = domain
+  end
+  return reply
+end
+for i = 3, #ARGV do
+  local domain, queue = ARGV[i], KEYS[i + 6]
+  if redis.call('HGET', KEYS[4], domain) ~= ARGV[1] then
+    redis.call('SREM', KEYS[6], domain)
+    lost[#lost + 1] = domain
+  else
+    local popped = redis.call('ZPOPMIN', queue)
+    if #popped == 0 then
+      if tonumber(redis.call('HGET', KEYS[3], domain) or '0') <= 0 then
+        release(KEYS[4], KEYS[5], KEYS[3], KEYS[6], KEYS[8], domain, ARGV[2], queue)
+        lost[#lost + 1] = domain
+      end
+    else
+      local fp = popped[1]
+      local data = redis.call('HGET', KEYS[1], fp)
+      if data then
+        redis.call('HSET', KEYS[2], fp, domain .. '|' .. popped[2])
+        redis.call('HINCRBY', KEYS[3], domain, 1)
+        return result(fp, data, i - 2)
+      end
+      redis.call('DECR', KEYS[7])
+    end
+  end
+end
+return result('', '', 0)
+"""
+
+# KEYS inflight, busy, active, requests, queue; ARGV fingerprint, domain
+_DONE = """
+local entry = redis.call('HGET', KEYS[1], ARGV[1])
+if not entry or string.match(entry, '^(.*)|') ~= ARGV[2] then
+  return 0
+end
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('HINCRBY', KEYS[2], ARGV[2], -1)
+redis.call('DECR', KEYS[3])
+if not redis.call('ZSCORE', KEYS[5], ARGV[1]) then
+  redis.call('HDEL', KEYS[4], ARGV[1])
+end
+return 1
+"""
+
+# KEYS workers, lease, free, busy, owned, released, queue of each domain
+# ARGV worker, now, timeout, available_at, batch, domains the worker holds
+# Moves the worker to its fair share of the domains with work (domains /
+# live workers): gives back idle domains above it or leases up to batch free
+# ones towards it. Returns {released count, released..., claimed...}
+_BALANCE = _RELEASE + """
+local now = tonumber(ARGV[2])
+local live = math.max(1, redis.call('ZCOUNT', KEYS[1], now - tonumber(ARGV[3]), '+inf'))
+local share = math.ceil((redis.call('HLEN', KEYS[2]) + redis.call('ZCARD', KEYS[3])) / live)
+local excess = redis.call('SCARD', KEYS[5]) - share
+local reply = {0}
+if excess > 0 then
+  for i = 6, #ARGV do
+    local domain = ARGV[i]
+    if redis.call('SISMEMBER', KEYS[5], domain) == 1
+        and tonumber(redis.call('HGET', KEYS[4], domain) or '0') <= 0 then
+      release(KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6], domain, ARGV[4], KEYS[i + 1])
+      reply[#reply + 1] = domain
+      if #reply > excess then
+        break
+      end
+    end
+  end
+  reply[1] = #reply - 1
+elseif excess < 0 then
+  local wanted = math.min(-excess, tonumber(ARGV[5]))
+  for _, domain in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now, 'LIMIT', 0, wanted)) do
+    redis.call('ZREM', KEYS[3], domain)
+    redis.call('HSET', KEYS[2], domain, ARGV[1])
+    redis.call('SADD', KEYS[5], domain)
+    reply[#reply + 1] = domain
+  end
+end
+return reply
+"""
+
+# KEYS workers, lease, free, busy, inflight, owned, released, queue of each domain
+# ARGV worker, available_at, domains of the worker's in-flight requests and leases
+# Requeue a worker's in-flight requests and release its domains. Anything
+# on a domain that was not passed in is left for the next reap. Returns
+# {requeued, left}
+_REAP = _RELEASE + """
+local queues = {}
+for i = 3, #ARGV do
+  queues[ARGV[i]] = KEYS[i + 5]
+end
+local requeued, left = 0, 0
+local entries = redis.call('HGETALL', KEYS[5])
+for i = 1, #entries, 2 do
+  local domain, score = string.match(entries[i + 1], '^(.*)|(.*)$')
+  if queues[domain] then
+    redis.call('ZADD', queues[domain], tonumber(score), entries[i])
+    redis.call('HDEL', KEYS[5], entries[i])
+    requeued = requeued + 1
+  else
+    left = left + 1
+  end
+end
+for _, domain in ipairs(redis.call('SMEMBERS', KEYS[6])) do
+  if queues[domain] then
+    release(KEYS[2], KEYS[3], KEYS[4], KEYS[6], KEYS[7], domain, ARGV[2], queues[domain])
+  else
+    left = left + 1
+  end
+end
+if left == 0 then
+  redis.call('ZREM', KEYS[1], ARGV[1])
+end
+return {requeued, left}
+"""
+
+
+class RedisFrontier:
+    """
+    Queue and seen-set of one spider shared by all workers; same interface
+    as SQLiteFrontier plus leases, heartbeats and reaping.
+    """
+
+    def __init__(self, client, spider: str, worker_id: Optional[str] = None, crawl_id: str = CRAWL_ID,
+                 handoff_delay: float = 0.0, worker_timeout: float = WORKER_TIMEOUT):
+        self.client = client
+        self.spider = spider
+        self.worker_id = worker_id or default_worker_id()
+        self.handoff_delay = handoff_delay
+        self.worker_timeout = worker_timeout
+        self.prefix = spider_prefix(spider, crawl_id)
+        self.queue_prefix = self.prefix + 'q:'
+        self.keys = {
+            name: self.prefix + name
+            for name in ('seen', 'requests', 'free', 'lease', 'released', 'active', 'seq', 'busy', 'workers',
+                         'stats_workers')
+        }
+        self.keys['inflight'] = self._worker_key('inflight', self.worker_id)
+        self.keys['owned'] = self._worker_key('owned', self.worker_id)
+        self._scripts = {
+            name: client.register_script(source)
+            for name, source in (('add', _ADD), ('pop', _POP), ('done', _DONE), ('balance', _BALANCE),
+                                 ('reap', _REAP))
+        }
+        # Leased domains in round-robin order, and the domain of each request in flight here
+        self._owned: List[str] = []
+        self._inflight: Dict[str, str] = {}
+        self._next_claim = 0.0
+        self._pending: Tuple[int, float] = (0, 0.0)
+        client.sadd(crawl_prefix(crawl_id) + 'spiders', spider)
+
+    def _worker_key(self, kind: str, worker_id: str) -> str:
+        return f'{self.prefix}{kind}:{worker_id}'
+
+    def _k(self, *names: str) -> List[str]:
+        return [self.keys[name] for name in names]
+
+    def _queues(self, domains: List[str]) -> List[str]:
+        return [self.queue_prefix + domain for domain in domains]
+
+    @property
+    def pending(self) -> int:
+        """Requests queued or in flight on any worker"""
+        count, read_at = self._pending
+        now = time.monotonic()
+        if count <= 0 or now - read_at > PENDING_CACHE_S:
+            count = int(self.client.get(self.keys['active']) or 0)
+            self._pending = (count, now)
+        return count
+
+    def seen(self) -> int:
+        return self.client.scard(self.keys['seen'])
+
+    def add(self, fingerprint: str, priority: int, data: Optional[bytes], force: bool = False,
+            domain: Optional[str] = None) -> bool:
+        if data is None:
+            # Not shareable; record it as seen so no worker repeats it
+            return self.client.sadd(self.keys['seen'], fingerprint) == 1 or force
+        domain = domain or ''
+        added = self._scripts['add'](
+            keys=self._k('seen', 'requests', 'free', 'lease', 'released', 'active', 'seq') + self._queues([domain]),
+            args=[fingerprint, domain, priority, data, int(force)],
+        )
+        if added:
+            self._pending = (max(self._pending[0], 1), time.monotonic())
+        return bool(added)
+
+    def balance(self, now: Optional[float] = None) -> List[str]:
+        """
+        Give back idle domains above this worker's fair share, or lease free
+        ones up to it. Returns the domains leased.
+        """
+        now = time.time() if now is None else now
+        self._next_claim = time.monotonic() + CLAIM_BACKOFF_S
+        owned = list(self._owned)
+        reply = [_decode(d) for d in self._scripts['balance'](
+            keys=self._k('workers', 'lease', 'free', 'busy', 'owned', 'released') + self._queues(owned),
+            args=[self.worker_id, now, self.worker_timeout, now + self.handoff_delay, CLAIM_BATCH, *owned],
+        )]
+        released = set(reply[1:1 + int(reply[0])])
+        claimed = reply[1 + int(reply[0]):]
+        self._owned = [d for d in self._owned if d not in released] + claimed
+        return claimed
+
+    def pop(self) -> Optional[Tuple[str, bytes]]:
+        """Next request from this worker's domains, round-robin across them"""
+        if time.monotonic() >= self._next_claim:
+            self.balance()
+        if not self._owned:
+            return None
+        owned = self._owned
+        reply = self._scripts['pop'](
+            keys=self._k('requests', 'inflight', 'busy', 'lease', 'free', 'owned', 'active', 'released')
+            + self._queues(owned),
+            args=[self.worker_id, time.time() + self.handoff_delay, *owned],
+        )
+        fingerprint, data, index = _decode(reply[0]), reply[1], int(reply[2])
+        lost = {_decode(d) for d in reply[3:]}
+        # Start after the popped domain next time
+        self._owned = [d for d in owned[index:] + owned[:index] if d not in lost]
+        if not fingerprint:
+            return None
+        self._inflight[fingerprint] = owned[index - 1]
+        return fingerprint, data
+
+    def done(self, fingerprint: str) -> None:
+        domain = self._inflight.pop(fingerprint, None)
+        if domain is None:
+            entry = self.client.hget(self.keys['inflight'], fingerprint)
+            if entry is None:
+                return
+            domain = _decode(entry).rsplit('|', 1)[0]
+        if self._scripts['done'](
+            keys=self._k('inflight', 'busy', 'active', 'requests') + self._queues([domain]),
+            args=[fingerprint, domain],
+        ):
+            self._pending = (0, 0.0)
+
+    def heartbeat(self, stats: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Mark this worker alive, publish its stats, reap dead workers and move
+        to the fair share of domains. Returns the requests recovered.
+        """
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.zadd(self.keys['workers'], {self.worker_id: now})
+        if stats:
+            pipe.hset(self._worker_key('stats', self.worker_id), mapping=stats)
+            pipe.sadd(self.keys['stats_workers'], self.worker_id)
+        pipe.execute()
+        recovered = self.reap(now - self.worker_timeout)
+        self.balance(now)
+        return recovered
+
+    def reap(self, cutoff: float) -> int:
+        """Recover the work of workers whose last heartbeat is before cutoff"""
+        recovered = 0
+        for worker in self.client.zrangebyscore(self.keys['workers'], '-inf', cutoff):
+            worker = _decode(worker)
+            if worker != self.worker_id:
+                recovered += self._reap(worker)
+        return recovered
+
+    def _reap(self, worker: str) -> int:
+        inflight, owned = self._worker_key('inflight', worker), self._worker_key('owned', worker)
+        domains = sorted({_decode(entry).rsplit('|', 1)[0] for entry in self.client.hvals(inflight)}
+                         | {_decode(domain) for domain in self.client.smembers(owned)})
+        recovered, left = (int(n) for n in self._scripts['reap'](
+            keys=[self.keys['workers'], self.keys['lease'], self.keys['free'], self.keys['busy'],
+                  inflight, owned, self.keys['released']] + self._queues(domains),
+            args=[worker, time.time() + self.handoff_delay, *domains],
+        ))
+        if recovered:
+            logger.warning("Requeued %d in-flight requests of dead worker %s (%s)", recovered, worker, self.spider)
+        if left:
+            logger.info("%d entries of worker %s changed while reaping; retrying on the next heartbeat", left, worker)
+        return recovered
+
+    def checkpoint(self) -> None:
+        """Redis writes are immediate; nothing to commit"""
+
+    def close(self) -> None:
+        """Leave the crawl: requeue anything still in flight and release domains"""
+        self._reap(self.worker_id)
+        self._owned = []
+        self._inflight.clear()
+
+
+class DistributedScheduler(FrontierScheduler):
+    """FrontierScheduler on a RedisFrontier, with a heartbeat loop"""
+
+    def __init__(self, crawler, client=None, crawl_id: str = CRAWL_ID, worker_id: Optional[str] = None,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL, worker_timeout: float = WORKER_TIMEOUT):
+        super().__init__(crawler)
+        self.client = client
+        self.crawl_id = crawl_id
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_timeout = worker_timeout
+        self._heartbeat = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        import redis
+
+        settings = crawler.settings
+        return cls(
+            crawler,
+            client=redis.from_url(settings.get('REDIS_URL', REDIS_URL)),
+            crawl_id=settings.get('CRAWL_ID', CRAWL_ID),
+            worker_id=settings.get('CRAWL_WORKER_ID'),
+            heartbeat_interval=settings.getfloat('DISTRIBUTED_HEARTBEAT', HEARTBEAT_INTERVAL),
+            worker_timeout=settings.getfloat('DISTRIBUTED_WORKER_TIMEOUT', WORKER_TIMEOUT),
+        )
+
+    def open(self, spider):
+        from twisted.internet import task
+
+        self.spider = spider
+        self.frontier = RedisFrontier(
+            self.client, spider.name, self.worker_id, self.crawl_id,
+            handoff_delay=self.crawler.settings.getfloat('DOWNLOAD_DELAY'),
+            worker_timeout=self.worker_timeout,
+        )
+        self._heartbeat = task.LoopingCall(self.heartbeat)
+        self._heartbeat.start(self.heartbeat_interval, now=True)
+        logger.info("Worker %s joined crawl %s for %s: %d pending, %d seen",
+                    self.worker_id, self.crawl_id, spider.name, self.frontier.pending, self.frontier.seen())
+
+    def heartbeat(self) -> None:
+        stats = {k: v for k, v in self.stats.get_stats(self.spider).items() if isinstance(v, (int, float))}
+        try:
+            recovered = self.frontier.heartbeat(stats)
+        except Exception:
+            logger.exception("Crawl heartbeat failed")
+            return
+        if recovered:
+            self.stats.inc_value('frontier/recovered', recovered, spider=self.spider)
+
+    def close(self, reason):
+        if self._heartbeat is not None and self._heartbeat.running:
+            self._heartbeat.stop()
+        self.heartbeat()
+        super().close(reason)
+
+    def checkpoint(self) -> None:
+        """Shared state is written through; chained spiders need no explicit commit"""
+
+    def _serialize(self, request):
+        try:
+            return encode_request(request.to_dict(spider=self.spider))
+        except (ValueError, TypeError):
+            return None  # Callback is not a spider method, or meta JSON cannot hold
+
+    def _deserialize(self, data: bytes):
+        return decode_request(data, spider=self.spider)
+
+
+def crawl_stats(client, crawl_id: str = CRAWL_ID, worker_timeout: float = WORKER_TIMEOUT) -> Dict[str, Any]:
+    """Stats of every worker summed per spider, plus frontier sizes"""
+    prefix = crawl_prefix(crawl_id)
+    now = time.time()
+    result: Dict[str, Any] = {'crawl_id': crawl_id, 'spiders': {}}
+    for spider in sorted(_decode(s) for s in client.smembers(prefix + 'spiders')):
+        base = spider_prefix(spider, crawl_id)
+        totals: Dict[str, float] = {}
+        workers = sorted(_decode(w) for w in client.smembers(base + 'stats_workers'))
+        for worker in workers:
+            for key, value in client.hgetall(f'{base}stats:{worker}').items():
+                try:
+                    number = float(value)
+                except ValueError:
+                    continue
+                key = _decode(key)
+                totals[key] = totals.get(key, 0) + number
+        result['spiders'][spider] = {
+            'workers': len(workers),
+            'live_workers': client.zcount(base + 'workers', now - worker_timeout, '+inf'),
+            'pending': int(client.get(base + 'active') or 0),
+            'seen': client.scard(base + 'seen'),
+            'leased_domains': client.hlen(base + 'lease'),
+            'free_domains': client.zcard(base + 'free'),
+            'stats': {k: int(v) if float(v).is_integer() else v for k, v in sorted(totals.items())},
+        }
+    return result
+
+
+def reset_crawl(client, crawl_id: str = CRAWL_ID) -> int:
+    """Delete all shared state of a crawl"""
+    keys = list(client.scan_iter(match=crawl_prefix(crawl_id) + '*'))
+    if keys:
+        client.delete(*keys)
+    return len(keys)
+
+
+def main(argv=None):
+    import redis
+
+    parser = argparse.ArgumentParser(description='Inspect or reset a distributed crawl')
+    parser.add_argument('command', choices=('stats', 'reset'))
+    parser.add_argument('--redis-url', default=REDIS_URL)
+    parser.add_argument('--crawl-id', default=CRAWL_ID)
+    args = parser.parse_args(argv)
+
+    client = redis.from_url(args.redis_url)
+    if args.command == 'stats':
+        print(json.dumps(crawl_stats(client, args.crawl_id), indent=2))
+    else:
+        print(f"Deleted {reset_crawl(client, args.crawl_id)} keys of crawl {args.crawl_id}")
+
+
+if __name__ == '__main__':
+    # From backend/: python -m scrapers.distributed stats
+    main()
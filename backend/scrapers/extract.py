@@ -0,0 +1,267 @@
+"""
+Main-content extraction for alderman web pages.
+
+Pages are parsed once with lxml. Boilerplate (scripts, navigation, headers,
+footers, sidebars) is removed: boilerplate tags always, and elements whose
+class/id/role tokens name boilerplate ("sidebar", "share") only when they
+hold little text of their own besides links, so layout wrappers such as
+`has-sidebar` around the article survive. Then the main content container is chosen by
+text density: every paragraph-like block scores its parent and grandparent
+by its text length, discounted by how much of that text is link text. The
+winning container's blocks are emitted as clean, structured paragraphs.
+
+Once the same container wins on TEMPLATE_CONFIRMATIONS pages of a domain, its
+path is stored as that domain's template; later pages from the domain go
+straight to it and skip the scoring pass. Templates persist between crawls
+(CIVICPIE_EXTRACT_TEMPLATES).
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import lxml.html
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Replaces the old blind content[:5000]; truncation now happens on block boundaries
+MAX_CONTENT_CHARS = 5000
+
+# Blocks shorter than this (and not headings) are treated as noise
+MIN_BLOCK_CHARS = 25
+# Blocks whose text is mostly links are navigation, not content
+MAX_LINK_DENSITY = 0.5
+# Elements marked as boilerplate are kept if they hold more non-link text than this
+MAX_BOILERPLATE_TEXT_CHARS = 200
+
+# Pages of a domain that must agree before a template is trusted
+TEMPLATE_CONFIRMATIONS = 2
+# A template match yielding less text than this falls back to the heuristics
+MIN_TEMPLATE_CHARS = 200
+
+BOILERPLATE_TAGS = (
+    'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'form',
+    'nav', 'header', 'footer', 'aside', 'button', 'select',
+)
+# Whole class/id/role tokens (split on whitespace, '-' and '_') marking boilerplate
+BOILERPLATE_TOKENS = frozenset((
+    'nav', 'navbar', 'navigation', 'menu', 'footer', 'header', 'sidebar', 'widget',
+    'breadcrumb', 'breadcrumbs', 'cookie', 'cookies', 'banner', 'share', 'sharing',
+    'social', 'subscribe', 'signup', 'comment', 'comments', 'related', 'skip',
+    'search', 'modal', 'popup', 'advert', 'advertisement',
+))
+_MARKER_SPLIT = re.compile(r'[\s_-]+')
+BLOCK_TAGS = frozenset(('p', 'li', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'td', 'dd'))
+HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+# lxml refuses str input that declares an encoding
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def _empty() -> Dict:
+    return {'title': None, 'paragraphs': [], 'content': ''}
+
+
+def _text(element) -> str:
+    """Text content with whitespace collapsed"""
+    return ' '.join(element.text_content().split())
+
+
+def _link_chars(element) -> int:
+    return sum(len(_text(a)) for a in element.iter('a'))
+
+
+def _drop(element) -> None:
+    parent = element.getparent()
+    if parent is None:
+        return
+    # Keep the tail text, which belongs to the parent
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
+
+def _marked_boilerplate(element) -> bool:
+    marker = f"{element.get('class', '')} {element.get('id', '')} {element.get('role', '')}".lower()
+    return any(token in BOILERPLATE_TOKENS for token in _MARKER_SPLIT.split(marker))
+
+
+def strip_boilerplate(root) -> None:
+    """Remove non-content elements in place"""
+    for element in list(root.iter(etree.Comment, etree.ProcessingInstruction)):
+        _drop(element)
+    for element in list(root.iter(*BOILERPLATE_TAGS)):
+        _drop(element)
+    for element in list(root.iter()):
+        if element.tag in ('html', 'body', 'main', 'article') or not isinstance(element.tag, str):
+            continue
+        if _marked_boilerplate(element):
+            # Link-dense or short: menus, share bars, banners. A marked
+            # element with real text of its own is a layout wrapper.
+            if len(_text(element)) - _link_chars(element) <= MAX_BOILERPLATE_TEXT_CHARS:
+                _drop(element)
+
+
+def _blocks(container) -> List[Dict[str, str]]:
+    """Clean paragraphs under container, in document order"""
+    blocks = []
+    for element in container.iter(*BLOCK_TAGS):
+        # Nested blocks (p inside li/td) are emitted by the innermost one
+        if next(element.iterdescendants(*BLOCK_TAGS), None) is not None:
+            continue
+        text = _text(element)
+        if not text:
+            continue
+        if element.tag not in HEADING_TAGS:
+            if len(text) < MIN_BLOCK_CHARS or _link_chars(element) / len(text) > MAX_LINK_DENSITY:
+                continue
+        blocks.append({'tag': element.tag, 'text': text})
+    return blocks
+
+
+def find_main_container(root):
+    """Highest-scoring container by link-discounted text density"""
+    scores: Dict[etree._Element, float] = {}
+    for element in root.iter('p', 'li', 'pre', 'blockquote', 'td'):
+        text = _text(element)
+        if len(text) < MIN_BLOCK_CHARS:
+            continue
+        score = len(text) * (1 - min(1.0, _link_chars(element) / len(text)))
+        parent = element.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0.0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+    if not scores:
+        return root
+    # Semantic containers get a boost so <main>/<article> win ties with their wrapper divs
+    for element in scores:
+        if element.tag in ('main', 'article'):
+            scores[element] *= 1.25
+    return max(scores, key=scores.get)
+
+
+def _container_path(tree, element) -> str:
+    """A stable path for the template: prefer an id, fall back to the XPath"""
+    element_id = element.get('id')
+    if element_id and '"' not in element_id:
+        return f'//*[@id="{element_id}"]'
+    return tree.getpath(element)
+
+
+def _truncate(blocks: List[Dict[str, str]], limit: int) -> List[Dict[str, str]]:
+    kept, size = [], 0
+    for block in blocks:
+        size += len(block['text']) + 1
+        if size > limit and kept:
+            break
+        kept.append(block)
+    return kept
+
+
+class ContentExtractor:
+    """Main-content extraction with learned per-domain templates"""
+
+    def __init__(self, templates_path: Optional[str] = None, max_chars: int = MAX_CONTENT_CHARS):
+        self.templates_path = templates_path
+        self.max_chars = max_chars
+        # domain -> container path once confirmed
+        self.templates: Dict[str, str] = {}
+        # domain -> (candidate path, pages agreeing)
+        self._candidates: Dict[str, tuple] = {}
+        self.stats = {'pages': 0, 'template_hits': 0}
+        if templates_path and os.path.exists(templates_path):
+            with open(templates_path) as f:
+                self.templates = json.load(f)
+
+    def save(self) -> None:
+        if not self.templates_path:
+            return
+        directory = os.path.dirname(self.templates_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.templates_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.templates, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.templates_path)
+
+    def _from_template(self, tree, domain: str) -> Optional[List[Dict[str, str]]]:
+        path = self.templates.get(domain)
+        if path is None:
+            return None
+        matches = tree.xpath(path)
+        if not matches:
+            # The site layout changed; relearn
+            logger.debug("Extraction template for %s missed, relearning", domain)
+            del self.templates[domain]
+            return None
+        blocks = _blocks(matches[0])
+        # Very little text usually means a differently laid out page type;
+        # use the heuristics for this page but keep the template
+        if sum(len(b['text']) for b in blocks) < MIN_TEMPLATE_CHARS:
+            return None
+        return blocks
+
+    def _learn(self, domain: str, path: str) -> None:
+        candidate, count = self._candidates.get(domain, (None, 0))
+        count = count + 1 if candidate == path else 1
+        if count >= TEMPLATE_CONFIRMATIONS:
+            self.templates[domain] = path
+            self._candidates.pop(domain, None)
+        else:
+            self._candidates[domain] = (path, count)
+
+    def extract(self, html: Union[str, bytes], url: str = '', domain: Optional[str] = None,
+                encoding: Optional[str] = None) -> Dict:
+        """
+        Clean content of a page: title, structured paragraphs and joined text.
+
+        html is the page text, or its raw bytes in encoding (e.g. a Scrapy
+        response's body and encoding); bytes keep XHTML pages with an XML
+        encoding declaration parseable. domain defaults to the URL's host;
+        saved-page corpora pass it explicitly.
+        """
+        self.stats['pages'] += 1
+        if not html or not html.strip():
+            return _empty()
+        try:
+            if isinstance(html, bytes):
+                root = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+            else:
+                root = lxml.html.document_fromstring(_XML_DECLARATION.sub('', html, count=1))
+        except etree.ParserError:
+            return _empty()  # Only comments or whitespace
+        tree = root.getroottree()
+        title_element = root.find('.//title')
+        title = _text(title_element) if title_element is not None else None
+        domain = domain or urlsplit(url).netloc.lower()
+
+        strip_boilerplate(root)
+        headline = root.find('.//h1')
+        if headline is not None and _text(headline):
+            title = _text(headline)
+
+        blocks = self._from_template(tree, domain) if domain else None
+        if blocks is not None:
+            self.stats['template_hits'] += 1
+        else:
+            container = find_main_container(root)
+            blocks = _blocks(container)
+            if domain and container is not root:
+                self._learn(domain, _container_path(tree, container))
+
+        blocks = _truncate(blocks, self.max_chars)
+        return {
+            'title': title,
+            'paragraphs': blocks,
+            'content': '\n'.join(block['text'] for block in blocks),
+        }
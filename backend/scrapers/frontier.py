@@ -0,0 +1,327 @@
+"""
+Persistent crawl frontier: a checkpointed request queue and seen-set.
+
+`FrontierScheduler` replaces Scrapy's scheduler. Every request the engine
+schedules is fingerprinted; unseen ones are stored (serialized with
+`Request.to_dict`) in a SQLite table keyed by fingerprint, one database per
+spider, so the same table is both the queue and the seen-set. Writes are
+committed every FRONTIER_CHECKPOINT_INTERVAL seconds and on close, so a
+crash loses at most that window of scheduling work rather than the whole
+crawl.
+
+Each row moves pending -> in flight (handed to the downloader) -> done.
+`FrontierMiddleware` marks a request done only after its callback's output
+has been consumed, so a checkpoint never holds a finished page without the
+requests it led to. A request replaced by a redirect or retry is done when
+its replacement is scheduled, and one that fails for good is marked by
+`FrontierDownloaderMiddleware`. With FRONTIER_RESUME a restarted crawl puts in-flight
+rows back to pending (including downloads that failed for good, which get
+another try) and carries on with the queue; start requests that were
+already seen are filtered out. Without it the spider's rows are cleared and
+the crawl starts over.
+
+Requests whose callbacks are not spider methods, or whose meta holds objects
+that cannot be pickled, cannot be serialized; those are kept in memory (their
+fingerprint is still recorded as seen).
+
+Settings:
+    SCHEDULER = 'scrapers.frontier.FrontierScheduler'
+    SPIDER_MIDDLEWARES = {'scrapers.frontier.FrontierMiddleware': 0}
+    DOWNLOADER_MIDDLEWARES = {'scrapers.frontier.FrontierDownloaderMiddleware': 0}
+    FRONTIER_DIR                   state directory (CIVICPIE_CRAWL_STATE_DIR)
+    FRONTIER_RESUME                continue the previous run's queue
+    FRONTIER_CHECKPOINT_INTERVAL   seconds between commits
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from scrapy import Request
+from scrapy.core.scheduler import BaseScheduler
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.request import request_from_dict
+
+logger = logging.getLogger(__name__)
+
+FRONTIER_DIR = os.environ.get('CIVICPIE_CRAWL_STATE_DIR', '/data/crawl_state')
+CHECKPOINT_INTERVAL = 5.0
+
+# Request meta key carrying the fingerprint of a request handed out by the frontier
+FINGERPRINT_META = 'frontier_fingerprint'
+
+PENDING = 0
+IN_FLIGHT = 1
+DONE = 2
+
+
+class SQLiteFrontier:
+    """Queue and seen-set of one spider"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint TEXT NOT NULL UNIQUE,
+                priority INTEGER NOT NULL,
+                state INTEGER NOT NULL,
+                request BLOB
+            );
+            CREATE INDEX IF NOT EXISTS frontier_queue ON frontier (state, priority DESC, seq);
+        """)
+        self._conn.commit()
+        self.pending = self._count(PENDING)
+
+    def _count(self, state: int) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM frontier WHERE state = ?', (state,)).fetchone()[0]
+
+    def reset(self) -> None:
+        """Forget the spider's queue and seen-set"""
+        self._conn.execute('DELETE FROM frontier')
+        self._conn.commit()
+        self.pending = 0
+
+    def recover(self) -> int:
+        """Requeue requests that were in flight when the last run stopped"""
+        recovered = self._conn.execute(
+            'UPDATE frontier SET state = ? WHERE state = ? AND request IS NOT NULL', (PENDING, IN_FLIGHT),
+        ).rowcount
+        self._conn.commit()
+        self.pending = self._count(PENDING)
+        return recovered
+
+    def seen(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM frontier').fetchone()[0]
+
+    def add(self, fingerprint: str, priority: int, data: Optional[bytes], force: bool = False,
+            domain: Optional[str] = None) -> bool:
+        """
+        Queue a request unless its fingerprint was seen; force (dont_filter)
+        queues it again regardless. data None only marks it seen. Returns
+        whether the request was accepted. domain is unused here; a single
+        process already keeps Scrapy's per-domain download slots.
+        """
+        state = PENDING if data is not None else DONE
+        if force:
+            previous = self._conn.execute('SELECT state FROM frontier WHERE fingerprint = ?', (fingerprint,)).fetchone()
+            self._conn.execute(
+                'INSERT INTO frontier (fingerprint, priority, state, request) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (fingerprint) DO UPDATE SET '
+                'priority = excluded.priority, state = excluded.state, request = excluded.request',
+                (fingerprint, priority, state, data),
+            )
+            if state == PENDING and (previous is None or previous[0] != PENDING):
+                self.pending += 1
+            return True
+        added = self._conn.execute(
+            'INSERT OR IGNORE INTO frontier (fingerprint, priority, state, request) VALUES (?, ?, ?, ?)',
+            (fingerprint, priority, state, data),
+        ).rowcount == 1
+        if added and state == PENDING:
+            self.pending += 1
+        return added
+
+    def pop(self) -> Optional[Tuple[str, bytes]]:
+        """Highest-priority pending request (FIFO within a priority), marked in flight"""
+        if not self.pending:
+            return None
+        row = self._conn.execute(
+            'SELECT seq, fingerprint, request FROM frontier WHERE state = ? ORDER BY priority DESC, seq LIMIT 1',
+            (PENDING,),
+        ).fetchone()
+        if row is None:
+            self.pending = 0
+            return None
+        self._conn.execute('UPDATE frontier SET state = ? WHERE seq = ?', (IN_FLIGHT, row[0]))
+        self.pending -= 1
+        return row[1], row[2]
+
+    def done(self, fingerprint: str) -> None:
+        """Mark an in-flight request finished (a re-queued retry stays pending)"""
+        self._conn.execute(
+            'UPDATE frontier SET state = ?, request = NULL WHERE fingerprint = ? AND state = ?',
+            (DONE, fingerprint, IN_FLIGHT),
+        )
+
+    def checkpoint(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+class FrontierScheduler(BaseScheduler):
+    """Scrapy scheduler backed by a persistent frontier"""
+
+    def __init__(self, crawler, directory: str = FRONTIER_DIR, resume: bool = False,
+                 checkpoint_interval: float = CHECKPOINT_INTERVAL):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.directory = directory
+        self.resume = resume
+        self.checkpoint_interval = checkpoint_interval
+        self.frontier = None
+        self.spider = None
+        self._memory: Deque[Request] = deque()
+        self._last_checkpoint = time.monotonic()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler,
+            directory=settings.get('FRONTIER_DIR', FRONTIER_DIR),
+            resume=settings.getbool('FRONTIER_RESUME'),
+            checkpoint_interval=settings.getfloat('FRONTIER_CHECKPOINT_INTERVAL', CHECKPOINT_INTERVAL),
+        )
+
+    def open(self, spider):
+        self.spider = spider
+        self.frontier = self._open_frontier(spider)
+        if self.resume:
+            recovered = self.frontier.recover()
+            self.stats.set_value('frontier/recovered', recovered, spider=spider)
+            self.stats.set_value('frontier/resumed_pending', self.frontier.pending, spider=spider)
+            logger.info("Resuming %s: %d pending requests (%d were in flight), %d seen",
+                        spider.name, self.frontier.pending, recovered, self.frontier.seen())
+        else:
+            self.frontier.reset()
+
+    def _open_frontier(self, spider):
+        return SQLiteFrontier(os.path.join(self.directory, f'{spider.name}.sqlite'))
+
+    def close(self, reason):
+        if self.frontier is not None:
+            self.frontier.close()
+            if self._memory:
+                logger.warning("%d unserializable requests were not persisted", len(self._memory))
+
+    def has_pending_requests(self) -> bool:
+        return bool(self._memory) or self.frontier.pending > 0
+
+    def __len__(self) -> int:
+        return len(self._memory) + self.frontier.pending
+
+    def _fingerprint(self, request: Request) -> str:
+        return self.crawler.request_fingerprinter.fingerprint(request).hex()
+
+    @staticmethod
+    def _domain(request: Request) -> str:
+        return request.meta.get('download_slot') or urlparse_cached(request).hostname or ''
+
+    def enqueue_request(self, request: Request) -> bool:
+        replaces = request.meta.get(FINGERPRINT_META)
+        if replaces:
+            # A redirect or retry of a request the frontier handed out
+            self.frontier.done(replaces)
+        data = self._serialize(request)
+        accepted = self.frontier.add(self._fingerprint(request), request.priority, data,
+                                     force=request.dont_filter, domain=self._domain(request))
+        if not accepted:
+            self.stats.inc_value('frontier/filtered', spider=self.spider)
+            return False
+        if data is None:
+            self._memory.append(request)
+            self.stats.inc_value('frontier/enqueued/memory', spider=self.spider)
+        else:
+            self.stats.inc_value('frontier/enqueued', spider=self.spider)
+        self._maybe_checkpoint()
+        return True
+
+    def next_request(self) -> Optional[Request]:
+        if self._memory:
+            self.stats.inc_value('frontier/dequeued/memory', spider=self.spider)
+            return self._memory.popleft()
+        row = self.frontier.pop()
+        if row is None:
+            return None
+        self.stats.inc_value('frontier/dequeued', spider=self.spider)
+        self._maybe_checkpoint()
+        try:
+            request = self._deserialize(row[1])
+        except ValueError:
+            logger.warning("Dropping unreadable request %s", row[0], exc_info=True)
+            self.frontier.done(row[0])
+            return None
+        request.meta[FINGERPRINT_META] = row[0]
+        return request
+
+    def _serialize(self, request: Request) -> Optional[bytes]:
+        """Stored form of a request, None if it can only be kept in memory"""
+        try:
+            return pickle.dumps(request.to_dict(spider=self.spider), protocol=pickle.HIGHEST_PROTOCOL)
+        except (ValueError, TypeError, AttributeError, pickle.PicklingError):
+            # Callback is not a spider method, or meta/cb_kwargs hold an unpicklable object
+            return None
+
+    def _deserialize(self, data: bytes) -> Request:
+        return request_from_dict(pickle.loads(data), spider=self.spider)
+
+    def request_done(self, request: Request) -> None:
+        self.frontier.done(request.meta.get(FINGERPRINT_META) or self._fingerprint(request))
+        self._maybe_checkpoint()
+
+    def _maybe_checkpoint(self) -> None:
+        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Commit now, e.g. after scheduling requests derived from another spider's items"""
+        self._last_checkpoint = time.monotonic()
+        self.frontier.checkpoint()
+        self.stats.inc_value('frontier/checkpoints', spider=self.spider)
+
+
+class FrontierMiddleware:
+    """Spider middleware that marks a request done once its callback output is consumed"""
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def _done(self, response) -> None:
+        scheduler = self.crawler.engine.slot.scheduler
+        if isinstance(scheduler, FrontierScheduler) and response.request is not None:
+            scheduler.request_done(response.request)
+
+    def process_spider_output(self, response, result, spider):
+        yield from result
+        self._done(response)
+
+    def process_spider_exception(self, response, exception, spider):
+        # Error responses filtered by HttpErrorMiddleware, callback failures
+        self._done(response)
+
+
+class FrontierDownloaderMiddleware:
+    """
+    Downloader middleware that marks a request done when its download fails
+    for good. At order 0 it only sees exceptions the retry middleware gave up on.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def process_exception(self, request, exception, spider):
+        scheduler = self.crawler.engine.slot.scheduler
+        if isinstance(scheduler, FrontierScheduler):
+            scheduler.request_done(request)
@@ -15,6 +15,9 @@ This script:
   2. Compares against current data to detect changes
   3. Outputs a diff of what changed
   4. Writes updated ward-data.ts files (shared + frontend)
+  5. Appends changed fields to the ward history log (data/history.py)
+  6. Writes the JSON ward snapshot the backend API serves from (last, since
+     the API reloads when it changes)
 """
 
 import json
@@ -28,6 +31,7 @@ from typing import Any
 
 API_URL = "https://data.cityofchicago.org/resource/htai-wnw4.json"
 VERIFY_URL = "https://www.chicago.gov/city/en/about/wards.html"
+SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'data', 'chicago-wards.json')
 
 # Neighborhoods must be manually maintained — the API does not include them.
 # This map is updated whenever ward boundaries change (last: 2023 redistricting).
@@ -141,6 +145,24 @@ def compare_and_report(old_file: str, new_records: list[dict]) -> list[str]:
     return changes
 
 
+def write_snapshot(records: list[dict], path: str = SNAPSHOT_FILE) -> None:
+    """Write the normalized records as the backend's JSON ward snapshot."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    print(f"  -> Wrote ward snapshot to {os.path.normpath(path)}")
+
+
+def record_history(records: list[dict]) -> int:
+    """Append field-level changes to the ward history; returns wards changed"""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from data.history import HistoryStore
+
+    return len(HistoryStore().record_wards(records))
+
+
 def main():
     raw = fetch_api_data()
     records = sorted([normalize(r) for r in raw], key=lambda x: x['ward'])
@@ -168,6 +190,12 @@ def main():
     else:
         print(f"\n  No existing data file found at {frontend_data}. First run.")
 
+    # History first: the API reloads (and re-reads history) once the
+    # snapshot changes, so the new deltas must already be on disk
+    changed = record_history(records)
+    print(f"\n  History: {changed} ward(s) changed since the last sync.")
+    write_snapshot(records)
+
     print(f"\n[{datetime.now().isoformat()}] Sync complete. Review changes above.")
     print(f"  Source: {API_URL}")
     print(f"  Verify: {VERIFY_URL}")
@@ -0,0 +1,79 @@
+"""
+Production launcher for the CivicPie API.
+
+Runs N uvicorn workers (one per available core by default). Before the
+workers start, read-mostly data (ward records, search index, prepared and
+precompressed ward payloads) is written once to a snapshot file that every
+worker memory-maps. Ward responses are served from the mapped bodies, shared
+through the OS page cache; the records and search index (and the indexes
+built from them) are still decoded into each worker's own heap. Each worker
+warms its caches before accepting traffic; /ready reports 503 until it has.
+
+Usage:
+    python serve.py                      # workers = available cores
+    python serve.py --workers 4 --port 8000
+
+    # Prebuild the snapshot at deploy time (e.g. in the container image) and
+    # point single-process/serverless deploys at it with
+    # CIVICPIE_SHARED_SNAPSHOT=PATH; it then loads with a single mmap
+    python serve.py --build-snapshot /app/civicpie-snapshot.bin
+
+    # Also snapshot other high-traffic cities (written next to PATH as
+    # civicpie-snapshot.<id>.bin); the rest load from their files on first request
+    python serve.py --jurisdictions chicago,evanston
+"""
+
+import argparse
+import os
+import tempfile
+
+
+def default_workers() -> int:
+    """Workers sized to the cores this process may run on"""
+    if os.environ.get("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument(
+        "--snapshot",
+        default=os.environ.get("CIVICPIE_SHARED_SNAPSHOT") or os.path.join(tempfile.gettempdir(), "civicpie-snapshot.bin"),
+        help="path of the shared snapshot file",
+    )
+    parser.add_argument("--build-snapshot", metavar="PATH", help="only write the snapshot to PATH and exit")
+    parser.add_argument(
+        "--jurisdictions",
+        help="comma-separated jurisdictions to snapshot (default: CIVICPIE_DEFAULT_JURISDICTION)",
+    )
+    args = parser.parse_args(argv)
+
+    from data.jurisdictions import DEFAULT_JURISDICTION
+    from main import build_shared_snapshot
+
+    jurisdictions = (args.jurisdictions or DEFAULT_JURISDICTION).split(",")
+    if args.build_snapshot:
+        for jurisdiction in jurisdictions:
+            print(f"Wrote snapshot to {build_shared_snapshot(args.build_snapshot, jurisdiction)}")
+        return
+
+    for jurisdiction in jurisdictions:
+        build_shared_snapshot(args.snapshot, jurisdiction)
+    # Workers are spawned fresh and read the snapshot location from the environment
+    os.environ["CIVICPIE_SHARED_SNAPSHOT"] = args.snapshot
+    print(f"Starting {args.workers} worker(s) with shared snapshot {args.snapshot}")
+
+    import uvicorn
+
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.admission import (
+    AdmissionController,
+    InMemoryTokenBuckets,
+    PriorityWorkQueue,
+    RedisTokenBuckets,
+)
+
+
+def make_request(peer: str, forwarded: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "POST", "path": "/api/chat", "headers": headers, "client": (peer, 5000)})
+
+
+def controller(limiter=None, trusted=()) -> AdmissionController:
+    return AdmissionController(
+        limiter or InMemoryTokenBuckets(rate=1.0, burst=2),
+        PriorityWorkQueue(concurrency=4, max_queue=8),
+        default_deadline=1.0,
+        trusted_proxies=trusted,
+    )
+
+
+def test_forwarded_header_ignored_from_untrusted_peer():
+    admission = controller()
+    assert admission.client_key(make_request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+
+def test_forwarded_header_honored_from_trusted_proxy():
+    admission = controller(trusted=["10.0.0.0/8"])
+    # The client prepended a spoofed hop; the proxy appended the real peer
+    request = make_request("10.1.2.3", "1.1.1.1, 198.51.100.7, 10.4.5.6")
+    assert admission.client_key(request) == "198.51.100.7"
+
+
+@pytest.mark.asyncio
+async def test_rotating_forwarded_header_cannot_bypass_limit():
+    admission = controller()
+
+    async def attempt(i: int) -> int:
+        try:
+            async with admission.admit(make_request("203.0.113.9", f"198.51.100.{i}")):
+                return 200
+        except HTTPException as exc:
+            return exc.status_code
+
+    statuses = [await attempt(i) for i in range(5)]
+    assert statuses.count(200) == 2
+    assert statuses.count(429) == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_buckets_shared_between_workers():
+    server = fakeredis.FakeServer()
+    workers = [
+        RedisTokenBuckets(fakeredis.aioredis.FakeRedis(server=server), rate=1.0, burst=3)
+        for _ in range(2)
+    ]
+    results = [await workers[i % 2].take("client-a") for i in range(4)]
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert 0 < results[-1][1] <= 1.0
+    # Other clients have their own bucket
+    assert (await workers[0].take("client-b"))[0]
+
+
+@pytest.mark.asyncio
+async def test_redis_bucket_refills():
+    limiter = RedisTokenBuckets(fakeredis.aioredis.FakeRedis(), rate=50.0, burst=1)
+    assert (await limiter.take("c"))[0]
+    assert not (await limiter.take("c"))[0]
+    await asyncio.sleep(0.05)
+    assert (await limiter.take("c"))[0]
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from data.autocomplete import Autocomplete
+
+RECORDS = [
+    {'ward': 1, 'alderperson': 'Daniel La Spata', 'neighborhoods': ['Wicker Park'], 'wardOfficeAddress': '1958 N Milwaukee Ave'},
+    {'ward': 2, 'alderperson': 'Brian Hopkins', 'neighborhoods': ['Gold Coast'], 'wardOfficeAddress': '1400 N Ashland Ave'},
+]
+
+
+def test_only_queries_naming_a_label_are_counted():
+    completer = Autocomplete(RECORDS)
+    for i in range(1000):
+        completer.record_query(f"random client input {i}")
+    completer.record_query("Wicker  Park")
+    assert dict(completer.popularity) == {'wicker park': 1}
+
+
+def test_popularity_reorders_and_is_pruned_with_the_labels():
+    completer = Autocomplete(RECORDS, rebuild_interval=0)
+    for _ in range(5):
+        completer.record_query("gold coast")
+    completer.rebuild()
+    assert completer.suggest("")[0].label == "Gold Coast"
+    completer.rebuild(RECORDS[:1])
+    assert "gold coast" not in completer.popularity
+
+
+def test_limit_is_validated():
+    import main
+
+    client = TestClient(main.app)
+    assert client.get("/api/autocomplete", params={"q": "wa", "limit": -3}).status_code == 422
+    assert client.get("/api/autocomplete", params={"q": "wa", "limit": 0}).status_code == 422
+    assert client.get("/api/autocomplete", params={"q": "wa", "limit": 11}).status_code == 422
+    assert len(client.get("/api/autocomplete", params={"q": "wa", "limit": 2}).json()["suggestions"]) == 2
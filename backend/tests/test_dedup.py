@@ -0,0 +1,56 @@
+import pytest
+from scrapy.exceptions import DropItem
+
+from scrapers.dedup import NearDuplicatePipeline
+
+NEWSLETTER = (
+    "Join us for the ward night community meeting on Tuesday at the field house. "
+    "We will discuss the street resurfacing schedule, the new protected bike lanes "
+    "on Milwaukee Avenue and the participatory budgeting vote for next year."
+)
+EVENTS = (
+    "The farmers market returns to the plaza every Saturday morning through October, "
+    "with local growers, live music and a free composting drop-off site for residents."
+)
+
+
+def crawl(pipeline, pages):
+    """Run pages (url -> content) through the pipeline; returns the urls kept"""
+    pipeline.open_spider(None)
+    kept = []
+    for url, content in pages.items():
+        try:
+            pipeline.process_item({"url": url, "content": content}, None)
+            kept.append(url)
+        except DropItem:
+            pass
+    pipeline.close_spider(None)
+    return kept
+
+
+def test_copies_within_a_crawl_are_dropped():
+    pages = {"https://a.example/": NEWSLETTER, "https://a.example/news": NEWSLETTER, "https://a.example/events": EVENTS}
+    assert crawl(NearDuplicatePipeline(), pages) == ["https://a.example/", "https://a.example/events"]
+
+
+@pytest.mark.parametrize("across_runs", [False, True])
+def test_recrawling_unchanged_pages_keeps_them(tmp_path, across_runs):
+    index_path = str(tmp_path / "dedup.json")
+    pages = {"https://a.example/": NEWSLETTER, "https://a.example/events": EVENTS}
+    assert crawl(NearDuplicatePipeline(index_path), pages) == list(pages)
+    assert crawl(NearDuplicatePipeline(index_path, across_runs=across_runs), pages) == list(pages)
+
+
+def test_fresh_crawl_ignores_content_of_earlier_runs(tmp_path):
+    index_path = str(tmp_path / "dedup.json")
+    crawl(NearDuplicatePipeline(index_path), {"https://a.example/": NEWSLETTER})
+    # The earlier output was overwritten, so the copy on the new page is kept
+    assert crawl(NearDuplicatePipeline(index_path), {"https://a.example/news": NEWSLETTER}) == ["https://a.example/news"]
+
+
+def test_appending_crawl_drops_content_emitted_by_earlier_runs(tmp_path):
+    index_path = str(tmp_path / "dedup.json")
+    crawl(NearDuplicatePipeline(index_path), {"https://a.example/": NEWSLETTER})
+    second = NearDuplicatePipeline(index_path, across_runs=True)
+    assert crawl(second, {"https://a.example/news": NEWSLETTER, "https://a.example/": NEWSLETTER}) == ["https://a.example/"]
+    assert second.saved["items"] == 1
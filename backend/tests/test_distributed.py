@@ -0,0 +1,90 @@
+import pickle
+import time
+
+import fakeredis
+import pytest
+from scrapy import Request
+
+from scrapers.distributed import RedisFrontier, decode_request, encode_request, spider_prefix
+
+
+class RecordingClient(fakeredis.FakeRedis):
+    """FakeRedis that records every key handed to a Lua script"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.script_keys = set()
+
+    def register_script(self, script):
+        registered = super().register_script(script)
+
+        def run(keys=(), args=(), client=None):
+            self.script_keys.update(keys)
+            return registered(keys=keys, args=args, client=client)
+
+        return run
+
+
+@pytest.fixture
+def client():
+    return RecordingClient(server=fakeredis.FakeServer())
+
+
+def test_request_round_trips_through_json():
+    request = Request(
+        "https://example.org/a", method="POST", body=b"\x00\xffdata",
+        headers={"X-Token": "abc"}, meta={"depth": 2, "download_slot": "example.org"}, priority=3,
+    )
+    data = encode_request(request.to_dict())
+    restored = decode_request(data)
+    assert restored.url == request.url
+    assert restored.body == request.body
+    assert restored.headers.getlist("X-Token") == [b"abc"]
+    assert restored.meta == request.meta
+    assert restored.priority == 3
+
+
+def test_pickled_or_foreign_payloads_are_rejected():
+    with pytest.raises(ValueError):
+        decode_request(pickle.dumps({"url": "https://example.org"}))
+    with pytest.raises(ValueError):
+        decode_request(b'{"url": "https://example.org", "_class": "os.system"}')
+
+
+def test_unserializable_meta_is_reported():
+    with pytest.raises(TypeError):
+        encode_request(Request("https://example.org", meta={"obj": object()}).to_dict())
+
+
+def test_scripts_only_touch_declared_keys_in_one_slot(client):
+    frontier = RedisFrontier(client, "council", "w1", "test")
+    frontier.heartbeat()
+    for i, domain in enumerate(["a.example", "b.example"]):
+        assert frontier.add(f"fp{i}", 0, b"{}", domain=domain)
+    assert sorted(frontier.balance()) == ["a.example", "b.example"]
+    fingerprint, _ = frontier.pop()
+    frontier.done(fingerprint)
+    frontier.pop()
+    frontier.close()
+
+    prefix = spider_prefix("council", "test")
+    assert "{council}" in prefix
+    assert all(key.startswith(prefix) for key in client.script_keys)
+    created = {key.decode() for key in client.keys(prefix + "*")}
+    assert created <= client.script_keys
+
+
+def test_dead_worker_requests_are_requeued(client):
+    dead = RedisFrontier(client, "council", "dead", "test", worker_timeout=30)
+    alive = RedisFrontier(client, "council", "alive", "test", worker_timeout=30)
+    dead.heartbeat()
+    dead.add("fp", 0, b"{}", domain="a.example")
+    assert dead.balance() == ["a.example"]
+    assert dead.pop() == ("fp", b"{}")
+    assert alive.pop() is None
+
+    assert alive.reap(time.time() + 1) == 1
+    assert alive.balance() == ["a.example"]
+    assert alive.pop() == ("fp", b"{}")
+    alive.done("fp")
+    assert alive.pending == 0
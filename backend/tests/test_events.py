@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+from api.events import KIND_MEETING, KIND_WARD, EventBus, diff_records
+
+WINDOW = 0.05
+
+
+def make_bus():
+    bus = EventBus(coalesce_window=WINDOW)
+    bus.bind(asyncio.get_running_loop())
+    return bus
+
+
+def changes(events):
+    return [(e["ward_id"], e["kind"], e["fields"]) for e in events]
+
+
+@pytest.mark.asyncio
+async def test_changes_in_window_coalesce_and_fan_out_by_ward():
+    bus = make_bus()
+    ward_3 = bus.subscribe([3])
+    ward_7 = bus.subscribe([7])
+    everything = bus.subscribe()
+
+    bus.publish(3, KIND_WARD, ["email"])
+    bus.publish(3, KIND_WARD, ["phone"])
+    bus.publish(3, KIND_WARD, ["email", "address"])
+    # Nothing is delivered before the window closes
+    assert await ward_3.next(timeout=WINDOW / 5) == []
+
+    merged = [(3, KIND_WARD, ["address", "email", "phone"])]
+    assert changes(await ward_3.next(timeout=1)) == merged
+    assert changes(await everything.next(timeout=1)) == merged
+    assert await ward_7.next(timeout=WINDOW * 4) == []
+
+
+@pytest.mark.asyncio
+async def test_city_wide_change_reaches_every_subscriber():
+    bus = make_bus()
+    subscriptions = [bus.subscribe([1]), bus.subscribe([2, 3]), bus.subscribe()]
+    bus.publish(None, KIND_MEETING, ["agenda"])
+    for subscription in subscriptions:
+        assert changes(await subscription.next(timeout=1)) == [(None, KIND_MEETING, ["agenda"])]
+
+
+@pytest.mark.asyncio
+async def test_filter_update_and_unsubscribe():
+    bus = make_bus()
+    subscription = bus.subscribe([1])
+    bus.update(subscription, [2])
+    bus.publish(1, KIND_WARD, ["email"])
+    bus.publish(2, KIND_WARD, ["phone"])
+    assert changes(await subscription.next(timeout=1)) == [(2, KIND_WARD, ["phone"])]
+
+    bus.unsubscribe(subscription)
+    assert bus.subscriber_count == 0
+    bus.publish(2, KIND_WARD, ["phone"])
+    assert await subscription.next(timeout=WINDOW * 4) == []
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread():
+    bus = make_bus()
+    subscription = bus.subscribe([5])
+    publishers = [threading.Thread(target=bus.publish, args=(5, KIND_WARD, [f"field{i}"])) for i in range(4)]
+    for thread in publishers:
+        thread.start()
+    for thread in publishers:
+        thread.join()
+    assert changes(await subscription.next(timeout=1)) == [(5, KIND_WARD, ["field0", "field1", "field2", "field3"])]
+
+
+def test_diff_records():
+    old = {1: {"email": "a", "phone": "1"}, 2: {"email": "b"}}
+    new = {1: {"email": "a", "phone": "2"}, 3: {"email": "c"}}
+    assert diff_records(old, new) == [(1, ["phone"]), (2, ["email"]), (3, ["email"])]
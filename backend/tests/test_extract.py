@@ -0,0 +1,77 @@
+import pytest
+
+from scrapers.extract import ContentExtractor, strip_boilerplate
+
+import lxml.html
+
+ARTICLE = (
+    "<article><h1>Ward 32 spring cleanup</h1>"
+    "<p>Residents are invited to join the annual spring cleanup on Saturday, April 12, starting at the field house.</p>"
+    "<p>Gloves, bags and coffee will be provided, and volunteers can pick up supplies from 9 AM at the ward office.</p>"
+    "<p>Please register in advance so we can plan routes for every block in the ward and share the load fairly.</p>"
+    "</article>"
+)
+SHARE_BAR = (
+    '<div class="share-buttons">Share: <a href="#">Facebook</a> <a href="#">Twitter</a> <a href="#">Email</a></div>'
+)
+RELATED = (
+    '<ul class="related-posts">'
+    + ''.join(f'<li><a href="/p{i}">Read about the ward event number {i} held this month</a></li>' for i in range(6))
+    + '</ul>'
+)
+
+
+def page(body: str) -> str:
+    return f"<html><head><title>Ward 32</title></head><body>{body}</body></html>"
+
+
+@pytest.mark.parametrize("wrapper", [
+    '<div class="has-sidebar">{}</div>',
+    '<div class="research-updates">{}</div>',
+    '<div class="shareable">{}</div>',
+    '<div id="page_header_layout" class="layout">{}</div>',
+    '<section class="content-with-nav">{}<div class="sidebar"><a href="/">Home</a> <a href="/news">News</a></div></section>',
+])
+def test_article_inside_marked_wrapper_is_kept(wrapper):
+    result = ContentExtractor().extract(page(wrapper.format(ARTICLE)), domain="ward32.example")
+    assert result['title'] == "Ward 32 spring cleanup"
+    assert "spring cleanup on Saturday" in result['content']
+    assert "register in advance" in result['content']
+
+
+def test_link_dense_and_short_boilerplate_is_removed():
+    root = lxml.html.document_fromstring(page(
+        ARTICLE + SHARE_BAR + RELATED + '<div class="cookie-banner">This site uses cookies.</div>'
+    ))
+    strip_boilerplate(root)
+    assert not root.xpath('//*[contains(@class, "share-buttons")]')
+    assert not root.xpath('//*[contains(@class, "related-posts")]')
+    assert not root.xpath('//*[contains(@class, "cookie-banner")]')
+    assert root.xpath('//article')
+
+
+def test_tokens_match_whole_words_only():
+    root = lxml.html.document_fromstring(page('<div class="navigator-tips">Short tip.</div>'))
+    strip_boilerplate(root)
+    assert root.xpath('//*[@class="navigator-tips"]')
+
+
+XHTML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Ward 32</title></head>'
+    f'<body>{ARTICLE}</body></html>'
+)
+
+
+def test_xhtml_with_encoding_declaration_parses_as_text_or_bytes():
+    extractor = ContentExtractor()
+    from_text = extractor.extract(XHTML)
+    from_bytes = extractor.extract(XHTML.replace('cleanup', 'cléanup').encode('utf-8'), encoding='utf-8')
+    assert 'spring cleanup' in from_text['content']
+    assert 'spring cléanup' in from_bytes['content']
+
+
+@pytest.mark.parametrize("html", ["<!-- nothing here -->", "  \n\t ", b"<!-- empty -->"])
+def test_comment_or_whitespace_only_documents_are_empty(html):
+    assert ContentExtractor().extract(html) == {'title': None, 'paragraphs': [], 'content': ''}
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.utils.test import get_crawler
+
+from scrapers.frontier import DONE, FINGERPRINT_META, IN_FLIGHT, PENDING, FrontierScheduler, SQLiteFrontier
+
+
+class CouncilSpider(Spider):
+    name = "council"
+
+    def parse(self, response):
+        pass
+
+    def parse_ward(self, response):
+        pass
+
+
+def open_scheduler(directory, resume=False):
+    crawler = get_crawler(CouncilSpider)
+    spider = CouncilSpider()
+    scheduler = FrontierScheduler(crawler, directory=str(directory), resume=resume, checkpoint_interval=3600)
+    scheduler.open(spider)
+    return scheduler, spider
+
+
+def states(scheduler):
+    rows = scheduler.frontier._conn.execute("SELECT state FROM frontier ORDER BY seq").fetchall()
+    return [row[0] for row in rows]
+
+
+def test_recover_puts_in_flight_rows_back_to_pending(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / "council.sqlite"))
+    for i in range(3):
+        frontier.add(f"fp{i}", 0, b"request")
+    frontier.add("seen-only", 0, None)
+    assert frontier.pop()[0] == "fp0"
+    assert frontier.pop()[0] == "fp1"
+    frontier.done("fp0")
+    frontier.close()
+
+    frontier = SQLiteFrontier(str(tmp_path / "council.sqlite"))
+    assert frontier.pending == 1
+    assert frontier.recover() == 1
+    assert frontier.pending == 2
+    assert [frontier.pop()[0], frontier.pop()[0], frontier.pop()] == ["fp1", "fp2", None]
+    frontier.close()
+
+
+def test_resumed_crawl_continues_the_queue_and_filters_seen_start_requests(tmp_path):
+    scheduler, spider = open_scheduler(tmp_path)
+    start = Request("https://www.chicago.gov/wards", callback=spider.parse)
+    assert scheduler.enqueue_request(start)
+    handed_out = scheduler.next_request()
+    assert handed_out.url == start.url and handed_out.callback == spider.parse
+    for ward in (1, 2):
+        scheduler.enqueue_request(Request(f"https://ward{ward}.example.org", callback=spider.parse_ward))
+    scheduler.request_done(handed_out)
+    in_flight = scheduler.next_request()
+    assert states(scheduler) == [DONE, IN_FLIGHT, PENDING]
+    # A crash: commit what a checkpoint would have, but never close
+    scheduler.frontier.checkpoint()
+
+    resumed, spider = open_scheduler(tmp_path, resume=True)
+    assert resumed.stats.get_value("frontier/recovered", spider=spider) == 1
+    assert states(resumed) == [DONE, PENDING, PENDING]
+    assert not resumed.enqueue_request(Request("https://www.chicago.gov/wards", callback=spider.parse))
+    assert resumed.stats.get_value("frontier/filtered", spider=spider) == 1
+
+    requests = [resumed.next_request(), resumed.next_request()]
+    assert [r.url for r in requests] == [in_flight.url, "https://ward2.example.org"]
+    assert all(r.callback == spider.parse_ward and r.meta[FINGERPRINT_META] for r in requests)
+    assert resumed.next_request() is None
+    resumed.close("finished")
+    scheduler.frontier._conn.close()
+
+
+def test_fresh_crawl_clears_the_previous_run(tmp_path):
+    scheduler, spider = open_scheduler(tmp_path)
+    scheduler.enqueue_request(Request("https://www.chicago.gov/wards", callback=spider.parse))
+    scheduler.close("finished")
+
+    restarted, spider = open_scheduler(tmp_path)
+    assert len(restarted) == 0
+    assert restarted.enqueue_request(Request("https://www.chicago.gov/wards", callback=spider.parse))
+    restarted.close("finished")
+
+
+@pytest.mark.parametrize("meta", [
+    {"transform": lambda text: text.strip()},
+    {"lock": threading.Lock()},
+])
+def test_unserializable_request_falls_back_to_memory(tmp_path, meta):
+    scheduler, spider = open_scheduler(tmp_path)
+    request = Request("https://ward3.example.org", callback=spider.parse_ward, meta=meta)
+    assert scheduler.enqueue_request(request)
+    assert scheduler.stats.get_value("frontier/enqueued/memory", spider=spider) == 1
+    assert states(scheduler) == [DONE]  # Recorded as seen only
+    assert len(scheduler) == 1
+    assert scheduler.next_request() is request
+    # Still filtered as seen
+    assert not scheduler.enqueue_request(Request("https://ward3.example.org", callback=spider.parse_ward, meta=meta))
+    scheduler.close("finished")
+
+
+def test_local_callback_falls_back_to_memory(tmp_path):
+    scheduler, _ = open_scheduler(tmp_path)
+    request = Request("https://ward4.example.org", callback=lambda response: None)
+    assert scheduler.enqueue_request(request)
+    assert scheduler.next_request() is request
+    scheduler.close("finished")
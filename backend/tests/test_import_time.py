@@ -0,0 +1,16 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.check_import_time import DEFERRED_MODULES
+from benchmarks.load_test import BACKEND_DIR
+
+
+def test_main_does_not_import_deferred_modules():
+    # A fresh interpreter: this test process may already have them loaded
+    snippet = (
+        "import json, sys; import main; "
+        f"print(json.dumps(sorted(m for m in {list(DEFERRED_MODULES)!r} if m in sys.modules)))"
+    )
+    proc = subprocess.run([sys.executable, "-c", snippet], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,103 @@
+import re
+
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+
+from monitoring.metrics import (
+    CONTENT_TYPE_LATEST,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    REQUESTS_TOTAL,
+    RESPONSE_SIZE,
+    Histogram,
+    MetricsMiddleware,
+    span,
+)
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{([a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    seen_in_flight = []
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def item(item_id: int):
+        seen_in_flight.append(REQUESTS_IN_FLIGHT.get("GET", "/metrics-test/items/{item_id}"))
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return Response(b"x" * 1200)
+
+    return app, seen_in_flight
+
+
+def test_middleware_records_status_size_latency_and_in_flight():
+    app, seen_in_flight = make_app()
+    route = "/metrics-test/items/{item_id}"
+    latency_before = REQUEST_LATENCY.count("GET", route)
+    ok_before = REQUESTS_TOTAL.get("GET", route, "200")
+    missing_before = REQUESTS_TOTAL.get("GET", route, "404")
+
+    with TestClient(app) as client:
+        for item_id in (1, 2, 0):
+            client.get(f"/metrics-test/items/{item_id}")
+        client.get("/metrics-test/nowhere")
+
+    # Routes are labelled by template, not by the concrete path
+    assert REQUESTS_TOTAL.get("GET", route, "200") - ok_before == 2
+    assert REQUESTS_TOTAL.get("GET", route, "404") - missing_before == 1
+    assert REQUEST_LATENCY.count("GET", route) - latency_before == 3
+    assert REQUESTS_TOTAL.get("GET", "unmatched", "404") >= 1
+    assert seen_in_flight == [1, 1, 1]
+    assert REQUESTS_IN_FLIGHT.get("GET", route) == 0
+    bucket_1000 = RESPONSE_SIZE.buckets.index(1_000)
+    assert RESPONSE_SIZE._counts[("GET", route)][bucket_1000 + 1] >= 2  # 1200-byte bodies in the 5k bucket
+
+
+def test_metrics_endpoint_renders_prometheus_exposition():
+    import main
+
+    app, _ = make_app()
+    with TestClient(app) as client:
+        client.get("/metrics-test/items/1")
+    with TestClient(main.app) as client:
+        client.get("/api/wards/1")
+        response = client.get("/metrics")
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    lines = response.text.rstrip("\n").split("\n")
+
+    typed = {}
+    for line in lines:
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            typed[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        float(match.group(4).replace("+Inf", "inf"))
+        base = re.sub(r"_(bucket|sum|count)$", "", match.group(1))
+        assert match.group(1) in typed or base in typed, line
+
+    assert typed["civicpie_http_request_duration_seconds"] == "histogram"
+    prefix = 'civicpie_http_request_duration_seconds'
+    labels = 'method="GET",route="/metrics-test/items/{item_id}"'
+    buckets = [line for line in lines if line.startswith(f"{prefix}_bucket{{{labels},")]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts) and buckets[-1].startswith(f'{prefix}_bucket{{{labels},le="+Inf"}}')
+    assert f"{prefix}_count{{{labels}}} {counts[-1]}" in lines
+    assert any(line.startswith(f"{prefix}_sum{{{labels}}} ") for line in lines)
+    assert 'route="/api/wards/{ward_id}"' in response.text
+    # /metrics itself is not instrumented
+    assert 'route="/metrics"' not in response.text
+
+
+def test_span_records_stage_duration():
+    histogram = Histogram("test_stage_seconds", "test", ("stage",))
+    with span("retrieval", histogram) as timed:
+        pass
+    assert histogram.count("retrieval") == 1
+    assert timed.elapsed >= 0
+    assert histogram.samples()[-1] == 'test_stage_seconds_count{stage="retrieval"} 1'
@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+from data.jurisdictions import Jurisdiction
+from data.partitions import Partition, SlotNotBuilt, built_only
+
+
+def test_built_only_refuses_to_build():
+    part = Partition(Jurisdiction(id="springfield", name="Springfield"))
+    with built_only(), pytest.raises(SlotNotBuilt):
+        part.get("records", dict)
+    part.get("records", dict)
+    with built_only():
+        assert part.get("records", list) == {}
+
+
+@pytest.mark.asyncio
+async def test_first_build_runs_off_the_event_loop():
+    import main
+
+    part = Partition(Jurisdiction(id="springfield", name="Springfield"))
+    builders = []
+
+    def build():
+        builders.append(threading.current_thread())
+        return 42
+
+    assert await main._load(part.get, "index", build) == 42
+    assert await main._load(part.get, "index", build) == 42
+    assert len(builders) == 1 and builders[0] is not threading.main_thread()
+
+
+def test_default_event_bus_is_the_named_one():
+    import main
+
+    assert main.event_bus() is main.event_bus(main.DEFAULT_JURISDICTION)
@@ -0,0 +1,25 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from geo.proximity import MAX_RADIUS_KM
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("radius_km", [0, -1, MAX_RADIUS_KM + 1])
+def test_radius_is_validated_for_single_and_batch_queries(client, radius_km):
+    single = client.get("/api/wards/nearby", params={"lat": 41.88, "lng": -87.63, "radius_km": radius_km})
+    assert single.status_code == 400
+    batch = client.post("/api/wards/nearby/batch", json={"points": [{"lat": 41.88, "lng": -87.63}], "radius_km": radius_km})
+    assert batch.status_code == 400
+
+
+def test_batch_within_radius(client):
+    response = client.post("/api/wards/nearby/batch", json={"points": [{"lat": 41.88, "lng": -87.63}], "radius_km": 5})
+    assert response.status_code == 200
+    assert all(c["distance_km"] <= 5 for c in response.json()["results"][0]["candidates"])
@@ -0,0 +1,30 @@
+from geo.representatives import RepresentativeResolver, alderperson_official
+from models.official import Branch, GovernmentLevel, Official
+
+MAYOR = Official(
+    id="mayor",
+    name="Mayor",
+    title="Mayor",
+    level=GovernmentLevel.CITY,
+    branch=Branch.EXECUTIVE,
+    jurisdiction="Chicago",
+)
+ALDERPERSON = alderperson_official({"ward": 5, "alderperson": "Ald. Five"})
+
+
+def test_point_outside_every_district_still_gets_at_large_officials():
+    resolver = RepresentativeResolver(None, [ALDERPERSON, MAYOR])
+    result = resolver.resolve_point(41.88, -87.63)
+    assert result["districts"] == {}
+    assert [o["id"] for o in result["officials"]] == ["mayor"]
+
+
+def test_batch_returns_at_large_officials_for_unmatched_points():
+    resolver = RepresentativeResolver(None, [ALDERPERSON, MAYOR])
+    results = resolver.resolve_batch([(41.88, -87.63), (0.0, 0.0)])
+    assert [[o["id"] for o in r["officials"]] for r in results] == [["mayor"], ["mayor"]]
+
+
+def test_ward_lists_its_alderperson_before_at_large():
+    resolver = RepresentativeResolver(None, [ALDERPERSON, MAYOR])
+    assert [o["id"] for o in resolver.resolve_ward(5)["officials"]] == ["alderman-5", "mayor"]
@@ -0,0 +1,78 @@
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from api import responses
+from api.responses import MINIMUM_COMPRESS_SIZE, PreparedPayload, negotiate_encoding
+
+
+def make_request(accept_encoding=None):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(responses, "SUPPORTED_ENCODINGS", ("br", "gzip"))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("*", "br"),
+    ("*;q=0.5, br;q=0", "gzip"),
+    ("*;q=0", None),
+    ("identity", None),
+    ("identity;q=0, gzip", "gzip"),
+    ("GZIP;q=0.3, deflate", "gzip"),
+    ("br;q=bogus, gzip;q=0.1", "gzip"),
+])
+def test_negotiate_encoding_q_values(with_brotli, header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(responses, "SUPPORTED_ENCODINGS", ("gzip",))
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+    assert negotiate_encoding("*") == "gzip"
+
+
+def test_prepared_payload_serves_precompressed_variant(with_brotli):
+    body = b"[" + b"1," * MINIMUM_COMPRESS_SIZE + b"1]"
+    payload = PreparedPayload(memoryview(body), {"gzip": b"precompressed-gzip", "br": b"precompressed-br"})
+
+    response = payload.response(make_request("gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.body == b"precompressed-gzip"
+
+    assert payload.response(make_request("gzip, br")).body == b"precompressed-br"
+    assert payload.response(make_request("br;q=0, gzip")).body == b"precompressed-gzip"
+
+    identity = payload.response(make_request("identity"))
+    assert "content-encoding" not in identity.headers
+    assert identity.body == body
+    assert payload.response(make_request("gzip"), compressed=False).body == body
+
+
+def test_prepared_payload_compresses_missing_variant_once(monkeypatch):
+    monkeypatch.setattr(responses, "SUPPORTED_ENCODINGS", ("gzip",))
+    body = b"x" * (MINIMUM_COMPRESS_SIZE * 2)
+    payload = PreparedPayload(body)
+    first = payload.response(make_request("gzip")).body
+    assert gzip.decompress(first) == body
+    assert payload.encoded("gzip") is payload.encoded("gzip")
+    assert set(payload.precompress()) == {"gzip"}
+
+
+def test_small_payload_is_sent_uncompressed(with_brotli):
+    payload = PreparedPayload.from_content({"id": 1})
+    response = payload.response(make_request("br, gzip"))
+    assert "content-encoding" not in response.headers
+    assert response.body == b'{"id":1}'
+    assert payload.precompress() == {}
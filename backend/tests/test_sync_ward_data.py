@@ -0,0 +1,15 @@
+from scrapers import sync_ward_data
+
+
+def test_history_is_appended_before_the_snapshot_is_written(monkeypatch):
+    calls = []
+    record = {
+        'ward': 1, 'alderman': 'Jane Doe', 'address': '1 Main St', 'city': 'Chicago', 'state': 'IL',
+        'zipcode': '60601', 'ward_phone': '312-555-0100', 'email': 'ward01@cityofchicago.org',
+    }
+    monkeypatch.setattr(sync_ward_data, 'fetch_api_data', lambda: [record])
+    monkeypatch.setattr(sync_ward_data, 'record_history', lambda records: calls.append('history') or 1)
+    monkeypatch.setattr(sync_ward_data, 'write_snapshot', lambda records: calls.append('snapshot'))
+    monkeypatch.setattr(sync_ward_data, 'compare_and_report', lambda path, records: [])
+    sync_ward_data.main()
+    assert calls == ['history', 'snapshot']
@@ -0,0 +1,93 @@
+import csv
+import random
+
+from data.votes import VoteStore
+
+HEADER = ['body', 'vote_id', 'date', 'question', 'legislator_id', 'name', 'party', 'position']
+
+# a and b (party D) agree on 5 of 6 votes; c (R) misses one vote
+FIXTURE = {
+    'a': ('D', ['yea', 'yea', 'yea', 'yea', 'yea', 'nay']),
+    'b': ('D', ['yea', 'yea', 'yea', 'yea', 'nay', 'nay']),
+    'c': ('R', ['nay', 'nay', 'yea', 'absent', 'nay', 'yea']),
+}
+
+
+def write_rows(path, rows, append=False):
+    with open(path, 'a' if append else 'w', newline='') as f:
+        writer = csv.writer(f)
+        if not append:
+            writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def row(vote, legislator, party, position, body='council'):
+    return [body, f'v{vote}', f'2024-01-{vote + 1:02d}', f'Question {vote}', legislator, legislator.upper(), party, position]
+
+
+def fixture_rows():
+    return [row(v, legislator, party, positions[v])
+            for v in range(6) for legislator, (party, positions) in FIXTURE.items()]
+
+
+def test_alignment_and_attendance(tmp_path):
+    write_rows(tmp_path / 'council.csv', fixture_rows())
+    store = VoteStore(str(tmp_path))
+    store.refresh()
+
+    a, c = store.official('a'), store.official('c')
+    assert a['votes_eligible'] == 6 and a['missed_votes_percentage'] == 0.0
+    assert c['votes_cast'] == 5 and c['missed_votes_percentage'] == 16.7
+    # Vote 5 splits party D, so it counts toward nobody's party alignment
+    assert a['votes_with_party_percentage'] == 100.0
+    assert [m['legislator_id'] for m in a['most_aligned']] == ['b', 'c']
+    assert a['most_aligned'][0]['agreement_percentage'] == 83.3
+    assert store.agreement('council', 'a', 'b') == {
+        'body': 'council', 'legislators': ['a', 'b'], 'shared_votes': 6, 'agreement_percentage': 83.3,
+    }
+    assert store.agreement('council', 'a', 'c')['agreement_percentage'] == 20.0
+    assert a['recent_votes'][0] == {'vote_id': 'v5', 'date': '2024-01-06', 'question': 'Question 5', 'position': 'nay'}
+
+
+def test_incremental_refresh_matches_full_recompute(tmp_path):
+    rng = random.Random(7)
+    positions = ['yea', 'nay', 'present', 'absent']
+    parties = {f'l{i}': rng.choice('DRI') for i in range(20)}
+    path = tmp_path / 'council.csv'
+    incremental = VoteStore(str(tmp_path))
+    write_rows(path, [])
+    # Legislators join over time (growing the count arrays several times),
+    # and the last batch corrects earlier votes
+    for batch in range(4):
+        members = list(parties)[:5 * (batch + 1)]
+        rows = [row(v, m, parties[m], rng.choice(positions))
+                for v in range(batch * 10, batch * 10 + 10) for m in members]
+        rows += [row(rng.randrange(batch * 10 + 1), m, parties[m], rng.choice(positions)) for m in members[:3]]
+        write_rows(path, rows, append=True)
+        incremental.refresh()
+
+    full = VoteStore(str(tmp_path))
+    full.refresh()
+    assert incremental.officials == full.officials
+    body, expected = incremental.bodies['council'], full.bodies['council']
+    n = len(body.legislators)
+    assert (body.agree[:n, :n] == expected.agree[:n, :n]).all()
+    assert (body.shared[:n, :n] == expected.shared[:n, :n]).all()
+
+
+def test_readers_keep_a_complete_snapshot_during_updates(tmp_path):
+    write_rows(tmp_path / 'council.csv', fixture_rows())
+    store = VoteStore(str(tmp_path))
+    store.refresh()
+    before = store.bodies['council']
+    store.ingest([dict(zip(HEADER, row(6, 'd', 'R', 'yea')))])
+    assert 'd' not in before.rows and len(before.votes) == 6
+    assert store.official('d')['votes_eligible'] == 1
+
+
+def test_only_one_refresh_runs_at_a_time(tmp_path):
+    write_rows(tmp_path / 'council.csv', fixture_rows())
+    store = VoteStore(str(tmp_path))
+    with store._lock:
+        assert store.refresh() == 0
+    assert store.refresh() == 18